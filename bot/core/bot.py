@@ -8,6 +8,7 @@ from bot.modules.tickets.cogs.ticket_forum_listener import TicketForumListener
 from bot.modules.tickets.cogs.ticket_commands import TicketCommands
 from bot.modules.tickets.cogs.text_snippets import TextSnippetsCommands
 from bot.modules.tickets.services.ticket_service import TicketService
+from bot.modules.tickets.services.transcript_uploader import TranscriptUploader
 from bot.modules.tickets.views.summary_view import SummaryView
 from bot.modules.tickets.views.rating_view import RatingButton
 from bot.modules.user_stats.cogs.user_stats_listener import UserStatsListener
@@ -66,6 +67,9 @@ from bot.modules.parlament.services.parlament_service import ParliamentService
 from bot.modules.parlament.cogs.parlament_commands import ParliamentCommands
 
 from bot.core.presence import PresenceRotator
+from bot.core.settings_watcher import SettingsWatcher
+from bot.core.state import RuntimeState
+from bot.core.maintenance import DatabaseMaintenance
 from bot.modules.logs.forum_log_service import ForumLogService
 from bot.modules.logs.formatting.log_embeds import build_bot_error_embed
 
@@ -90,6 +94,7 @@ class StarryBot(commands.Bot):
         self.db = db
         self.logger = logger
 
+        self.transcript_uploader = TranscriptUploader(self.settings)
         self.ticket_service = TicketService(self, self.settings, self.db, self.logger)
         self.user_stats_service = UserStatsService(self, self.settings, self.db, self.logger)
         self.backup_service = BackupService(self, self.settings, self.db, self.logger)
@@ -110,9 +115,14 @@ class StarryBot(commands.Bot):
         self.invite_service = InviteService(self, self.settings, self.db, self.logger)
 
         self.forum_logs = ForumLogService(self, self.settings, self.db)
+        self.state = RuntimeState(self.db)
+        self.db_maintenance = DatabaseMaintenance(self.db, self.settings, self.logger, self.state)
         self._boot_done = False
 
-        self.reload_settings_loop.start()
+        self.settings_watcher = SettingsWatcher(self.settings, self._on_settings_reloaded, on_error=self._on_settings_reload_error)
+        self.user_stats_flush_loop.start()
+        self.state_flush_loop.start()
+        self.db_maintenance_loop.start()
         self.ticket_automation_loop.start()
         self.backup_autosave_loop.start()
         self.birthday_loop.start()
@@ -122,6 +132,8 @@ class StarryBot(commands.Bot):
         self.parlament_loop.start()
 
     async def setup_hook(self):
+        await self.state.load()
+        self.settings_watcher.start()
         await self.add_cog(TicketDMListener(self))
         await self.add_cog(TicketForumListener(self))
         await self.add_cog(TicketCommands(self))
@@ -175,13 +187,42 @@ class StarryBot(commands.Bot):
         self.presence = PresenceRotator(self, self.db, interval_seconds=20)
         self.presence.start()
 
-    @tasks.loop(seconds=2.0)
-    async def reload_settings_loop(self):
-        changed = await self.settings.reload_if_changed()
-        if changed:
-            await self.logger.emit_system("settings_reloaded", {"source": "dashboard_override"})
+    async def _on_settings_reloaded(self, diff: dict):
+        keys = diff.get("changed", []) + diff.get("added", []) + diff.get("removed", [])
+        await self.logger.emit_system("settings_reloaded", {
+            "source": "file_watcher",
+            "layers": diff.get("layers", []),
+            "changed": diff.get("changed", [])[:100],
+            "added": diff.get("added", [])[:100],
+            "removed": diff.get("removed", [])[:100],
+            "total": len(keys),
+        })
+
+    async def _on_settings_reload_error(self, error: Exception):
+        await self._emit_bot_error("settings_watcher", error, extra=None, guild=None)
+
+    @tasks.loop(seconds=5.0)
+    async def user_stats_flush_loop(self):
+        try:
+            await self.user_stats_service.flush()
+        except Exception:
+            pass
+
+    @tasks.loop(seconds=5.0)
+    async def state_flush_loop(self):
+        try:
+            await self.state.flush()
+        except Exception:
+            pass
 
     @tasks.loop(seconds=60.0)
+    async def db_maintenance_loop(self):
+        try:
+            await self.db_maintenance.tick()
+        except Exception:
+            pass
+
+    @tasks.loop(seconds=1.0)
     async def ticket_automation_loop(self):
         try:
             await self.ticket_service.run_automation()
@@ -197,7 +238,7 @@ class StarryBot(commands.Bot):
             if not self.settings.get_guild_bool(guild.id, "backup.auto_save_enabled", False):
                 continue
             interval_hours = float(self.settings.get_guild(guild.id, "backup.auto_save_interval_hours", 24) or 24)
-            last = self.settings.get_guild(guild.id, "backup.last_auto_save_at", None)
+            last = self.state.get(guild.id, "backup.last_auto_save_at", None)
             if last:
                 try:
                     last_dt = datetime.fromisoformat(str(last))
@@ -208,7 +249,7 @@ class StarryBot(commands.Bot):
             name = self.settings.get_guild(guild.id, "backup.auto_save_name", "autosave")
             try:
                 await self.backup_service.create_backup(guild, name=f"{name}-{now.strftime('%Y%m%d-%H%M')}")
-                await self.settings.set_guild_override(self.db, guild.id, "backup.last_auto_save_at", now.isoformat())
+                self.state.set(guild.id, "backup.last_auto_save_at", now.isoformat())
             except Exception:
                 pass
 
@@ -252,9 +293,17 @@ class StarryBot(commands.Bot):
         except Exception:
             pass
 
-    @reload_settings_loop.error
-    async def reload_settings_loop_error(self, error: Exception):
-            await self._emit_bot_error("reload_settings_loop", error, extra=None, guild=None)
+    @user_stats_flush_loop.error
+    async def user_stats_flush_loop_error(self, error: Exception):
+            await self._emit_bot_error("user_stats_flush_loop", error, extra=None, guild=None)
+
+    @state_flush_loop.error
+    async def state_flush_loop_error(self, error: Exception):
+            await self._emit_bot_error("state_flush_loop", error, extra=None, guild=None)
+
+    @db_maintenance_loop.error
+    async def db_maintenance_loop_error(self, error: Exception):
+            await self._emit_bot_error("db_maintenance_loop", error, extra=None, guild=None)
 
     @ticket_automation_loop.error
     async def ticket_automation_loop_error(self, error: Exception):
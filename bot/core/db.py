@@ -1,21 +1,774 @@
 import os
 import json
+import asyncio
+import sqlite3
 import aiosqlite
+from urllib.parse import quote
 from datetime import datetime, timezone
 import time
+from contextlib import asynccontextmanager
+from bot.core.rows import (
+    TicketRow,
+    TICKET_COLUMNS,
+    TicketMessageRow,
+    TICKET_MESSAGE_COLUMNS,
+    TicketSearchHit,
+    UserStats,
+    TempVoiceRoomRow,
+    GiveawayRow,
+    GIVEAWAY_COLUMNS,
+    PollRow,
+    POLL_COLUMNS,
+)
+
+_SQL_GET_OPEN_TICKET_BY_USER = f"""
+SELECT {TICKET_COLUMNS}
+FROM tickets
+WHERE guild_id = ? AND user_id = ? AND status IN ('open','claimed')
+ORDER BY id DESC LIMIT 1;
+"""
+
+_SQL_GET_TICKET_BY_THREAD = f"""
+SELECT {TICKET_COLUMNS}
+FROM tickets
+WHERE guild_id = ? AND thread_id = ?
+LIMIT 1;
+"""
+
+_SQL_GET_OPEN_TICKET_BY_PARTICIPANT = f"""
+SELECT {", ".join(f"t.{c}" for c in TicketRow._fields)}
+FROM tickets t
+JOIN ticket_participants p ON p.ticket_id = t.id
+WHERE t.guild_id = ? AND p.user_id = ? AND t.status IN ('open','claimed')
+ORDER BY t.id DESC LIMIT 1;
+"""
+
+_SQL_LIST_ACTIVE_TICKETS = f"""
+SELECT {TICKET_COLUMNS}
+FROM tickets
+WHERE status IN ('open','claimed');
+"""
+
+_SQL_GET_USER_STATS = """
+SELECT guild_id, user_id, message_count, voice_seconds, welcome_count, xp, level,
+       last_message_at, last_voice_at, invite_count, invite_left_count
+FROM user_stats WHERE guild_id = ? AND user_id = ? LIMIT 1;
+"""
+
+_SQL_COUNT_USERS_WITH_MESSAGES_AT_LEAST = """
+SELECT COUNT(*) FROM user_stats WHERE guild_id = ? AND message_count >= ?;
+"""
+
+_SQL_COUNT_USERS_WITH_VOICE_AT_LEAST = """
+SELECT COUNT(*) FROM user_stats WHERE guild_id = ? AND voice_seconds >= ?;
+"""
+
+_SQL_LIST_BIRTHDAYS_FOR_DAY = """
+SELECT user_id, day, month, year
+FROM birthdays
+WHERE guild_id = ? AND day = ? AND month = ?;
+"""
+
+_SQL_LIST_BIRTHDAYS_FOR_DAY_GLOBAL = """
+SELECT user_id, day, month, year
+FROM birthdays_global
+WHERE day = ? AND month = ?;
+"""
+
+_SQL_LIST_ACHIEVEMENTS = """
+SELECT code, unlocked_at FROM achievements WHERE guild_id = ? AND user_id = ?;
+"""
+
+_SQL_COUNT_ACHIEVEMENT = """
+SELECT COUNT(*) FROM achievements WHERE guild_id = ? AND code = ?;
+"""
+
+_SQL_GET_GIVEAWAY_BY_MESSAGE = f"""
+SELECT {GIVEAWAY_COLUMNS}
+FROM giveaways
+WHERE guild_id = ? AND message_id = ? LIMIT 1;
+"""
+
+_SQL_LIST_OPEN_GIVEAWAYS = f"""
+SELECT {GIVEAWAY_COLUMNS}
+FROM giveaways
+WHERE guild_id = ? AND status = 'open';
+"""
+
+_SQL_LIST_OPEN_POLLS = f"""
+SELECT {POLL_COLUMNS}
+FROM polls
+WHERE status = 'open';
+"""
+
+_SQL_GET_APPLICATION_BY_THREAD = """
+SELECT id, user_id, status
+FROM applications
+WHERE guild_id = ? AND thread_id = ?
+ORDER BY id DESC
+LIMIT 1;
+"""
+
+_SQL_GET_WZS_SUBMISSION_BY_THREAD = """
+SELECT id, user_id, message_id, content, status, created_at, decided_by, decided_at,
+       posted_at, posted_channel_id, posted_message_id
+FROM wzs_submissions
+WHERE guild_id = ? AND thread_id = ?
+ORDER BY id DESC
+LIMIT 1;
+"""
+
+_SQL_GET_OPEN_PARLIAMENT_VOTE = """
+SELECT id, guild_id, channel_id, message_id, candidate_ids_json, status, created_by, created_at, ended_at
+FROM parliament_votes
+WHERE guild_id = ? AND status = 'open'
+ORDER BY id DESC
+LIMIT 1;
+"""
+
+_SQL_LIST_OPEN_PARLIAMENT_VOTES = """
+SELECT id, guild_id, channel_id, message_id, candidate_ids_json
+FROM parliament_votes
+WHERE status = 'open';
+"""
+
+_SQL_GET_TEMPVOICE_ROOM_BY_OWNER = """
+SELECT guild_id, channel_id, owner_id, panel_channel_id, panel_message_id, created_at
+FROM tempvoice_rooms
+WHERE guild_id = ? AND owner_id = ?
+ORDER BY created_at DESC
+LIMIT 1;
+"""
+
+_SQL_GET_COUNTING_STATE = """
+SELECT
+    guild_id,
+    channel_id,
+    current_number,
+    last_user_id,
+    highscore,
+    total_counts,
+    total_fails,
+    updated_at,
+    last_count_value,
+    last_count_user_id,
+    last_count_at
+FROM counting_states
+WHERE guild_id = ? AND channel_id = ?
+LIMIT 1;
+"""
+
+_SQL_GET_VOICE_SESSION = """
+SELECT channel_id, joined_at FROM user_voice_sessions
+WHERE guild_id = ? AND user_id = ? LIMIT 1;
+"""
+
+_SQL_LIST_INFRACTIONS = (
+    "SELECT id, action, duration_seconds, reason, created_at, moderator_id "
+    "FROM infractions WHERE guild_id=? AND user_id=? ORDER BY created_at DESC LIMIT ?"
+)
+
+# Every _SQL_<METHOD> constant is the query of Database.<method>; all of them are plan-checked.
+HOT_QUERIES = tuple(
+    (name[len("_SQL_"):].lower(), query)
+    for name, query in list(globals().items())
+    if name.startswith("_SQL_")
+)
+
+STAT_COUNTERS = (
+    ("total_tickets", "tickets", "1", ()),
+    ("open_tickets", "tickets", "({r}.status IS NULL OR {r}.status != 'closed')", ("status",)),
+    ("total_users", "user_stats", "1", ()),
+    ("total_messages", "user_stats", "{r}.message_count", ("message_count",)),
+    ("total_voice_seconds", "user_stats", "{r}.voice_seconds", ("voice_seconds",)),
+    ("warns", "infractions", "({r}.action = 'warn')", ("action",)),
+    ("giveaways_open", "giveaways", "({r}.status = 'open')", ("status",)),
+    ("polls_open", "polls", "({r}.status = 'open')", ("status",)),
+    ("applications_open", "applications", "({r}.status = 'open')", ("status",)),
+    ("wzs_submissions", "wzs_submissions", "1", ()),
+)
+
+RUNTIME_STATE_KEYS = (
+    "news.last_posted_ids",
+    "news.last_posted_id",
+    "news.last_posted_at",
+    "news.youtube_alerts",
+    "birthday.last_announce_date",
+    "backup.last_auto_save_at",
+    "parlament.panel_message_id",
+)
+
+SQLITE_MAX_VARIABLES = 900
+
+SNIPPET_OPEN = "\x02"
+SNIPPET_CLOSE = "\x03"
+
+_ROW_FACTORIES = {}
+
+
+def _row_factory(row_type):
+    factory = _ROW_FACTORIES.get(row_type)
+    if factory is None:
+        factory = lambda _cursor, row: row_type(*row)
+        _ROW_FACTORIES[row_type] = factory
+    return factory
+
+
+def _snapshot_copy(src_path: str, dest_path: str, pages: int, sleep: float) -> int:
+    src = sqlite3.connect(f"file:{quote(os.path.abspath(src_path))}?mode=ro", uri=True, isolation_level=None)
+    dst = sqlite3.connect(dest_path)
+    try:
+        src.execute("BEGIN;")
+        src.execute("SELECT COUNT(*) FROM sqlite_master;").fetchone()
+        src.backup(dst, pages=max(1, int(pages)), sleep=max(0.0, float(sleep)))
+        src.execute("COMMIT;")
+        return int(dst.execute("PRAGMA page_count;").fetchone()[0])
+    finally:
+        dst.close()
+        src.close()
+
+
+def _fts_query(text: str) -> str:
+    terms = ['"' + t.replace('"', '""') + '"' for t in str(text or "").split() if t.strip('"')]
+    if not terms:
+        return ""
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _chunked(items: list, size: int = SQLITE_MAX_VARIABLES):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
 
 class Database:
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: str,
+        group_commit: bool = False,
+        commit_interval_ms: int = 50,
+        commit_max_pending: int = 500,
+        read_pool_size: int = 0,
+    ):
         self.path = path
         self._conn = None
+        self._group_commit = bool(group_commit)
+        self._commit_interval = max(1, int(commit_interval_ms)) / 1000.0
+        self._commit_max_pending = max(1, int(commit_max_pending))
+        self._pending_writes = 0
+        self._flush_task = None
+        self._write_lock = asyncio.Lock()
+        self._read_pool_size = max(0, int(read_pool_size))
+        self._readers = None
+        self._reader_conns = []
 
     async def init(self):
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
         self._conn = await aiosqlite.connect(self.path)
+        await self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL;")
         await self._conn.execute("PRAGMA journal_mode=WAL;")
         await self._conn.execute("PRAGMA foreign_keys=ON;")
+        await self._migrate()
+        await self._open_readers()
+
+    async def _open_readers(self):
+        if not self._read_pool_size:
+            return
+        uri = f"file:{quote(os.path.abspath(self.path))}?mode=ro"
+        self._readers = asyncio.Queue()
+        for _ in range(self._read_pool_size):
+            conn = await aiosqlite.connect(uri, uri=True)
+            await conn.execute("PRAGMA query_only=ON;")
+            self._reader_conns.append(conn)
+            self._readers.put_nowait(conn)
+
+    async def close(self):
+        await self.flush()
+        readers = self._reader_conns
+        self._readers = None
+        self._reader_conns = []
+        for conn in readers:
+            try:
+                await conn.close()
+            except Exception:
+                pass
+        if self._conn is not None:
+            try:
+                await self._conn.execute("PRAGMA optimize;")
+            except Exception:
+                pass
+            await self._conn.close()
+            self._conn = None
+
+    async def _commit(self):
+        if not self._group_commit:
+            async with self._write_lock:
+                await self._conn.commit()
+                self._pending_writes = 0
+            return
+        self._pending_writes += 1
+        if self._pending_writes >= self._commit_max_pending:
+            await self.flush()
+            return
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self._commit_interval)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception:
+            pass
+
+    async def flush(self):
+        task = self._flush_task
+        self._flush_task = None
+        if task is not None and not task.done():
+            task.cancel()
+        async with self._write_lock:
+            pending = self._pending_writes
+            if not pending or self._conn is None:
+                return
+            await self._conn.commit()
+            self._pending_writes = max(0, self._pending_writes - pending)
+
+    @asynccontextmanager
+    async def _transaction(self, name: str):
+        async with self._write_lock:
+            await self._conn.execute(f"SAVEPOINT {name};")
+            try:
+                yield self._conn
+            except BaseException:
+                await self._conn.execute(f"ROLLBACK TO {name};")
+                await self._conn.execute(f"RELEASE {name};")
+                raise
+            await self._conn.execute(f"RELEASE {name};")
+            try:
+                await self._conn.commit()
+                self._pending_writes = 0
+                return
+            except Exception:
+                self._pending_writes += 1
+        if self._group_commit:
+            self._schedule_flush()
+
+    async def _read(self, query: str, params, fetch: str, row_type=None):
+        readers = self._readers
+        if readers is None or self._pending_writes:
+            cur = await self._conn.execute(query, params)
+            if row_type is not None:
+                cur.row_factory = _row_factory(row_type)
+            return await getattr(cur, fetch)()
+        conn = await readers.get()
+        try:
+            cur = await conn.execute(query, params)
+            if row_type is not None:
+                cur.row_factory = _row_factory(row_type)
+            return await getattr(cur, fetch)()
+        finally:
+            readers.put_nowait(conn)
+
+    async def fetchone(self, query: str, params=(), row_type=None):
+        return await self._read(query, params, "fetchone", row_type)
+
+    async def fetchall(self, query: str, params=(), row_type=None):
+        return await self._read(query, params, "fetchall", row_type)
+
+    async def snapshot(self, dest_path: str, pages: int = 256, sleep: float = 0.01) -> dict:
+        await self.flush()
+        tmp_path = f"{dest_path}.tmp"
+        started = time.monotonic()
+        try:
+            page_count = await asyncio.to_thread(_snapshot_copy, self.path, tmp_path, pages, sleep)
+            os.replace(tmp_path, dest_path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except Exception:
+                pass
+            raise
+        return {
+            "path": dest_path,
+            "pages": page_count,
+            "bytes": os.path.getsize(dest_path),
+            "seconds": round(time.monotonic() - started, 3),
+        }
+
+    async def checkpoint(self, mode: str = "PASSIVE") -> dict:
+        mode = str(mode).upper()
+        if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            mode = "PASSIVE"
+        await self.flush()
+        cur = await self._conn.execute(f"PRAGMA wal_checkpoint({mode});")
+        busy, log_frames, checkpointed = await cur.fetchone()
+        return {"mode": mode, "busy": int(busy), "log_frames": int(log_frames), "checkpointed": int(checkpointed)}
+
+    async def optimize(self, analyze: bool = False, analysis_limit: int = 1000):
+        await self.flush()
+        async with self._write_lock:
+            if analyze:
+                await self._conn.execute(f"PRAGMA analysis_limit={max(0, int(analysis_limit))};")
+                await self._conn.execute("ANALYZE;")
+            await self._conn.execute("PRAGMA optimize;")
+            await self._conn.commit()
+
+    async def incremental_vacuum(self, max_pages: int = 2000) -> int:
+        await self.flush()
+        async with self._write_lock:
+            before = await self._pragma_int("freelist_count")
+            if before:
+                await self._conn.executescript(f"PRAGMA incremental_vacuum({max(1, int(max_pages))});")
+            return before - await self._pragma_int("freelist_count")
+
+    async def enable_incremental_vacuum(self) -> bool:
+        await self.flush()
+        async with self._write_lock:
+            if await self._pragma_int("auto_vacuum") == 2:
+                return False
+            await self._conn.commit()
+            await self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+            await self._conn.execute("VACUUM;")
+            return True
+
+    async def _pragma_int(self, name: str) -> int:
+        cur = await self._conn.execute(f"PRAGMA {name};")
+        row = await cur.fetchone()
+        return int(row[0]) if row else 0
+
+    async def storage_stats(self) -> dict:
+        def _size(path: str) -> int:
+            try:
+                return os.path.getsize(path)
+            except OSError:
+                return 0
+
+        return {
+            "db_bytes": _size(self.path),
+            "wal_bytes": _size(f"{self.path}-wal"),
+            "shm_bytes": _size(f"{self.path}-shm"),
+            "page_size": await self._pragma_int("page_size"),
+            "page_count": await self._pragma_int("page_count"),
+            "freelist_count": await self._pragma_int("freelist_count"),
+        }
+
+    def _migrations(self):
+        return [
+            (1, self._migrate_baseline),
+            (2, self._migrate_hot_indexes),
+            (3, self._migrate_stat_counters),
+            (4, self._migrate_runtime_state),
+            (5, self._migrate_incremental_vacuum),
+            (6, self._migrate_ticket_messages),
+            (7, self._migrate_ticket_search),
+            (8, self._migrate_nested_runtime_state),
+            (9, self._migrate_active_ticket_index),
+            (10, self._migrate_ticket_archive_start),
+        ]
+
+    async def _migrate(self):
+        current = await self._schema_version()
+        for version, step in self._migrations():
+            if version <= current:
+                continue
+            await step()
+            await self._conn.execute("DELETE FROM schema_version;")
+            await self._conn.execute("INSERT INTO schema_version (version) VALUES (?);", (int(version),))
+            await self._conn.commit()
+            current = version
+
+    async def _schema_version(self) -> int:
+        try:
+            cur = await self._conn.execute("SELECT version FROM schema_version LIMIT 1;")
+            row = await cur.fetchone()
+        except aiosqlite.OperationalError:
+            await self._conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL);")
+            await self._conn.commit()
+            return 0
+        return int(row[0]) if row else 0
+
+    async def _migrate_baseline(self):
         await self._create_tables()
         await self._conn.commit()
+        await self._ensure_birthdays_global_seed()
+
+    async def _migrate_hot_indexes(self):
+        for stmt in (
+            "CREATE INDEX IF NOT EXISTS idx_tickets_thread ON tickets(guild_id, thread_id)",
+            "CREATE INDEX IF NOT EXISTS idx_tickets_user_status ON tickets(guild_id, user_id, status)",
+            "CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets(status)",
+            "CREATE INDEX IF NOT EXISTS idx_user_stats_messages ON user_stats(guild_id, message_count)",
+            "CREATE INDEX IF NOT EXISTS idx_user_stats_voice ON user_stats(guild_id, voice_seconds)",
+            "CREATE INDEX IF NOT EXISTS idx_birthdays_day ON birthdays(guild_id, month, day)",
+            "CREATE INDEX IF NOT EXISTS idx_birthdays_global_day ON birthdays_global(month, day)",
+            "CREATE INDEX IF NOT EXISTS idx_achievements_code ON achievements(guild_id, code)",
+            "CREATE INDEX IF NOT EXISTS idx_giveaways_status ON giveaways(guild_id, status)",
+            "CREATE INDEX IF NOT EXISTS idx_giveaways_message ON giveaways(guild_id, message_id)",
+            "CREATE INDEX IF NOT EXISTS idx_polls_status ON polls(status)",
+            "CREATE INDEX IF NOT EXISTS idx_applications_thread ON applications(guild_id, thread_id)",
+            "CREATE INDEX IF NOT EXISTS idx_wzs_thread ON wzs_submissions(guild_id, thread_id)",
+            "CREATE INDEX IF NOT EXISTS idx_parliament_votes_status ON parliament_votes(status, guild_id)",
+            "DROP INDEX IF EXISTS idx_user_stats_guild",
+            "DROP INDEX IF EXISTS idx_user_channel_stats_user",
+        ):
+            await self._conn.execute(stmt)
+
+    async def _migrate_active_ticket_index(self):
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tickets_active ON tickets(status) WHERE status IN ('open','claimed')"
+        )
+
+    async def _migrate_ticket_archive_start(self):
+        await self._ensure_column("tickets", "archive_started_at", "TEXT")
+
+    async def _migrate_stat_counters(self):
+        await self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS stat_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        );
+        """)
+        tables = {}
+        for name, table, expr, columns in STAT_COUNTERS:
+            tables.setdefault(table, []).append((name, expr, columns))
+            await self._conn.execute(
+                f"INSERT OR REPLACE INTO stat_counters (name, value) "
+                f"SELECT ?, COALESCE(SUM(COALESCE({expr.format(r=table)}, 0)), 0) FROM {table};",
+                (name,),
+            )
+        for table, counters in tables.items():
+            def _apply(sign_new: str, sign_old: str, items):
+                parts = []
+                for name, expr, _ in items:
+                    delta = []
+                    if sign_new:
+                        delta.append(f"{sign_new} COALESCE({expr.format(r='NEW')}, 0)")
+                    if sign_old:
+                        delta.append(f"{sign_old} COALESCE({expr.format(r='OLD')}, 0)")
+                    parts.append(f"UPDATE stat_counters SET value = value {' '.join(delta)} WHERE name = '{name}';")
+                return " ".join(parts)
+
+            await self._conn.execute(f"DROP TRIGGER IF EXISTS trg_stat_counters_{table}_ins;")
+            await self._conn.execute(
+                f"CREATE TRIGGER trg_stat_counters_{table}_ins AFTER INSERT ON {table} "
+                f"BEGIN {_apply('+', '', counters)} END;"
+            )
+            await self._conn.execute(f"DROP TRIGGER IF EXISTS trg_stat_counters_{table}_del;")
+            await self._conn.execute(
+                f"CREATE TRIGGER trg_stat_counters_{table}_del AFTER DELETE ON {table} "
+                f"BEGIN {_apply('', '-', counters)} END;"
+            )
+            updatable = [c for c in counters if c[2]]
+            await self._conn.execute(f"DROP TRIGGER IF EXISTS trg_stat_counters_{table}_upd;")
+            if updatable:
+                columns = sorted({col for c in updatable for col in c[2]})
+                await self._conn.execute(
+                    f"CREATE TRIGGER trg_stat_counters_{table}_upd AFTER UPDATE OF {', '.join(columns)} ON {table} "
+                    f"BEGIN {_apply('+', '-', updatable)} END;"
+                )
+
+    async def _migrate_runtime_state(self):
+        await self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS runtime_state (
+            guild_id INTEGER NOT NULL,
+            key TEXT NOT NULL,
+            value_json TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (guild_id, key)
+        );
+        """)
+        updated_at = await self.now_iso()
+        for state_key in RUNTIME_STATE_KEYS:
+            values = await self._take_nested_state(state_key)
+            cur = await self._conn.execute(
+                "SELECT guild_id, key, value_json FROM guild_configs WHERE key = ? OR key LIKE ? ORDER BY LENGTH(key);",
+                (state_key, f"{state_key}.%"),
+            )
+            rows = await cur.fetchall()
+            for guild_id, key, value_json in rows:
+                try:
+                    value = json.loads(value_json)
+                except Exception:
+                    value = value_json
+                if key == state_key:
+                    values[int(guild_id)] = value
+                    continue
+                node = values.get(int(guild_id))
+                if not isinstance(node, dict):
+                    node = {}
+                    values[int(guild_id)] = node
+                parts = key[len(state_key) + 1:].split(".")
+                for part in parts[:-1]:
+                    if not isinstance(node.get(part), dict):
+                        node[part] = {}
+                    node = node[part]
+                node[parts[-1]] = value
+            await self._store_migrated_state(state_key, values, updated_at, replace=True)
+            await self._conn.execute(
+                "DELETE FROM guild_configs WHERE key = ? OR key LIKE ?;",
+                (state_key, f"{state_key}.%"),
+            )
+
+    async def _migrate_nested_runtime_state(self):
+        updated_at = await self.now_iso()
+        for state_key in RUNTIME_STATE_KEYS:
+            values = await self._take_nested_state(state_key)
+            await self._store_migrated_state(state_key, values, updated_at, replace=False)
+
+    async def _store_migrated_state(self, state_key: str, values: dict, updated_at: str, replace: bool):
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        for guild_id, value in values.items():
+            if state_key == "news.youtube_alerts" and isinstance(value, dict):
+                items = [(f"{state_key}.{vid}", payload) for vid, payload in value.items()]
+            else:
+                items = [(state_key, value)]
+            await self._conn.executemany(
+                f"{verb} INTO runtime_state (guild_id, key, value_json, updated_at) VALUES (?, ?, ?, ?);",
+                [(guild_id, k, json.dumps(v, ensure_ascii=False), updated_at) for k, v in items],
+            )
+
+    async def _take_nested_state(self, state_key: str) -> dict:
+        parts = state_key.split(".")
+        parents = [".".join(parts[:i]) for i in range(1, len(parts))]
+        cur = await self._conn.execute(
+            f"SELECT guild_id, key, value_json FROM guild_configs WHERE key IN ({', '.join('?' * len(parents))}) "
+            "ORDER BY LENGTH(key);",
+            tuple(parents),
+        )
+        values = {}
+        for guild_id, key, value_json in await cur.fetchall():
+            try:
+                root = json.loads(value_json)
+            except Exception:
+                continue
+            node = root
+            path = state_key[len(key) + 1:].split(".")
+            for part in path[:-1]:
+                node = node.get(part) if isinstance(node, dict) else None
+            if not isinstance(node, dict) or path[-1] not in node:
+                continue
+            values[int(guild_id)] = node.pop(path[-1])
+            if root:
+                await self._conn.execute(
+                    "UPDATE guild_configs SET value_json = ? WHERE guild_id = ? AND key = ?;",
+                    (json.dumps(root, ensure_ascii=False), int(guild_id), key),
+                )
+            else:
+                await self._conn.execute(
+                    "DELETE FROM guild_configs WHERE guild_id = ? AND key = ?;",
+                    (int(guild_id), key),
+                )
+        return values
+
+    async def _migrate_incremental_vacuum(self):
+        if await self._pragma_int("auto_vacuum") == 2:
+            return
+        await self._conn.commit()
+        await self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+
+    async def _migrate_ticket_messages(self):
+        await self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS ticket_messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ticket_id INTEGER NOT NULL,
+            message_id INTEGER,
+            author_id INTEGER NOT NULL,
+            author_name TEXT,
+            author_tag TEXT,
+            author_avatar TEXT,
+            author_color INTEGER,
+            direction TEXT NOT NULL,
+            content TEXT,
+            attachments_json TEXT,
+            created_at TEXT NOT NULL
+        );
+        """)
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ticket_messages_ticket ON ticket_messages(ticket_id, id);"
+        )
+
+    async def _migrate_ticket_search(self):
+        await self._conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS ticket_messages_fts USING fts5(
+            content,
+            author_name,
+            author_tag,
+            content='ticket_messages',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+        """)
+        await self._conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_ticket_messages_fts_insert AFTER INSERT ON ticket_messages BEGIN
+            INSERT INTO ticket_messages_fts (rowid, content, author_name, author_tag)
+            VALUES (new.id, new.content, new.author_name, new.author_tag);
+        END;
+        """)
+        await self._conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_ticket_messages_fts_delete AFTER DELETE ON ticket_messages BEGIN
+            INSERT INTO ticket_messages_fts (ticket_messages_fts, rowid, content, author_name, author_tag)
+            VALUES ('delete', old.id, old.content, old.author_name, old.author_tag);
+        END;
+        """)
+        await self._conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_ticket_messages_fts_update
+        AFTER UPDATE OF content, author_name, author_tag ON ticket_messages BEGIN
+            INSERT INTO ticket_messages_fts (ticket_messages_fts, rowid, content, author_name, author_tag)
+            VALUES ('delete', old.id, old.content, old.author_name, old.author_tag);
+            INSERT INTO ticket_messages_fts (rowid, content, author_name, author_tag)
+            VALUES (new.id, new.content, new.author_name, new.author_tag);
+        END;
+        """)
+        await self._conn.execute("INSERT INTO ticket_messages_fts (ticket_messages_fts) VALUES ('rebuild');")
+
+    async def list_runtime_state(self):
+        return await self.fetchall("SELECT guild_id, key, value_json FROM runtime_state;")
+
+    async def apply_runtime_state(self, upserts: list[tuple], deletes: list[tuple]):
+        updated_at = await self.now_iso()
+        async with self._transaction("runtime_state") as conn:
+            if upserts:
+                await conn.executemany("""
+                INSERT INTO runtime_state (guild_id, key, value_json, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(guild_id, key) DO UPDATE SET
+                    value_json = excluded.value_json,
+                    updated_at = excluded.updated_at;
+                """, [(int(g), str(k), str(v), updated_at) for g, k, v in upserts])
+            if deletes:
+                await conn.executemany(
+                    "DELETE FROM runtime_state WHERE guild_id = ? AND key = ?;",
+                    [(int(g), str(k)) for g, k in deletes],
+                )
+
+    async def get_stat_counter(self, name: str) -> int:
+        row = await self.fetchone("SELECT value FROM stat_counters WHERE name = ?;", (name,))
+        return int(row[0]) if row and row[0] is not None else 0
+
+    async def count_active_users(self, hours: int = 24) -> int:
+        row = await self.fetchone(
+            "SELECT COUNT(*) FROM user_stats "
+            "WHERE (last_message_at IS NOT NULL AND datetime(last_message_at) >= datetime('now', ?)) "
+            "OR (last_voice_at IS NOT NULL AND datetime(last_voice_at) >= datetime('now', ?));",
+            (f"-{int(hours)} hours", f"-{int(hours)} hours"),
+        )
+        return int(row[0]) if row and row[0] is not None else 0
+
+    async def explain_query_plan(self, query: str, params=()):
+        rows = await self.fetchall(f"EXPLAIN QUERY PLAN {query}", params)
+        return [str(r[3]) for r in rows if r]
+
+    async def check_query_plans(self) -> list[dict]:
+        scans = []
+        for name, query in HOT_QUERIES:
+            params = (None,) * query.count("?")
+            for detail in await self.explain_query_plan(query, params):
+                if detail.startswith("SCAN") and "CONSTANT ROW" not in detail:
+                    scans.append({"query": name, "plan": detail})
+        return scans
 
     async def _create_tables(self):
         await self._conn.execute("""
@@ -405,19 +1158,6 @@ class Database:
         await self._ensure_column("user_stats", "invite_count", "INTEGER NOT NULL DEFAULT 0")
         await self._ensure_column("user_stats", "invite_left_count", "INTEGER NOT NULL DEFAULT 0")
 
-    async def _ensure_column(self, table: str, column: str, decl: str):
-        try:
-            cur = await self._conn.execute(f"PRAGMA table_info({table});")
-            rows = await cur.fetchall()
-            cols = {str(r[1]) for r in rows if r}
-            if column not in cols:
-                await self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl};")
-        except Exception:
-            pass
-
-        await self._conn.commit()
-        await self._ensure_birthdays_global_seed()
-
     async def _table_has_column(self, table: str, column: str) -> bool:
         cur = await self._conn.execute(f"PRAGMA table_info({table});")
         rows = await cur.fetchall()
@@ -485,64 +1225,38 @@ class Database:
 
     async def create_ticket(self, guild_id: int, user_id: int, forum_channel_id: int, thread_id: int, summary_message_id: int, category_key: str):
         created_at = await self.now_iso()
-        await self._conn.execute("""
+        cur = await self._conn.execute("""
         INSERT INTO tickets (
             guild_id, user_id, forum_channel_id, thread_id, summary_message_id,
-            category_key, status, created_at, priority, last_activity_at, last_user_message_at
+            category_key, status, created_at, priority, last_activity_at, last_user_message_at, archive_started_at
         )
-        VALUES (?, ?, ?, ?, ?, ?, 'open', ?, 2, ?, ?);
-        """, (guild_id, user_id, forum_channel_id, thread_id, summary_message_id, category_key, created_at, created_at, created_at))
+        VALUES (?, ?, ?, ?, ?, ?, 'open', ?, 2, ?, ?, ?);
+        """, (
+            guild_id, user_id, forum_channel_id, thread_id, summary_message_id, category_key,
+            created_at, created_at, created_at, created_at,
+        ))
         await self._conn.execute("""
         INSERT INTO ticket_stats (user_id, total_tickets)
         VALUES (?, 1)
         ON CONFLICT(user_id) DO UPDATE SET total_tickets = total_tickets + 1;
         """, (user_id,))
-        await self._conn.commit()
-        cur = await self._conn.execute("SELECT last_insert_rowid();")
-        row = await cur.fetchone()
-        return int(row[0])
+        await self._commit()
+        return int(cur.lastrowid)
 
-    async def get_open_ticket_by_user(self, guild_id: int, user_id: int):
-        cur = await self._conn.execute("""
-        SELECT id, thread_id, summary_message_id, status, claimed_by, category_key
-        FROM tickets
-        WHERE guild_id = ? AND user_id = ? AND status IN ('open','claimed')
-        ORDER BY id DESC LIMIT 1;
-        """, (guild_id, user_id))
-        row = await cur.fetchone()
-        return row
+    async def get_open_ticket_by_user(self, guild_id: int, user_id: int) -> TicketRow | None:
+        return await self.fetchone(_SQL_GET_OPEN_TICKET_BY_USER, (guild_id, user_id), TicketRow)
 
-    async def get_ticket_by_thread(self, guild_id: int, thread_id: int):
-        cur = await self._conn.execute("""
-        SELECT id, user_id, thread_id, summary_message_id, status, claimed_by, category_key,
-               priority, status_label, escalated_level, escalated_by,
-               created_at, closed_at, last_activity_at, last_user_message_at,
-               last_staff_message_at, first_staff_reply_at, sla_breached_at
-        FROM tickets
-        WHERE guild_id = ? AND thread_id = ?
-        LIMIT 1;
-        """, (guild_id, thread_id))
-        return await cur.fetchone()
+    async def get_ticket_by_thread(self, guild_id: int, thread_id: int) -> TicketRow | None:
+        return await self.fetchone(_SQL_GET_TICKET_BY_THREAD, (guild_id, thread_id), TicketRow)
 
-    async def get_open_ticket_by_participant(self, guild_id: int, user_id: int):
-        cur = await self._conn.execute("""
-        SELECT t.id, t.thread_id, t.summary_message_id, t.status, t.claimed_by, t.category_key
-        FROM tickets t
-        JOIN ticket_participants p ON p.ticket_id = t.id
-        WHERE t.guild_id = ? AND p.user_id = ? AND t.status IN ('open','claimed')
-        ORDER BY t.id DESC LIMIT 1;
-        """, (guild_id, user_id))
-        row = await cur.fetchone()
-        return row
+    async def get_open_ticket_by_participant(self, guild_id: int, user_id: int) -> TicketRow | None:
+        return await self.fetchone(_SQL_GET_OPEN_TICKET_BY_PARTICIPANT, (guild_id, user_id), TicketRow)
 
-    async def get_ticket(self, ticket_id: int):
-        cur = await self._conn.execute("""
-        SELECT id, guild_id, user_id, forum_channel_id, thread_id, summary_message_id, category_key, status, claimed_by,
-               created_at, closed_at, rating, rating_comment, priority, status_label, escalated_level, escalated_by,
-               last_activity_at, last_user_message_at, last_staff_message_at, first_staff_reply_at, sla_breached_at
+    async def get_ticket(self, ticket_id: int) -> TicketRow | None:
+        return await self.fetchone(f"""
+        SELECT {TICKET_COLUMNS}
         FROM tickets WHERE id = ? LIMIT 1;
-        """, (ticket_id,))
-        return await cur.fetchone()
+        """, (ticket_id,), TicketRow)
 
     async def set_claim(self, ticket_id: int, staff_id: int | None):
         if staff_id is None:
@@ -555,7 +1269,7 @@ class Database:
             UPDATE tickets SET claimed_by = ?, status = 'claimed'
             WHERE id = ?;
             """, (staff_id, ticket_id))
-        await self._conn.commit()
+        await self._commit()
 
     async def close_ticket(self, ticket_id: int):
         closed_at = await self.now_iso()
@@ -563,35 +1277,35 @@ class Database:
         UPDATE tickets SET status = 'closed', closed_at = ?
         WHERE id = ?;
         """, (closed_at, ticket_id))
-        await self._conn.commit()
+        await self._commit()
 
     async def reopen_ticket(self, ticket_id: int):
         await self._conn.execute("""
         UPDATE tickets SET status = 'open', closed_at = NULL
         WHERE id = ?;
         """, (ticket_id,))
-        await self._conn.commit()
+        await self._commit()
 
     async def set_status_label(self, ticket_id: int, status_label: str | None):
         await self._conn.execute("""
         UPDATE tickets SET status_label = ?
         WHERE id = ?;
         """, (status_label, ticket_id))
-        await self._conn.commit()
+        await self._commit()
 
     async def set_priority(self, ticket_id: int, priority: int):
         await self._conn.execute("""
         UPDATE tickets SET priority = ?
         WHERE id = ?;
         """, (priority, ticket_id))
-        await self._conn.commit()
+        await self._commit()
 
     async def set_category_key(self, ticket_id: int, category_key: str):
         await self._conn.execute("""
         UPDATE tickets SET category_key = ?
         WHERE id = ?;
         """, (category_key, ticket_id))
-        await self._conn.commit()
+        await self._commit()
 
     async def set_escalation(self, ticket_id: int, level: int, actor_id: int | None):
         now = await self.now_iso()
@@ -599,21 +1313,21 @@ class Database:
         UPDATE tickets SET escalated_level = ?, escalated_by = ?, escalated_at = ?
         WHERE id = ?;
         """, (level, actor_id, now, ticket_id))
-        await self._conn.commit()
+        await self._commit()
 
     async def set_last_activity(self, ticket_id: int, when_iso: str):
         await self._conn.execute("""
         UPDATE tickets SET last_activity_at = ?
         WHERE id = ?;
         """, (when_iso, ticket_id))
-        await self._conn.commit()
+        await self._commit()
 
     async def set_last_user_message(self, ticket_id: int, when_iso: str):
         await self._conn.execute("""
         UPDATE tickets SET last_user_message_at = ?, last_activity_at = ?
         WHERE id = ?;
         """, (when_iso, when_iso, ticket_id))
-        await self._conn.commit()
+        await self._commit()
 
     async def set_last_staff_message(self, ticket_id: int, when_iso: str):
         await self._conn.execute("""
@@ -622,38 +1336,131 @@ class Database:
             first_staff_reply_at = COALESCE(first_staff_reply_at, ?)
         WHERE id = ?;
         """, (when_iso, when_iso, when_iso, ticket_id))
-        await self._conn.commit()
+        await self._commit()
 
     async def set_sla_breached(self, ticket_id: int, when_iso: str):
         await self._conn.execute("""
         UPDATE tickets SET sla_breached_at = ?
         WHERE id = ?;
         """, (when_iso, ticket_id))
-        await self._conn.commit()
+        await self._commit()
 
-    async def list_active_tickets(self, limit: int = 500):
-        cur = await self._conn.execute("""
-        SELECT id, guild_id, user_id, thread_id, status, claimed_by, category_key,
-               created_at, last_activity_at, last_user_message_at, last_staff_message_at,
-               first_staff_reply_at, sla_breached_at, priority, status_label, escalated_level
-        FROM tickets
-        WHERE status IN ('open','claimed')
-        ORDER BY id DESC
+    async def add_ticket_message(
+        self,
+        ticket_id: int,
+        message_id: int | None,
+        author_id: int,
+        author_name: str | None,
+        author_tag: str | None,
+        author_avatar: str | None,
+        author_color: int | None,
+        direction: str,
+        content: str | None,
+        attachments_json: str | None,
+        created_at: str,
+    ):
+        await self._conn.execute("""
+        INSERT INTO ticket_messages (
+            ticket_id, message_id, author_id, author_name, author_tag, author_avatar, author_color,
+            direction, content, attachments_json, created_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """, (
+            int(ticket_id),
+            int(message_id) if message_id else None,
+            int(author_id),
+            author_name,
+            author_tag,
+            author_avatar,
+            int(author_color) if author_color is not None else None,
+            str(direction),
+            content,
+            attachments_json,
+            str(created_at),
+        ))
+        await self._commit()
+
+    async def list_ticket_message_ids(self, ticket_id: int) -> set[int]:
+        rows = await self.fetchall("""
+        SELECT message_id FROM ticket_messages
+        WHERE ticket_id = ? AND message_id IS NOT NULL;
+        """, (int(ticket_id),))
+        return {int(r[0]) for r in rows}
+
+    async def iter_ticket_messages(self, ticket_id: int, batch_size: int = 200):
+        last_id = 0
+        while True:
+            rows = await self.fetchall(f"""
+            SELECT {TICKET_MESSAGE_COLUMNS}
+            FROM ticket_messages
+            WHERE ticket_id = ? AND id > ?
+            ORDER BY id ASC
+            LIMIT ?;
+            """, (int(ticket_id), last_id, int(batch_size)), TicketMessageRow)
+            for row in rows:
+                yield row
+            if len(rows) < batch_size:
+                return
+            last_id = int(rows[-1].id)
+
+    async def search_ticket_message_ids(
+        self,
+        guild_id: int,
+        query: str,
+        limit: int = 500,
+        ticket_id: int | None = None,
+    ) -> list[int]:
+        match = _fts_query(query)
+        if not match:
+            return []
+        clauses = ["ticket_messages_fts MATCH ?", "t.guild_id = ?"]
+        params: list = [match, int(guild_id)]
+        if ticket_id:
+            clauses.append("m.ticket_id = ?")
+            params.append(int(ticket_id))
+        params.append(max(1, int(limit)))
+        rows = await self.fetchall(f"""
+        SELECT m.id
+        FROM ticket_messages_fts f
+        JOIN ticket_messages m ON m.id = f.rowid
+        JOIN tickets t ON t.id = m.ticket_id
+        WHERE {" AND ".join(clauses)}
+        ORDER BY f.rank, m.id
         LIMIT ?;
-        """, (limit,))
-        rows = await cur.fetchall()
-        return rows
+        """, tuple(params))
+        return [int(r[0]) for r in rows]
+
+    async def get_ticket_search_hits(self, query: str, message_ids: list[int]) -> list[TicketSearchHit]:
+        match = _fts_query(query)
+        if not match or not message_ids:
+            return []
+        by_id = {}
+        for chunk in _chunked([int(mid) for mid in message_ids], SQLITE_MAX_VARIABLES - 3):
+            marks = ",".join("?" * len(chunk))
+            rows = await self.fetchall(f"""
+            SELECT m.id, m.ticket_id, t.thread_id, t.status, m.author_id, m.author_name, m.direction, m.created_at,
+                   snippet(ticket_messages_fts, 0, ?, ?, '…', 16), f.rank
+            FROM ticket_messages_fts f
+            JOIN ticket_messages m ON m.id = f.rowid
+            JOIN tickets t ON t.id = m.ticket_id
+            WHERE ticket_messages_fts MATCH ? AND f.rowid IN ({marks});
+            """, (SNIPPET_OPEN, SNIPPET_CLOSE, match, *chunk), TicketSearchHit)
+            for row in rows:
+                by_id[int(row.message_id)] = row
+        return [by_id[mid] for mid in message_ids if mid in by_id]
+
+    async def list_active_tickets(self) -> list[TicketRow]:
+        return await self.fetchall(_SQL_LIST_ACTIVE_TICKETS, (), TicketRow)
 
     async def set_rating(self, ticket_id: int, rating: int, comment: str | None):
         await self._conn.execute("""
         UPDATE tickets SET rating = ?, rating_comment = ?
         WHERE id = ?;
         """, (rating, comment, ticket_id))
-        await self._conn.commit()
+        await self._commit()
 
     async def get_ticket_count(self, user_id: int) -> int:
-        cur = await self._conn.execute("SELECT total_tickets FROM ticket_stats WHERE user_id = ? LIMIT 1;", (user_id,))
-        row = await cur.fetchone()
+        row = await self.fetchone("SELECT total_tickets FROM ticket_stats WHERE user_id = ? LIMIT 1;", (user_id,))
         return int(row[0]) if row else 0
 
     async def upsert_user_stats(self, guild_id: int, user_id: int):
@@ -662,7 +1469,17 @@ class Database:
             guild_id, user_id, message_count, voice_seconds, welcome_count, xp, level
         ) VALUES (?, ?, 0, 0, 0, 0, 0);
         """, (int(guild_id), int(user_id)))
-        await self._conn.commit()
+        await self._commit()
+
+    async def upsert_user_stats_many(self, guild_id: int, user_ids: list[int]):
+        if not user_ids:
+            return
+        await self._conn.executemany("""
+        INSERT OR IGNORE INTO user_stats (
+            guild_id, user_id, message_count, voice_seconds, welcome_count, xp, level
+        ) VALUES (?, ?, 0, 0, 0, 0, 0);
+        """, [(int(guild_id), int(uid)) for uid in user_ids])
+        await self._commit()
 
     async def increment_message(self, guild_id: int, user_id: int, channel_id: int, xp_delta: int):
         now = await self.now_iso()
@@ -680,7 +1497,7 @@ class Database:
         ON CONFLICT(guild_id, user_id, channel_id) DO UPDATE SET
             message_count = message_count + 1;
         """, (int(guild_id), int(user_id), int(channel_id)))
-        await self._conn.commit()
+        await self._commit()
 
     async def increment_welcome(self, guild_id: int, user_id: int):
         await self._conn.execute("""
@@ -689,7 +1506,7 @@ class Database:
         ON CONFLICT(guild_id, user_id) DO UPDATE SET
             welcome_count = welcome_count + 1;
         """, (int(guild_id), int(user_id)))
-        await self._conn.commit()
+        await self._commit()
 
     async def increment_invite(self, guild_id: int, user_id: int):
         await self._conn.execute("""
@@ -698,7 +1515,7 @@ class Database:
         ON CONFLICT(guild_id, user_id) DO UPDATE SET
             invite_count = invite_count + 1;
         """, (int(guild_id), int(user_id)))
-        await self._conn.commit()
+        await self._commit()
 
     async def increment_invite_left(self, guild_id: int, user_id: int):
         await self._conn.execute("""
@@ -707,7 +1524,7 @@ class Database:
         ON CONFLICT(guild_id, user_id) DO UPDATE SET
             invite_left_count = invite_left_count + 1;
         """, (int(guild_id), int(user_id)))
-        await self._conn.commit()
+        await self._commit()
 
     async def add_voice_seconds(self, guild_id: int, user_id: int, seconds: int, xp_delta: int):
         now = await self.now_iso()
@@ -719,31 +1536,64 @@ class Database:
             xp = xp + excluded.xp,
             last_voice_at = excluded.last_voice_at;
         """, (int(guild_id), int(user_id), int(seconds), int(xp_delta), now))
-        await self._conn.commit()
-
-    async def get_user_stats(self, guild_id: int, user_id: int):
-        cur = await self._conn.execute("""
-        SELECT guild_id, user_id, message_count, voice_seconds, welcome_count, xp, level,
-               last_message_at, last_voice_at, invite_count, invite_left_count
-        FROM user_stats WHERE guild_id = ? AND user_id = ? LIMIT 1;
-        """, (int(guild_id), int(user_id)))
-        return await cur.fetchone()
+        await self._commit()
+
+    async def apply_user_stats_deltas(self, stats_rows: list[tuple], channel_rows: list[tuple]):
+        async with self._transaction("user_stats_deltas") as conn:
+            if stats_rows:
+                await conn.executemany("""
+                INSERT INTO user_stats (
+                    guild_id, user_id, message_count, voice_seconds, welcome_count, xp, level,
+                    last_message_at, last_voice_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(guild_id, user_id) DO UPDATE SET
+                    message_count = message_count + excluded.message_count,
+                    voice_seconds = voice_seconds + excluded.voice_seconds,
+                    welcome_count = welcome_count + excluded.welcome_count,
+                    xp = xp + excluded.xp,
+                    level = CASE WHEN ? IS NULL THEN level ELSE excluded.level END,
+                    last_message_at = COALESCE(excluded.last_message_at, last_message_at),
+                    last_voice_at = COALESCE(excluded.last_voice_at, last_voice_at);
+                """, stats_rows)
+            if channel_rows:
+                await conn.executemany("""
+                INSERT INTO user_channel_stats (guild_id, user_id, channel_id, message_count)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(guild_id, user_id, channel_id) DO UPDATE SET
+                    message_count = message_count + excluded.message_count;
+                """, channel_rows)
+
+    async def get_user_stats(self, guild_id: int, user_id: int) -> UserStats | None:
+        return await self.fetchone(_SQL_GET_USER_STATS, (int(guild_id), int(user_id)), UserStats)
+
+    async def get_user_stats_many(self, guild_id: int, user_ids: list[int]) -> dict[int, UserStats]:
+        out = {}
+        for chunk in _chunked([int(uid) for uid in user_ids], SQLITE_MAX_VARIABLES - 1):
+            marks = ",".join("?" * len(chunk))
+            rows = await self.fetchall(f"""
+            SELECT guild_id, user_id, message_count, voice_seconds, welcome_count, xp, level,
+                   last_message_at, last_voice_at, invite_count, invite_left_count
+            FROM user_stats WHERE guild_id = ? AND user_id IN ({marks});
+            """, (int(guild_id), *chunk), UserStats)
+            for row in rows:
+                out[int(row.user_id)] = row
+        return out
 
     async def set_user_level(self, guild_id: int, user_id: int, level: int):
         await self._conn.execute("""
         UPDATE user_stats SET level = ? WHERE guild_id = ? AND user_id = ?;
         """, (int(level), int(guild_id), int(user_id)))
-        await self._conn.commit()
+        await self._commit()
 
     async def list_user_channel_stats(self, guild_id: int, user_id: int, limit: int = 10):
-        cur = await self._conn.execute("""
+        return await self.fetchall("""
         SELECT channel_id, message_count
         FROM user_channel_stats
         WHERE guild_id = ? AND user_id = ?
         ORDER BY message_count DESC
         LIMIT ?;
         """, (int(guild_id), int(user_id), int(limit)))
-        return await cur.fetchall()
 
     async def add_invite_join(self, guild_id: int, member_id: int, inviter_id: int, invite_code: str):
         joined_at = await self.now_iso()
@@ -756,10 +1606,10 @@ class Database:
             """,
             (int(guild_id), int(member_id), int(inviter_id), str(invite_code), str(joined_at)),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def get_invite_join(self, guild_id: int, member_id: int):
-        cur = await self._conn.execute(
+        return await self.fetchone(
             """
             SELECT guild_id, member_id, inviter_id, invite_code, joined_at, left_at
             FROM invite_joins
@@ -768,7 +1618,6 @@ class Database:
             """,
             (int(guild_id), int(member_id)),
         )
-        return await cur.fetchone()
 
     async def mark_invite_left(self, guild_id: int, member_id: int):
         left_at = await self.now_iso()
@@ -778,35 +1627,24 @@ class Database:
             """,
             (str(left_at), int(guild_id), int(member_id)),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def count_users_with_messages_at_least(self, guild_id: int, count: int):
-        cur = await self._conn.execute("""
-        SELECT COUNT(*) FROM user_stats WHERE guild_id = ? AND message_count >= ?;
-        """, (int(guild_id), int(count)))
-        row = await cur.fetchone()
+        row = await self.fetchone(_SQL_COUNT_USERS_WITH_MESSAGES_AT_LEAST, (int(guild_id), int(count)))
         return int(row[0] if row else 0)
 
     async def count_users_with_voice_at_least(self, guild_id: int, seconds: int):
-        cur = await self._conn.execute("""
-        SELECT COUNT(*) FROM user_stats WHERE guild_id = ? AND voice_seconds >= ?;
-        """, (int(guild_id), int(seconds)))
-        row = await cur.fetchone()
+        row = await self.fetchone(_SQL_COUNT_USERS_WITH_VOICE_AT_LEAST, (int(guild_id), int(seconds)))
         return int(row[0] if row else 0)
 
     async def count_users_in_stats(self, guild_id: int):
-        cur = await self._conn.execute("""
+        row = await self.fetchone("""
         SELECT COUNT(*) FROM user_stats WHERE guild_id = ?;
         """, (int(guild_id),))
-        row = await cur.fetchone()
         return int(row[0] if row else 0)
 
     async def get_voice_session(self, guild_id: int, user_id: int):
-        cur = await self._conn.execute("""
-        SELECT channel_id, joined_at FROM user_voice_sessions
-        WHERE guild_id = ? AND user_id = ? LIMIT 1;
-        """, (int(guild_id), int(user_id)))
-        return await cur.fetchone()
+        return await self.fetchone(_SQL_GET_VOICE_SESSION, (int(guild_id), int(user_id)))
 
     async def set_voice_session(self, guild_id: int, user_id: int, channel_id: int, joined_at: str):
         await self._conn.execute("""
@@ -816,26 +1654,34 @@ class Database:
             channel_id = excluded.channel_id,
             joined_at = excluded.joined_at;
         """, (int(guild_id), int(user_id), int(channel_id), str(joined_at)))
-        await self._conn.commit()
+        await self._commit()
+
+    async def add_voice_sessions(self, guild_id: int, rows: list[tuple[int, int, str]]):
+        if not rows:
+            return
+        await self._conn.executemany("""
+        INSERT OR IGNORE INTO user_voice_sessions (guild_id, user_id, channel_id, joined_at)
+        VALUES (?, ?, ?, ?);
+        """, [(int(guild_id), int(uid), int(cid), str(joined_at)) for uid, cid, joined_at in rows])
+        await self._commit()
 
     async def clear_voice_session(self, guild_id: int, user_id: int):
         await self._conn.execute("""
         DELETE FROM user_voice_sessions WHERE guild_id = ? AND user_id = ?;
         """, (int(guild_id), int(user_id)))
-        await self._conn.commit()
+        await self._commit()
 
     async def list_tickets(self, limit: int = 200):
-        cur = await self._conn.execute("""
+        rows = await self.fetchall("""
         SELECT id, user_id, thread_id, status, claimed_by, created_at, closed_at, rating
         FROM tickets
         ORDER BY id DESC
         LIMIT ?;
         """, (limit,))
-        rows = await cur.fetchall()
         return rows
 
     async def list_tickets_for_guild(self, guild_id: int, limit: int = 200):
-        cur = await self._conn.execute(
+        rows = await self.fetchall(
             """
             SELECT id, user_id, thread_id, status, claimed_by, created_at, closed_at, rating
             FROM tickets
@@ -845,25 +1691,22 @@ class Database:
             """,
             (int(guild_id), int(limit)),
         )
-        rows = await cur.fetchall()
         return rows
 
     async def list_logs(self, limit: int = 200):
-        cur = await self._conn.execute("""
+        rows = await self.fetchall("""
         SELECT id, event, payload, created_at
         FROM logs
         ORDER BY id DESC
         LIMIT ?;
         """, (limit,))
-        rows = await cur.fetchall()
         return rows
 
     async def count_tickets_by_status_for_guild(self, guild_id: int) -> dict:
-        cur = await self._conn.execute(
+        rows = await self.fetchall(
             "SELECT status, COUNT(*) FROM tickets WHERE guild_id = ? GROUP BY status;",
             (int(guild_id),),
         )
-        rows = await cur.fetchall()
         out = {"open": 0, "claimed": 0, "closed": 0}
         for r in rows:
             if not r:
@@ -876,35 +1719,32 @@ class Database:
 
     async def count_giveaways(self, guild_id: int | None = None) -> int:
         if guild_id:
-            cur = await self._conn.execute(
+            row = await self.fetchone(
                 "SELECT COUNT(*) FROM giveaways WHERE guild_id = ?;",
                 (int(guild_id),),
             )
         else:
-            cur = await self._conn.execute("SELECT COUNT(*) FROM giveaways;")
-        row = await cur.fetchone()
+            row = await self.fetchone("SELECT COUNT(*) FROM giveaways;")
         return int(row[0] if row else 0)
 
     async def count_polls(self, guild_id: int | None = None) -> int:
         if guild_id:
-            cur = await self._conn.execute(
+            row = await self.fetchone(
                 "SELECT COUNT(*) FROM polls WHERE guild_id = ?;",
                 (int(guild_id),),
             )
         else:
-            cur = await self._conn.execute("SELECT COUNT(*) FROM polls;")
-        row = await cur.fetchone()
+            row = await self.fetchone("SELECT COUNT(*) FROM polls;")
         return int(row[0] if row else 0)
 
     async def count_applications(self, guild_id: int | None = None) -> int:
         if guild_id:
-            cur = await self._conn.execute(
+            row = await self.fetchone(
                 "SELECT COUNT(*) FROM applications WHERE guild_id = ?;",
                 (int(guild_id),),
             )
         else:
-            cur = await self._conn.execute("SELECT COUNT(*) FROM applications;")
-        row = await cur.fetchone()
+            row = await self.fetchone("SELECT COUNT(*) FROM applications;")
         return int(row[0] if row else 0)
 
     async def create_backup(self, guild_id: int, name: str, payload_json: str):
@@ -913,50 +1753,46 @@ class Database:
         INSERT INTO backups (guild_id, name, payload_json, created_at)
         VALUES (?, ?, ?, ?);
         """, (int(guild_id), str(name), str(payload_json), created_at))
-        await self._conn.commit()
+        await self._commit()
         cur = await self._conn.execute("SELECT last_insert_rowid();")
         row = await cur.fetchone()
         return int(row[0])
 
     async def list_backups(self, guild_id: int, limit: int = 50):
-        cur = await self._conn.execute("""
+        rows = await self.fetchall("""
         SELECT id, name, created_at
         FROM backups
         WHERE guild_id = ?
         ORDER BY id DESC
         LIMIT ?;
         """, (int(guild_id), int(limit)))
-        rows = await cur.fetchall()
         return rows
 
     async def get_backup(self, guild_id: int, backup_id: int):
-        cur = await self._conn.execute("""
+        return await self.fetchone("""
         SELECT id, name, payload_json, created_at
         FROM backups
         WHERE guild_id = ? AND id = ?
         LIMIT 1;
         """, (int(guild_id), int(backup_id)))
-        return await cur.fetchone()
 
     async def get_backup_by_name(self, guild_id: int, name: str):
-        cur = await self._conn.execute("""
+        return await self.fetchone("""
         SELECT id, name, payload_json, created_at
         FROM backups
         WHERE guild_id = ? AND name = ?
         ORDER BY id DESC
         LIMIT 1;
         """, (int(guild_id), str(name)))
-        return await cur.fetchone()
 
     async def get_latest_backup(self, guild_id: int):
-        cur = await self._conn.execute("""
+        return await self.fetchone("""
         SELECT id, name, payload_json, created_at
         FROM backups
         WHERE guild_id = ?
         ORDER BY id DESC
         LIMIT 1;
         """, (int(guild_id),))
-        return await cur.fetchone()
 
     async def set_birthday(self, guild_id: int, user_id: int, day: int, month: int, year: int):
         created_at = await self.now_iso()
@@ -968,43 +1804,35 @@ class Database:
             month = excluded.month,
             year = excluded.year;
         """, (int(guild_id), int(user_id), int(day), int(month), int(year), created_at))
-        await self._conn.commit()
+        await self._commit()
 
     async def remove_birthday(self, guild_id: int, user_id: int):
         await self._conn.execute("""
         DELETE FROM birthdays WHERE guild_id = ? AND user_id = ?;
         """, (int(guild_id), int(user_id)))
-        await self._conn.commit()
+        await self._commit()
 
     async def get_birthday(self, guild_id: int, user_id: int):
-        cur = await self._conn.execute("""
+        return await self.fetchone("""
         SELECT day, month, year FROM birthdays WHERE guild_id = ? AND user_id = ? LIMIT 1;
         """, (int(guild_id), int(user_id)))
-        return await cur.fetchone()
 
     async def list_birthdays_for_day(self, guild_id: int, day: int, month: int):
-        cur = await self._conn.execute("""
-        SELECT user_id, day, month, year
-        FROM birthdays
-        WHERE guild_id = ? AND day = ? AND month = ?;
-        """, (int(guild_id), int(day), int(month)))
-        return await cur.fetchall()
+        return await self.fetchall(_SQL_LIST_BIRTHDAYS_FOR_DAY, (int(guild_id), int(day), int(month)))
 
     async def list_birthdays(self, guild_id: int, limit: int = 20, offset: int = 0):
-        cur = await self._conn.execute("""
+        return await self.fetchall("""
         SELECT user_id, day, month, year
         FROM birthdays
         WHERE guild_id = ?
         ORDER BY month ASC, day ASC
         LIMIT ? OFFSET ?;
         """, (int(guild_id), int(limit), int(offset)))
-        return await cur.fetchall()
 
     async def count_birthdays(self, guild_id: int):
-        cur = await self._conn.execute("""
+        row = await self.fetchone("""
         SELECT COUNT(*) FROM birthdays WHERE guild_id = ?;
         """, (int(guild_id),))
-        row = await cur.fetchone()
         return int(row[0] if row else 0)
 
     async def set_birthday_global(self, user_id: int, day: int, month: int, year: int):
@@ -1020,35 +1848,40 @@ class Database:
             """,
             (int(user_id), int(day), int(month), int(year), created_at),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def remove_birthday_global(self, user_id: int):
         await self._conn.execute(
             "DELETE FROM birthdays_global WHERE user_id = ?;",
             (int(user_id),),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def get_birthday_global(self, user_id: int):
-        cur = await self._conn.execute(
+        return await self.fetchone(
             "SELECT day, month, year FROM birthdays_global WHERE user_id = ? LIMIT 1;",
             (int(user_id),),
         )
-        return await cur.fetchone()
+
+    async def list_birthday_global_user_ids(self, user_ids: list[int]) -> set[int]:
+        out = set()
+        for chunk in _chunked([int(uid) for uid in user_ids]):
+            marks = ",".join("?" * len(chunk))
+            rows = await self.fetchall(
+                f"SELECT user_id FROM birthdays_global WHERE user_id IN ({marks});",
+                tuple(chunk),
+            )
+            out.update(int(r[0]) for r in rows)
+        return out
 
     async def list_birthdays_for_day_global(self, day: int, month: int):
-        cur = await self._conn.execute(
-            """
-            SELECT user_id, day, month, year
-            FROM birthdays_global
-            WHERE day = ? AND month = ?;
-            """,
+        return await self.fetchall(
+            _SQL_LIST_BIRTHDAYS_FOR_DAY_GLOBAL,
             (int(day), int(month)),
         )
-        return await cur.fetchall()
 
     async def list_birthdays_global(self, limit: int = 20, offset: int = 0):
-        cur = await self._conn.execute(
+        return await self.fetchall(
             """
             SELECT user_id, day, month, year
             FROM birthdays_global
@@ -1057,11 +1890,9 @@ class Database:
             """,
             (int(limit), int(offset)),
         )
-        return await cur.fetchall()
 
     async def count_birthdays_global(self):
-        cur = await self._conn.execute("SELECT COUNT(*) FROM birthdays_global;")
-        row = await cur.fetchone()
+        row = await self.fetchone("SELECT COUNT(*) FROM birthdays_global;")
         return int(row[0] if row else 0)
 
     async def add_achievement(self, guild_id: int, user_id: int, code: str):
@@ -1070,13 +1901,21 @@ class Database:
         INSERT OR IGNORE INTO achievements (guild_id, user_id, code, unlocked_at)
         VALUES (?, ?, ?, ?);
         """, (int(guild_id), int(user_id), str(code), unlocked_at))
-        await self._conn.commit()
+        await self._commit()
 
     async def list_achievements(self, guild_id: int, user_id: int):
-        cur = await self._conn.execute("""
-        SELECT code, unlocked_at FROM achievements WHERE guild_id = ? AND user_id = ?;
-        """, (int(guild_id), int(user_id)))
-        return await cur.fetchall()
+        return await self.fetchall(_SQL_LIST_ACHIEVEMENTS, (int(guild_id), int(user_id)))
+
+    async def list_achievement_codes_many(self, guild_id: int, user_ids: list[int]) -> dict[int, set[str]]:
+        out = {}
+        for chunk in _chunked([int(uid) for uid in user_ids], SQLITE_MAX_VARIABLES - 1):
+            marks = ",".join("?" * len(chunk))
+            rows = await self.fetchall(f"""
+            SELECT user_id, code FROM achievements WHERE guild_id = ? AND user_id IN ({marks});
+            """, (int(guild_id), *chunk))
+            for uid, code in rows:
+                out.setdefault(int(uid), set()).add(str(code))
+        return out
 
     async def set_guild_config(self, guild_id: int, key: str, value_json: str):
         updated_at = await self.now_iso()
@@ -1087,40 +1926,48 @@ class Database:
             value_json = excluded.value_json,
             updated_at = excluded.updated_at;
         """, (int(guild_id), str(key), str(value_json), updated_at))
-        await self._conn.commit()
+        await self._commit()
 
     async def get_guild_config(self, guild_id: int, key: str):
-        cur = await self._conn.execute("""
+        row = await self.fetchone("""
         SELECT value_json FROM guild_configs WHERE guild_id = ? AND key = ? LIMIT 1;
         """, (int(guild_id), str(key)))
-        row = await cur.fetchone()
         return row[0] if row else None
 
     async def list_guild_configs(self, guild_id: int):
-        cur = await self._conn.execute(
+        return await self.fetchall(
             "SELECT key, value_json FROM guild_configs WHERE guild_id = ?;",
             (int(guild_id),),
         )
-        return await cur.fetchall()
 
     async def list_all_guild_configs(self):
-        cur = await self._conn.execute(
+        return await self.fetchall(
             "SELECT guild_id, key, value_json FROM guild_configs;"
         )
-        return await cur.fetchall()
 
     async def delete_guild_configs(self, guild_id: int):
         await self._conn.execute(
             "DELETE FROM guild_configs WHERE guild_id = ?;",
             (int(guild_id),),
         )
-        await self._conn.commit()
+        await self._commit()
+
+    async def replace_guild_configs(self, guild_id: int, items: list[tuple[str, str]]):
+        updated_at = await self.now_iso()
+        rows = [(int(guild_id), str(key), str(value_json), updated_at) for key, value_json in items]
+        async with self._transaction("replace_guild_configs") as conn:
+            await conn.execute("DELETE FROM guild_configs WHERE guild_id = ?;", (int(guild_id),))
+            if rows:
+                await conn.executemany("""
+                INSERT INTO guild_configs (guild_id, key, value_json, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(guild_id, key) DO UPDATE SET
+                    value_json = excluded.value_json,
+                    updated_at = excluded.updated_at;
+                """, rows)
 
     async def count_achievement(self, guild_id: int, code: str):
-        cur = await self._conn.execute("""
-        SELECT COUNT(*) FROM achievements WHERE guild_id = ? AND code = ?;
-        """, (int(guild_id), str(code)))
-        row = await cur.fetchone()
+        row = await self.fetchone(_SQL_COUNT_ACHIEVEMENT, (int(guild_id), str(code)))
         return int(row[0] if row else 0)
 
     async def create_giveaway(self, guild_id: int, channel_id: int, title: str, sponsor: str | None,
@@ -1134,7 +1981,7 @@ class Database:
         ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'open', ?);
         """, (int(guild_id), int(channel_id), str(title), sponsor, description, str(end_at),
               int(winner_count), str(conditions_json), int(created_by), created_at))
-        await self._conn.commit()
+        await self._commit()
         cur = await self._conn.execute("SELECT last_insert_rowid();")
         row = await cur.fetchone()
         return int(row[0])
@@ -1143,38 +1990,25 @@ class Database:
         await self._conn.execute("""
         UPDATE giveaways SET message_id = ? WHERE id = ?;
         """, (int(message_id), int(giveaway_id)))
-        await self._conn.commit()
+        await self._commit()
 
-    async def get_giveaway(self, giveaway_id: int):
-        cur = await self._conn.execute("""
-        SELECT id, guild_id, channel_id, message_id, title, sponsor, description, end_at,
-               winner_count, conditions_json, created_by, status, created_at
+    async def get_giveaway(self, giveaway_id: int) -> GiveawayRow | None:
+        return await self.fetchone(f"""
+        SELECT {GIVEAWAY_COLUMNS}
         FROM giveaways WHERE id = ? LIMIT 1;
-        """, (int(giveaway_id),))
-        return await cur.fetchone()
+        """, (int(giveaway_id),), GiveawayRow)
 
-    async def get_giveaway_by_message(self, guild_id: int, message_id: int):
-        cur = await self._conn.execute("""
-        SELECT id, guild_id, channel_id, message_id, title, sponsor, description, end_at,
-               winner_count, conditions_json, created_by, status, created_at
-        FROM giveaways
-        WHERE guild_id = ? AND message_id = ? LIMIT 1;
-        """, (int(guild_id), int(message_id)))
-        return await cur.fetchone()
-
-    async def list_open_giveaways(self, guild_id: int):
-        cur = await self._conn.execute("""
-        SELECT id, channel_id, message_id, end_at
-        FROM giveaways
-        WHERE guild_id = ? AND status = 'open';
-        """, (int(guild_id),))
-        return await cur.fetchall()
+    async def get_giveaway_by_message(self, guild_id: int, message_id: int) -> GiveawayRow | None:
+        return await self.fetchone(_SQL_GET_GIVEAWAY_BY_MESSAGE, (int(guild_id), int(message_id)), GiveawayRow)
+
+    async def list_open_giveaways(self, guild_id: int) -> list[GiveawayRow]:
+        return await self.fetchall(_SQL_LIST_OPEN_GIVEAWAYS, (int(guild_id),), GiveawayRow)
 
     async def close_giveaway(self, giveaway_id: int):
         await self._conn.execute("""
         UPDATE giveaways SET status = 'closed' WHERE id = ?;
         """, (int(giveaway_id),))
-        await self._conn.commit()
+        await self._commit()
 
     async def add_giveaway_entry(self, giveaway_id: int, user_id: int):
         entered_at = await self.now_iso()
@@ -1182,20 +2016,18 @@ class Database:
         INSERT OR IGNORE INTO giveaway_entries (giveaway_id, user_id, entered_at)
         VALUES (?, ?, ?);
         """, (int(giveaway_id), int(user_id), entered_at))
-        await self._conn.commit()
+        await self._commit()
 
     async def count_giveaway_entries(self, giveaway_id: int):
-        cur = await self._conn.execute("""
+        row = await self.fetchone("""
         SELECT COUNT(*) FROM giveaway_entries WHERE giveaway_id = ?;
         """, (int(giveaway_id),))
-        row = await cur.fetchone()
         return int(row[0] if row else 0)
 
     async def list_giveaway_entries(self, giveaway_id: int):
-        cur = await self._conn.execute("""
+        rows = await self.fetchall("""
         SELECT user_id FROM giveaway_entries WHERE giveaway_id = ?;
         """, (int(giveaway_id),))
-        rows = await cur.fetchall()
         return [int(r[0]) for r in rows if r and r[0] is not None]
 
     async def create_poll(self, guild_id: int, channel_id: int, question: str, options_json: str, created_by: int):
@@ -1204,7 +2036,7 @@ class Database:
         INSERT INTO polls (guild_id, channel_id, question, options_json, created_by, status, created_at)
         VALUES (?, ?, ?, ?, ?, 'open', ?);
         """, (int(guild_id), int(channel_id), str(question), str(options_json), int(created_by), created_at))
-        await self._conn.commit()
+        await self._commit()
         cur = await self._conn.execute("SELECT last_insert_rowid();")
         row = await cur.fetchone()
         return int(row[0])
@@ -1213,14 +2045,13 @@ class Database:
         await self._conn.execute("""
         UPDATE polls SET message_id = ? WHERE id = ?;
         """, (int(message_id), int(poll_id)))
-        await self._conn.commit()
+        await self._commit()
 
-    async def get_poll(self, poll_id: int):
-        cur = await self._conn.execute("""
-        SELECT id, guild_id, channel_id, message_id, question, options_json, created_by, status, created_at
+    async def get_poll(self, poll_id: int) -> PollRow | None:
+        return await self.fetchone(f"""
+        SELECT {POLL_COLUMNS}
         FROM polls WHERE id = ? LIMIT 1;
-        """, (int(poll_id),))
-        return await cur.fetchone()
+        """, (int(poll_id),), PollRow)
 
     async def add_poll_vote(self, poll_id: int, user_id: int, option_index: int):
         voted_at = await self.now_iso()
@@ -1228,22 +2059,16 @@ class Database:
         INSERT OR REPLACE INTO poll_votes (poll_id, user_id, option_index, voted_at)
         VALUES (?, ?, ?, ?);
         """, (int(poll_id), int(user_id), int(option_index), voted_at))
-        await self._conn.commit()
+        await self._commit()
 
     async def list_poll_votes(self, poll_id: int):
-        cur = await self._conn.execute("""
+        rows = await self.fetchall("""
         SELECT option_index FROM poll_votes WHERE poll_id = ?;
         """, (int(poll_id),))
-        rows = await cur.fetchall()
         return [int(r[0]) for r in rows if r and r[0] is not None]
 
-    async def list_open_polls(self):
-        cur = await self._conn.execute("""
-        SELECT id, guild_id, channel_id, message_id, options_json
-        FROM polls
-        WHERE status = 'open';
-        """)
-        return await cur.fetchall()
+    async def list_open_polls(self) -> list[PollRow]:
+        return await self.fetchall(_SQL_LIST_OPEN_POLLS, (), PollRow)
 
     async def create_application(self, guild_id: int, user_id: int, thread_id: int, questions: list[str], answers: list[str]):
         created_at = await self.now_iso()
@@ -1252,29 +2077,21 @@ class Database:
         VALUES (?, ?, ?, 'open', ?, ?, ?);
         """, (int(guild_id), int(user_id), int(thread_id), json.dumps(questions, ensure_ascii=False),
               json.dumps(answers, ensure_ascii=False), created_at))
-        await self._conn.commit()
+        await self._commit()
         cur = await self._conn.execute("SELECT last_insert_rowid();")
         row = await cur.fetchone()
         return int(row[0])
 
     async def get_application(self, app_id: int):
-        cur = await self._conn.execute("""
+        return await self.fetchone("""
         SELECT id, guild_id, user_id, thread_id, status, created_at, closed_at
         FROM applications
         WHERE id = ?
         LIMIT 1;
         """, (int(app_id),))
-        return await cur.fetchone()
 
     async def get_application_by_thread(self, guild_id: int, thread_id: int):
-        cur = await self._conn.execute("""
-        SELECT id, user_id, status
-        FROM applications
-        WHERE guild_id = ? AND thread_id = ?
-        ORDER BY id DESC
-        LIMIT 1;
-        """, (int(guild_id), int(thread_id)))
-        return await cur.fetchone()
+        return await self.fetchone(_SQL_GET_APPLICATION_BY_THREAD, (int(guild_id), int(thread_id)))
 
     async def set_application_status(self, app_id: int, status: str):
         closed_at = await self.now_iso() if status and status != "open" else None
@@ -1282,20 +2099,19 @@ class Database:
             "UPDATE applications SET status = ?, closed_at = ? WHERE id = ?;",
             (str(status), closed_at, int(app_id)),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def list_applications(self, limit: int = 200):
-        cur = await self._conn.execute("""
+        rows = await self.fetchall("""
         SELECT id, user_id, thread_id, status, created_at, closed_at
         FROM applications
         ORDER BY id DESC
         LIMIT ?;
         """, (limit,))
-        rows = await cur.fetchall()
         return rows
 
     async def list_applications_for_guild(self, guild_id: int, limit: int = 200):
-        cur = await self._conn.execute(
+        rows = await self.fetchall(
             """
             SELECT id, user_id, thread_id, status, created_at, closed_at
             FROM applications
@@ -1305,7 +2121,6 @@ class Database:
             """,
             (int(guild_id), int(limit)),
         )
-        rows = await cur.fetchall()
         return rows
 
     async def create_wzs_submission(
@@ -1333,7 +2148,7 @@ class Database:
                 created_at,
             ),
         )
-        await self._conn.commit()
+        await self._commit()
         cur = await self._conn.execute("SELECT last_insert_rowid();")
         row = await cur.fetchone()
         return int(row[0])
@@ -1361,10 +2176,10 @@ class Database:
                 created_at,
             ),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def get_seelsorge_thread(self, guild_id: int, thread_id: int):
-        cur = await self._conn.execute(
+        return await self.fetchone(
             """
             SELECT guild_id, thread_id, user_id, anonymous, created_at
             FROM seelsorge_threads
@@ -1373,7 +2188,6 @@ class Database:
             """,
             (int(guild_id), int(thread_id)),
         )
-        return await cur.fetchone()
 
     async def create_beichte_thread(
         self,
@@ -1398,10 +2212,10 @@ class Database:
                 created_at,
             ),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def get_beichte_thread(self, guild_id: int, thread_id: int):
-        cur = await self._conn.execute(
+        return await self.fetchone(
             """
             SELECT guild_id, thread_id, user_id, anonymous, created_at
             FROM beichte_threads
@@ -1410,10 +2224,9 @@ class Database:
             """,
             (int(guild_id), int(thread_id)),
         )
-        return await cur.fetchone()
 
     async def get_parliament_stats(self, guild_id: int, user_id: int):
-        cur = await self._conn.execute(
+        return await self.fetchone(
             """
             SELECT guild_id, user_id, elected_count, candidated_count
             FROM parliament_stats
@@ -1422,13 +2235,12 @@ class Database:
             """,
             (int(guild_id), int(user_id)),
         )
-        return await cur.fetchone()
 
     async def list_parliament_stats(self, guild_id: int, user_ids: list[int]):
         if not user_ids:
             return []
         placeholders = ",".join("?" for _ in user_ids)
-        cur = await self._conn.execute(
+        return await self.fetchall(
             f"""
             SELECT guild_id, user_id, elected_count, candidated_count
             FROM parliament_stats
@@ -1436,7 +2248,6 @@ class Database:
             """,
             (int(guild_id), *[int(uid) for uid in user_ids]),
         )
-        return await cur.fetchall()
 
     async def increment_parliament_candidated(self, guild_id: int, user_id: int, amount: int = 1):
         row = await self.get_parliament_stats(guild_id, user_id)
@@ -1450,7 +2261,7 @@ class Database:
             """,
             (int(guild_id), int(user_id), int(elected), int(candidated)),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def increment_parliament_elected(self, guild_id: int, user_id: int, amount: int = 1):
         row = await self.get_parliament_stats(guild_id, user_id)
@@ -1464,7 +2275,7 @@ class Database:
             """,
             (int(guild_id), int(user_id), int(elected), int(candidated)),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def create_parliament_vote(
         self,
@@ -1483,7 +2294,7 @@ class Database:
             """,
             (int(guild_id), int(channel_id), str(candidate_ids_json), int(created_by), created_at),
         )
-        await self._conn.commit()
+        await self._commit()
         cur = await self._conn.execute("SELECT last_insert_rowid();")
         row = await cur.fetchone()
         return int(row[0])
@@ -1495,10 +2306,10 @@ class Database:
             """,
             (int(message_id), int(vote_id)),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def get_parliament_vote(self, vote_id: int):
-        cur = await self._conn.execute(
+        return await self.fetchone(
             """
             SELECT id, guild_id, channel_id, message_id, candidate_ids_json, status, created_by, created_at, ended_at
             FROM parliament_votes
@@ -1507,20 +2318,12 @@ class Database:
             """,
             (int(vote_id),),
         )
-        return await cur.fetchone()
 
     async def get_open_parliament_vote(self, guild_id: int):
-        cur = await self._conn.execute(
-            """
-            SELECT id, guild_id, channel_id, message_id, candidate_ids_json, status, created_by, created_at, ended_at
-            FROM parliament_votes
-            WHERE guild_id = ? AND status = 'open'
-            ORDER BY id DESC
-            LIMIT 1;
-            """,
+        return await self.fetchone(
+            _SQL_GET_OPEN_PARLIAMENT_VOTE,
             (int(guild_id),),
         )
-        return await cur.fetchone()
 
     async def close_parliament_vote(self, vote_id: int):
         ended_at = await self.now_iso()
@@ -1530,7 +2333,7 @@ class Database:
             """,
             (str(ended_at), int(vote_id)),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def add_parliament_vote_entry(self, vote_id: int, user_id: int, candidate_id: int):
         voted_at = await self.now_iso()
@@ -1541,23 +2344,22 @@ class Database:
             """,
             (int(vote_id), int(user_id), int(candidate_id), str(voted_at)),
         )
-        await self._conn.commit()
+        await self._commit()
         return await self.get_parliament_vote_entry(vote_id, user_id)
 
     async def get_parliament_vote_entry(self, vote_id: int, user_id: int):
-        cur = await self._conn.execute(
+        row = await self.fetchone(
             """
             SELECT candidate_id FROM parliament_vote_entries WHERE vote_id = ? AND user_id = ? LIMIT 1;
             """,
             (int(vote_id), int(user_id)),
         )
-        row = await cur.fetchone()
         if not row:
             return None
         return int(row[0])
 
     async def count_parliament_vote_entries(self, vote_id: int):
-        cur = await self._conn.execute(
+        rows = await self.fetchall(
             """
             SELECT candidate_id, COUNT(*) FROM parliament_vote_entries
             WHERE vote_id = ?
@@ -1565,21 +2367,15 @@ class Database:
             """,
             (int(vote_id),),
         )
-        rows = await cur.fetchall()
         return {int(r[0]): int(r[1]) for r in rows if r and r[0] is not None}
 
     async def list_open_parliament_votes(self):
-        cur = await self._conn.execute(
-            """
-            SELECT id, guild_id, channel_id, message_id, candidate_ids_json
-            FROM parliament_votes
-            WHERE status = 'open';
-            """,
+        return await self.fetchall(
+            _SQL_LIST_OPEN_PARLIAMENT_VOTES,
         )
-        return await cur.fetchall()
 
     async def get_wzs_submission(self, submission_id: int):
-        cur = await self._conn.execute(
+        return await self.fetchone(
             """
             SELECT id, guild_id, user_id, thread_id, message_id, content, status,
                    created_at, decided_by, decided_at, posted_at, posted_channel_id, posted_message_id
@@ -1589,21 +2385,12 @@ class Database:
             """,
             (int(submission_id),),
         )
-        return await cur.fetchone()
 
     async def get_wzs_submission_by_thread(self, guild_id: int, thread_id: int):
-        cur = await self._conn.execute(
-            """
-            SELECT id, user_id, message_id, content, status, created_at, decided_by, decided_at,
-                   posted_at, posted_channel_id, posted_message_id
-            FROM wzs_submissions
-            WHERE guild_id = ? AND thread_id = ?
-            ORDER BY id DESC
-            LIMIT 1;
-            """,
+        return await self.fetchone(
+            _SQL_GET_WZS_SUBMISSION_BY_THREAD,
             (int(guild_id), int(thread_id)),
         )
-        return await cur.fetchone()
 
     async def set_wzs_status(self, submission_id: int, status: str, actor_id: int | None = None):
         decided_at = await self.now_iso()
@@ -1620,7 +2407,7 @@ class Database:
                 int(submission_id),
             ),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def mark_wzs_posted(self, submission_id: int, channel_id: int, message_id: int):
         posted_at = await self.now_iso()
@@ -1637,10 +2424,10 @@ class Database:
                 int(submission_id),
             ),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def list_wzs_candidates(self, guild_id: int, limit: int = 200):
-        cur = await self._conn.execute(
+        return await self.fetchall(
             """
             SELECT id, user_id, content, thread_id, created_at
             FROM wzs_submissions
@@ -1650,13 +2437,11 @@ class Database:
             """,
             (int(guild_id), int(limit)),
         )
-        return await cur.fetchall()
 
     async def count_tickets_by_status(self) -> dict:
-        cur = await self._conn.execute("""
+        rows = await self.fetchall("""
         SELECT status, COUNT(*) FROM tickets GROUP BY status;
         """)
-        rows = await cur.fetchall()
         out = {"open": 0, "claimed": 0, "closed": 0}
         for r in rows:
             if not r:
@@ -1673,7 +2458,7 @@ class Database:
         INSERT INTO logs (event, payload, created_at)
         VALUES (?, ?, ?);
         """, (event, json.dumps(payload, ensure_ascii=False), created_at))
-        await self._conn.commit()
+        await self._commit()
 
     async def upsert_dashboard_session(
         self,
@@ -1705,10 +2490,10 @@ class Database:
                 int(created_at),
             ),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def get_dashboard_session(self, session_id: str):
-        cur = await self._conn.execute(
+        return await self.fetchone(
             """
             SELECT session_id, user_id, username, avatar, access_token, refresh_token, expires_at, guilds_json, created_at
             FROM dashboard_sessions
@@ -1717,14 +2502,13 @@ class Database:
             """,
             (str(session_id),),
         )
-        return await cur.fetchone()
 
     async def delete_dashboard_session(self, session_id: str):
         await self._conn.execute(
             "DELETE FROM dashboard_sessions WHERE session_id = ?;",
             (str(session_id),),
         )
-        await self._conn.commit()
+        await self._commit()
 
 
     async def add_infraction(self, guild_id: int, user_id: int, moderator_id: int, action: str,
@@ -1735,40 +2519,35 @@ class Database:
             (int(guild_id), int(user_id), int(moderator_id), str(action),
              int(duration_seconds) if duration_seconds is not None else None, str(reason) if reason else None, now)
         )
-        await self._conn.commit()
+        await self._commit()
         return int(cur.lastrowid)
 
     async def count_recent_infractions(self, guild_id: int, user_id: int, actions: list[str], since_ts: int) -> int:
         q = ",".join(["?"] * len(actions))
-        cur = await self._conn.execute(
+        row = await self.fetchone(
             f"SELECT COUNT(*) FROM infractions WHERE guild_id=? AND user_id=? AND created_at>=? AND action IN ({q})",
             (int(guild_id), int(user_id), int(since_ts), *[str(a) for a in actions])
         )
-        row = await cur.fetchone()
         return int(row[0] if row else 0)
 
     async def list_infractions(self, guild_id: int, user_id: int, limit: int = 10):
-        cur = await self._conn.execute(
-            "SELECT id, action, duration_seconds, reason, created_at, moderator_id "
-            "FROM infractions WHERE guild_id=? AND user_id=? ORDER BY created_at DESC LIMIT ?",
+        return await self.fetchall(
+            _SQL_LIST_INFRACTIONS,
             (int(guild_id), int(user_id), int(limit))
         )
-        return await cur.fetchall()
 
     async def get_infraction(self, guild_id: int, case_id: int):
-        cur = await self._conn.execute(
+        return await self.fetchone(
             "SELECT id, action, duration_seconds, reason, created_at, moderator_id, user_id "
             "FROM infractions WHERE guild_id=? AND id=? LIMIT 1",
             (int(guild_id), int(case_id))
         )
-        return await cur.fetchone()
 
     async def get_log_thread(self, guild_id: int, key: str) -> int | None:
-        cur = await self._conn.execute(
+        row = await self.fetchone(
             "SELECT thread_id FROM log_threads WHERE guild_id=? AND key=?",
             (int(guild_id), str(key))
         )
-        row = await cur.fetchone()
         return int(row[0]) if row else None
 
     async def set_log_thread(self, guild_id: int, forum_id: int, key: str, thread_id: int):
@@ -1778,7 +2557,7 @@ class Database:
             "ON CONFLICT(guild_id,key) DO UPDATE SET forum_id=excluded.forum_id, thread_id=excluded.thread_id",
             (int(guild_id), int(forum_id), str(key), int(thread_id), now)
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def add_ticket_participant(self, ticket_id: int, user_id: int, added_by: int | None = None) -> None:
         now = int(time.time())
@@ -1786,14 +2565,13 @@ class Database:
             "INSERT OR IGNORE INTO ticket_participants(ticket_id,user_id,added_by,added_at) VALUES(?,?,?,?)",
             (int(ticket_id), int(user_id), int(added_by) if added_by else None, now)
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def list_ticket_participants(self, ticket_id: int) -> list[int]:      
-        cur = await self._conn.execute(
+        rows = await self.fetchall(
             "SELECT user_id FROM ticket_participants WHERE ticket_id = ? ORDER BY user_id ASC",
             (int(ticket_id),)
         )
-        rows = await cur.fetchall()
         return [int(r[0]) for r in rows if r and r[0] is not None]
 
     async def create_tempvoice_room(
@@ -1820,42 +2598,36 @@ class Database:
                 created_at,
             ),
         )
-        await self._conn.commit()
+        await self._commit()
 
-    async def get_tempvoice_room_by_channel(self, guild_id: int, channel_id: int):
-        cur = await self._conn.execute(
+    async def get_tempvoice_room_by_channel(self, guild_id: int, channel_id: int) -> TempVoiceRoomRow | None:
+        return await self.fetchone(
             """
             SELECT guild_id, channel_id, owner_id, panel_channel_id, panel_message_id, created_at
             FROM tempvoice_rooms
             WHERE guild_id = ? AND channel_id = ?;
             """,
             (int(guild_id), int(channel_id)),
+            TempVoiceRoomRow,
         )
-        return await cur.fetchone()
 
-    async def get_tempvoice_room_by_owner(self, guild_id: int, owner_id: int):
-        cur = await self._conn.execute(
-            """
-            SELECT guild_id, channel_id, owner_id, panel_channel_id, panel_message_id, created_at
-            FROM tempvoice_rooms
-            WHERE guild_id = ? AND owner_id = ?
-            ORDER BY created_at DESC
-            LIMIT 1;
-            """,
+    async def get_tempvoice_room_by_owner(self, guild_id: int, owner_id: int) -> TempVoiceRoomRow | None:
+        return await self.fetchone(
+            _SQL_GET_TEMPVOICE_ROOM_BY_OWNER,
             (int(guild_id), int(owner_id)),
+            TempVoiceRoomRow,
         )
-        return await cur.fetchone()
 
-    async def list_tempvoice_rooms(self, guild_id: int):
-        cur = await self._conn.execute(
+    async def list_tempvoice_rooms(self, guild_id: int) -> list[TempVoiceRoomRow]:
+        return await self.fetchall(
             """
             SELECT guild_id, channel_id, owner_id, panel_channel_id, panel_message_id, created_at
             FROM tempvoice_rooms
             WHERE guild_id = ?;
             """,
             (int(guild_id),),
+            TempVoiceRoomRow,
         )
-        return await cur.fetchall()
 
     async def set_tempvoice_owner(self, guild_id: int, channel_id: int, owner_id: int):
         await self._conn.execute(
@@ -1866,7 +2638,7 @@ class Database:
             """,
             (int(owner_id), int(guild_id), int(channel_id)),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def set_tempvoice_panel_message(
         self,
@@ -1888,37 +2660,20 @@ class Database:
                 int(channel_id),
             ),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def delete_tempvoice_room(self, guild_id: int, channel_id: int):
         await self._conn.execute(
             "DELETE FROM tempvoice_rooms WHERE guild_id = ? AND channel_id = ?;",
             (int(guild_id), int(channel_id)),
         )
-        await self._conn.commit()
+        await self._commit()
 
     async def get_counting_state(self, guild_id: int, channel_id: int):
-        cur = await self._conn.execute(
-            """
-            SELECT
-                guild_id,
-                channel_id,
-                current_number,
-                last_user_id,
-                highscore,
-                total_counts,
-                total_fails,
-                updated_at,
-                last_count_value,
-                last_count_user_id,
-                last_count_at
-            FROM counting_states
-            WHERE guild_id = ? AND channel_id = ?
-            LIMIT 1;
-            """,
+        return await self.fetchone(
+            _SQL_GET_COUNTING_STATE,
             (int(guild_id), int(channel_id)),
         )
-        return await cur.fetchone()
 
     async def upsert_counting_state(
         self,
@@ -1976,4 +2731,4 @@ class Database:
                 str(last_count_at) if last_count_at is not None else None,
             ),
         )
-        await self._conn.commit()
+        await self._commit()
@@ -11,13 +11,7 @@ class StarryLogger:
 
     async def emit(self, bot: discord.Client, event: str, payload: dict):
         await self.db.log_event(event, payload)
-
-        file_on = self.settings.get_bool("logging.to_file", True)
-        if file_on:
-            path = self.settings.get("logging.file_path", "data/logs.jsonl")
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            with open(path, "a", encoding="utf-8") as f:
-                f.write(json.dumps({"event": event, "payload": payload}, ensure_ascii=False) + "\n")
+        self._write_file(event, payload)
 
         to_discord = self.settings.get_bool("logging.to_discord", True)
         log_channel_id = self.settings.get_int("bot.log_channel_id")
@@ -32,3 +26,12 @@ class StarryLogger:
 
     async def emit_system(self, event: str, payload: dict):
         await self.db.log_event(event, payload)
+        self._write_file(event, payload)
+
+    def _write_file(self, event: str, payload: dict):
+        file_on = self.settings.get_bool("logging.to_file", True)
+        if file_on:
+            path = self.settings.get("logging.file_path", "data/logs.jsonl")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"event": event, "payload": payload}, ensure_ascii=False) + "\n")
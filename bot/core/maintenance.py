@@ -0,0 +1,142 @@
+import os
+import asyncio
+from datetime import datetime, timezone, timedelta
+from zoneinfo import ZoneInfo
+
+_SNAPSHOT_PREFIX = "starry-"
+
+
+def _parse_window(raw: str) -> tuple[int, int] | None:
+    try:
+        start, end = str(raw).split("-", 1)
+        start_h, start_m = start.strip().split(":", 1)
+        end_h, end_m = end.strip().split(":", 1)
+        return int(start_h) * 60 + int(start_m), int(end_h) * 60 + int(end_m)
+    except Exception:
+        return None
+
+
+class DatabaseMaintenance:
+    def __init__(self, db, settings, logger, state):
+        self.db = db
+        self.settings = settings
+        self.logger = logger
+        self.state = state
+        self._lock = asyncio.Lock()
+
+    def _tz(self):
+        tz_name = str(self.settings.get("database.maintenance.timezone", "UTC") or "UTC")
+        try:
+            return ZoneInfo(tz_name)
+        except Exception:
+            return timezone.utc
+
+    def in_quiet_window(self, now: datetime) -> bool:
+        window = _parse_window(self.settings.get("database.maintenance.quiet_hours", "03:00-05:00"))
+        if not window:
+            return False
+        local = now.astimezone(self._tz())
+        minute = local.hour * 60 + local.minute
+        start, end = window
+        if start <= end:
+            return start <= minute < end
+        return minute >= start or minute < end
+
+    async def tick(self):
+        if not self.settings.get_bool("database.maintenance.enabled", True):
+            return
+        now = datetime.now(timezone.utc)
+        if not self.in_quiet_window(now):
+            return
+        today = now.astimezone(self._tz()).date().isoformat()
+        if self.state.get(0, "database.last_maintenance_date") != today:
+            self.state.set(0, "database.last_maintenance_date", today)
+            try:
+                await self.run_maintenance()
+            except Exception as e:
+                await self._emit_failure("db_maintenance_failed", e)
+        if self._snapshot_due(now):
+            self.state.set(0, "database.last_snapshot_at", now.isoformat())
+            try:
+                await self.snapshot()
+            except Exception as e:
+                await self._emit_failure("db_snapshot_failed", e)
+
+    async def _emit_failure(self, event: str, error: Exception):
+        try:
+            await self.logger.emit_system(event, {"error": f"{type(error).__name__}: {error}"})
+        except Exception:
+            pass
+
+    def _snapshot_due(self, now: datetime) -> bool:
+        if not self.settings.get_bool("database.maintenance.snapshot_enabled", True):
+            return False
+        interval_hours = float(self.settings.get("database.maintenance.snapshot_interval_hours", 24) or 24)
+        last = self.state.get(0, "database.last_snapshot_at")
+        if not last:
+            return True
+        try:
+            last_dt = datetime.fromisoformat(str(last))
+        except Exception:
+            return True
+        return now - last_dt >= timedelta(hours=interval_hours)
+
+    async def run_maintenance(self) -> dict:
+        async with self._lock:
+            before = await self.db.storage_stats()
+            checkpoint = await self.db.checkpoint(
+                self.settings.get("database.maintenance.checkpoint_mode", "TRUNCATE") or "TRUNCATE"
+            )
+            await self.db.optimize(
+                analyze=True,
+                analysis_limit=self.settings.get_int("database.maintenance.analysis_limit", 1000),
+            )
+            converted = False
+            if self.settings.get_bool("database.maintenance.convert_auto_vacuum", True):
+                converted = await self.db.enable_incremental_vacuum()
+            vacuumed = await self.db.incremental_vacuum(
+                self.settings.get_int("database.maintenance.vacuum_pages", 2000)
+            )
+            after = await self.db.storage_stats()
+        report = {
+            "checkpoint": checkpoint,
+            "auto_vacuum_converted": converted,
+            "vacuumed_pages": vacuumed,
+            "before": before,
+            "after": after,
+        }
+        await self.logger.emit_system("db_maintenance", report)
+        return report
+
+    async def snapshot(self) -> dict:
+        snapshot_dir = str(self.settings.get("database.maintenance.snapshot_dir", "data/snapshots") or "data/snapshots")
+        os.makedirs(snapshot_dir, exist_ok=True)
+        now = datetime.now(timezone.utc)
+        dest = os.path.join(snapshot_dir, f"{_SNAPSHOT_PREFIX}{now.strftime('%Y%m%d-%H%M%S')}.db")
+        async with self._lock:
+            info = await self.db.snapshot(
+                dest,
+                pages=self.settings.get_int("database.maintenance.snapshot_step_pages", 256),
+            )
+        self.state.set(0, "database.last_snapshot_at", now.isoformat())
+        info["pruned"] = self._prune_snapshots(snapshot_dir)
+        await self.logger.emit_system("db_snapshot", info)
+        return info
+
+    def _prune_snapshots(self, snapshot_dir: str) -> int:
+        keep = max(1, self.settings.get_int("database.maintenance.snapshot_keep", 7))
+        try:
+            names = sorted(
+                n for n in os.listdir(snapshot_dir)
+                if n.startswith(_SNAPSHOT_PREFIX) and n.endswith(".db")
+            )
+        except Exception:
+            return 0
+        pruned = 0
+        for name in names[:-keep]:
+            try:
+                os.remove(os.path.join(snapshot_dir, name))
+                pruned += 1
+            except Exception:
+                pass
+        return pruned
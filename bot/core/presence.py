@@ -1,14 +1,32 @@
+import time
 import discord
 from discord.ext import tasks
 
 _PRESENCE_TEXT_1 = "💌 𑁉 Schreib mir eine DM für Support"
+_STATES = (
+    "support",
+    "active_users",
+    "total_messages",
+    "total_voice_hours",
+    "total_tickets",
+    "open_tickets",
+    "warns",
+    "giveaways_open",
+    "polls_open",
+    "applications_open",
+    "wzs_submissions",
+    "total_users",
+)
 
 
 class PresenceRotator:
-    def __init__(self, bot: discord.Client, db, interval_seconds: int = 20):
+    def __init__(self, bot: discord.Client, db, interval_seconds: int = 20, active_users_refresh_seconds: int = 600):
         self.bot = bot
         self.db = db
         self._i = 0
+        self._active_users_ttl = max(60, int(active_users_refresh_seconds))
+        self._active_users_cache = None
+        self._active_users_at = 0.0
         self._loop.change_interval(seconds=max(12, int(interval_seconds)))
 
     def start(self):
@@ -19,87 +37,52 @@ class PresenceRotator:
         if self._loop.is_running():
             self._loop.cancel()
 
-    async def _fetch_count(self, query: str) -> int:
-        conn = (
-            getattr(self.db, "conn", None)
-            or getattr(self.db, "_conn", None)
-            or getattr(self.db, "connection", None)
-        )
-
-        if conn is not None:
-            cur = await conn.execute(query)
-            row = await cur.fetchone()
-            try:
-                await cur.close()
-            except Exception:
-                pass
-            return int(row[0]) if row and row[0] is not None else 0
+    async def _counter(self, name: str) -> int:
+        try:
+            return await self.db.get_stat_counter(name)
+        except Exception:
+            return 0
 
-        if hasattr(self.db, "execute"):
-            cur = await self.db.execute(query)
-            row = await cur.fetchone()
+    async def _active_users(self) -> int:
+        now = time.monotonic()
+        if self._active_users_cache is None or now - self._active_users_at >= self._active_users_ttl:
             try:
-                await cur.close()
+                self._active_users_cache = await self.db.count_active_users(24)
             except Exception:
-                pass
-            return int(row[0]) if row and row[0] is not None else 0
-
-        return 0
-
-    async def _fetch_sum(self, query: str) -> int:
-        return await self._fetch_count(query)
-
-    async def _get_stats(self) -> dict[str, int]:
-        total_tickets = await self._fetch_count("SELECT COUNT(*) FROM tickets")
-        open_tickets = await self._fetch_count("SELECT COUNT(*) FROM tickets WHERE status IS NULL OR status != 'closed'")
-        total_users = await self._fetch_count("SELECT COUNT(*) FROM user_stats")
-        total_messages = await self._fetch_sum("SELECT COALESCE(SUM(message_count), 0) FROM user_stats")
-        total_voice_hours = await self._fetch_sum("SELECT COALESCE(SUM(voice_seconds), 0) FROM user_stats") // 3600
-        active_users = await self._fetch_count(
-            "SELECT COUNT(*) FROM user_stats "
-            "WHERE (last_message_at IS NOT NULL AND datetime(last_message_at) >= datetime('now','-1 day')) "
-            "OR (last_voice_at IS NOT NULL AND datetime(last_voice_at) >= datetime('now','-1 day'))"
-        )
-        warns = await self._fetch_count("SELECT COUNT(*) FROM infractions WHERE action = 'warn'")
-        giveaways_open = await self._fetch_count("SELECT COUNT(*) FROM giveaways WHERE status = 'open'")
-        polls_open = await self._fetch_count("SELECT COUNT(*) FROM polls WHERE status = 'open'")
-        applications_open = await self._fetch_count("SELECT COUNT(*) FROM applications WHERE status = 'open'")
-        wzs_submissions = await self._fetch_count("SELECT COUNT(*) FROM wzs_submissions")
-
-        return {
-            "total_tickets": total_tickets,
-            "open_tickets": open_tickets,
-            "total_users": total_users,
-            "total_messages": total_messages,
-            "total_voice_hours": total_voice_hours,
-            "active_users": active_users,
-            "warns": warns,
-            "giveaways_open": giveaways_open,
-            "polls_open": polls_open,
-            "applications_open": applications_open,
-            "wzs_submissions": wzs_submissions,
-        }
+                if self._active_users_cache is None:
+                    return 0
+            self._active_users_at = now
+        return self._active_users_cache
+
+    async def _state(self, index: int) -> tuple[discord.ActivityType, str]:
+        key = _STATES[index]
+        if key == "support":
+            return discord.ActivityType.listening, _PRESENCE_TEXT_1
+        if key == "active_users":
+            return discord.ActivityType.watching, f"🟢 𑁉 Aktive User (24h): {await self._active_users()}"
+        if key == "total_messages":
+            return discord.ActivityType.watching, f"💬 𑁉 Nachrichten gesamt: {await self._counter('total_messages')}"
+        if key == "total_voice_hours":
+            return discord.ActivityType.watching, f"🎙️ 𑁉 Voice-Stunden: {await self._counter('total_voice_seconds') // 3600}"
+        if key == "total_tickets":
+            return discord.ActivityType.playing, f"🎫 𑁉 Tickets gesamt: {await self._counter('total_tickets')}"
+        if key == "open_tickets":
+            return discord.ActivityType.watching, f"🟡 𑁉 Offene Tickets: {await self._counter('open_tickets')}"
+        if key == "warns":
+            return discord.ActivityType.watching, f"⚠️ 𑁉 Warnungen: {await self._counter('warns')}"
+        if key == "giveaways_open":
+            return discord.ActivityType.watching, f"🎁 𑁉 Giveaways offen: {await self._counter('giveaways_open')}"
+        if key == "polls_open":
+            return discord.ActivityType.watching, f"📊 𑁉 Umfragen offen: {await self._counter('polls_open')}"
+        if key == "applications_open":
+            return discord.ActivityType.watching, f"📝 𑁉 Bewerbungen offen: {await self._counter('applications_open')}"
+        if key == "wzs_submissions":
+            return discord.ActivityType.watching, f"📜 𑁉 Weisheiten: {await self._counter('wzs_submissions')}"
+        return discord.ActivityType.watching, f"👥 𑁉 User im System: {await self._counter('total_users')}"
 
     @tasks.loop(seconds=20)
     async def _loop(self):
-        s = await self._get_stats()
-
-        states = [
-            (discord.ActivityType.listening, _PRESENCE_TEXT_1),
-            (discord.ActivityType.watching, f"🟢 𑁉 Aktive User (24h): {s['active_users']}"),
-            (discord.ActivityType.watching, f"💬 𑁉 Nachrichten gesamt: {s['total_messages']}"),
-            (discord.ActivityType.watching, f"🎙️ 𑁉 Voice-Stunden: {s['total_voice_hours']}"),
-            (discord.ActivityType.playing, f"🎫 𑁉 Tickets gesamt: {s['total_tickets']}"),
-            (discord.ActivityType.watching, f"🟡 𑁉 Offene Tickets: {s['open_tickets']}"),
-            (discord.ActivityType.watching, f"⚠️ 𑁉 Warnungen: {s['warns']}"),
-            (discord.ActivityType.watching, f"🎁 𑁉 Giveaways offen: {s['giveaways_open']}"),
-            (discord.ActivityType.watching, f"📊 𑁉 Umfragen offen: {s['polls_open']}"),
-            (discord.ActivityType.watching, f"📝 𑁉 Bewerbungen offen: {s['applications_open']}"),
-            (discord.ActivityType.watching, f"📜 𑁉 Weisheiten: {s['wzs_submissions']}"),
-            (discord.ActivityType.watching, f"👥 𑁉 User im System: {s['total_users']}"),
-        ]
-
-        activity_type, text = states[self._i % len(states)]
+        activity_type, text = await self._state(self._i % len(_STATES))
         self._i += 1
 
         activity = discord.Activity(type=activity_type, name=text)
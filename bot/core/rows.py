@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from typing import NamedTuple
+
+
+class TicketRow(NamedTuple):
+    id: int
+    guild_id: int
+    user_id: int
+    forum_channel_id: int
+    thread_id: int
+    summary_message_id: int
+    category_key: str | None
+    status: str
+    claimed_by: int | None
+    created_at: str | None
+    closed_at: str | None
+    rating: int | None
+    rating_comment: str | None
+    priority: int | None
+    status_label: str | None
+    escalated_level: int | None
+    escalated_by: int | None
+    last_activity_at: str | None
+    last_user_message_at: str | None
+    last_staff_message_at: str | None
+    first_staff_reply_at: str | None
+    sla_breached_at: str | None
+    archive_started_at: str | None
+
+
+TICKET_COLUMNS = ", ".join(TicketRow._fields)
+
+
+class TicketMessageRow(NamedTuple):
+    id: int
+    ticket_id: int
+    message_id: int | None
+    author_id: int
+    author_name: str | None
+    author_tag: str | None
+    author_avatar: str | None
+    author_color: int | None
+    direction: str
+    content: str | None
+    attachments_json: str | None
+    created_at: str
+
+
+TICKET_MESSAGE_COLUMNS = ", ".join(TicketMessageRow._fields)
+
+
+class TicketSearchHit(NamedTuple):
+    message_id: int
+    ticket_id: int
+    thread_id: int
+    ticket_status: str
+    author_id: int
+    author_name: str | None
+    direction: str
+    created_at: str
+    snippet: str
+    rank: float
+
+
+@dataclass(slots=True)
+class UserStats:
+    guild_id: int
+    user_id: int
+    message_count: int = 0
+    voice_seconds: int = 0
+    welcome_count: int = 0
+    xp: int = 0
+    level: int = 0
+    last_message_at: str | None = None
+    last_voice_at: str | None = None
+    invite_count: int = 0
+    invite_left_count: int = 0
+
+
+class TempVoiceRoomRow(NamedTuple):
+    guild_id: int
+    channel_id: int
+    owner_id: int
+    panel_channel_id: int | None
+    panel_message_id: int | None
+    created_at: str | None
+
+
+class GiveawayRow(NamedTuple):
+    id: int
+    guild_id: int
+    channel_id: int
+    message_id: int | None
+    title: str
+    sponsor: str | None
+    description: str | None
+    end_at: str
+    winner_count: int
+    conditions_json: str | None
+    created_by: int
+    status: str
+    created_at: str | None
+
+
+GIVEAWAY_COLUMNS = ", ".join(GiveawayRow._fields)
+
+
+class PollRow(NamedTuple):
+    id: int
+    guild_id: int
+    channel_id: int
+    message_id: int | None
+    question: str
+    options_json: str
+    created_by: int
+    status: str
+    created_at: str | None
+
+
+POLL_COLUMNS = ", ".join(PollRow._fields)
@@ -3,6 +3,30 @@ import json
 import yaml
 import asyncio
 from copy import deepcopy
+from dataclasses import dataclass
+
+_MISSING = object()
+
+SETTINGS_GLOBAL_RELOAD = "global_reload"
+SETTINGS_GLOBAL_OVERRIDE = "global_override"
+SETTINGS_GUILD_OVERRIDE_SET = "guild_override_set"
+SETTINGS_GUILD_OVERRIDES_REPLACED = "guild_overrides_replaced"
+
+
+@dataclass(frozen=True)
+class SettingsChange:
+    kind: str
+    guild_id: int | None = None
+    prefixes: tuple[str, ...] = ()
+
+    def affects(self, prefix: str) -> bool:
+        if not self.prefixes:
+            return True
+        for p in self.prefixes:
+            if p == prefix or p.startswith(prefix + ".") or prefix.startswith(p + "."):
+                return True
+        return False
+
 
 class SettingsManager:
     def __init__(self, config_path: str, override_path: str):
@@ -12,63 +36,186 @@ class SettingsManager:
         self._base = {}
         self._override = {}
         self._merged = {}
+        self._flat = {}
+        self._base_flat = {}
         self._override_mtime = 0.0
+        self._base_mtime = 0.0
+        self._override_dirty = False
+        self._override_writer = None
+        self._override_write_delay = 0.5
+        self._override_write_max_delay = 5.0
+        self._override_changed_at = 0.0
         self._guild_overrides = {}
-        self._guild_cache = {}
+        self._guild_layers = {}
+        self._guild_resolved = {}
+        self._guild_typed = {}
+        self._version = 0
+        self._guild_versions = {}
+        self._subscribers = []
+
+    def guild_version(self, guild_id: int) -> tuple[int, int]:
+        return self._version, self._guild_versions.get(int(guild_id), 0)
+
+    def subscribe(self, callback):
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        try:
+            self._subscribers.remove(callback)
+        except ValueError:
+            pass
+
+    def _publish(self, kind: str, guild_id: int | None = None, prefixes=()):
+        change = SettingsChange(kind=kind, guild_id=guild_id, prefixes=tuple(prefixes))
+        for callback in list(self._subscribers):
+            try:
+                callback(change)
+            except Exception:
+                pass
+
+    def _bump_guild_version(self, guild_id: int):
+        gid = int(guild_id)
+        self._guild_versions[gid] = self._guild_versions.get(gid, 0) + 1
 
     async def load(self):
         async with self._lock:
             self._base = self._load_yaml(self.config_path)
+            self._base_flat = self._flatten_nodes(self._base)
+            self._base_mtime = self._get_mtime(self.config_path)
             self._override = self._load_json(self.override_path)
             self._merged = self._merge(deepcopy(self._base), deepcopy(self._override))
+            self._flat = self._flatten_nodes(self._merged)
             self._override_mtime = self._get_mtime(self.override_path)
+            self._drop_guild_cache()
+            self._version += 1
+        self._publish(SETTINGS_GLOBAL_RELOAD)
 
-    async def reload_if_changed(self) -> bool:
-        mtime = self._get_mtime(self.override_path)
-        if mtime <= 0:
-            return False
-        if mtime == self._override_mtime:
-            return False
-        await self.load()
-        return True
+    async def reload_if_changed(self) -> dict | None:
+        base_mtime = self._get_mtime(self.config_path)
+        override_mtime = self._get_mtime(self.override_path)
+        base_changed = base_mtime > 0 and base_mtime != self._base_mtime
+        override_changed = override_mtime > 0 and override_mtime != self._override_mtime
+        if not base_changed and not override_changed:
+            return None
+        return await self._reload_layers(base_changed, override_changed)
+
+    async def _reload_layers(self, base_changed: bool, override_changed: bool) -> dict | None:
+        async with self._lock:
+            base_changed = base_changed and self._get_mtime(self.config_path) != self._base_mtime
+            override_changed = (
+                override_changed
+                and not self._override_dirty
+                and self._get_mtime(self.override_path) != self._override_mtime
+            )
+            if not base_changed and not override_changed:
+                return None
+            base = self._load_yaml(self.config_path) if base_changed else self._base
+            override = self._load_json(self.override_path) if override_changed else self._override
+            before = self._flatten(self._merged)
+            base_before = self._flatten(self._base) if base_changed else {}
+            if base_changed:
+                self._base = base
+                self._base_flat = self._flatten_nodes(base)
+                self._base_mtime = self._get_mtime(self.config_path)
+                self._drop_guild_cache()
+            if override_changed:
+                self._override = override
+                self._override_mtime = self._get_mtime(self.override_path)
+            self._merged = self._merge(deepcopy(self._base), deepcopy(self._override))
+            self._flat = self._flatten_nodes(self._merged)
+            self._version += 1
+            after = self._flatten(self._merged)
+        layers = []
+        if base_changed:
+            layers.append("config")
+        if override_changed:
+            layers.append("override")
+        diff = {
+            "layers": layers,
+            "changed": sorted(k for k in before.keys() & after.keys() if before[k] != after[k]),
+            "added": sorted(after.keys() - before.keys()),
+            "removed": sorted(before.keys() - after.keys()),
+        }
+        prefixes = set(diff["changed"]) | set(diff["added"]) | set(diff["removed"])
+        if base_changed:
+            base_after = self._flatten(base)
+            prefixes |= {k for k in base_before.keys() | base_after.keys() if base_before.get(k, _MISSING) != base_after.get(k, _MISSING)}
+        if prefixes:
+            self._publish(SETTINGS_GLOBAL_RELOAD, prefixes=sorted(prefixes))
+        return diff
 
     async def set_override(self, path: str, value):
         async with self._lock:
-            self._override = self._load_json(self.override_path)
-            self._set_path(self._override, path, value)
-            os.makedirs(os.path.dirname(self.override_path), exist_ok=True)
-            with open(self.override_path, "w", encoding="utf-8") as f:
-                json.dump(self._override, f, ensure_ascii=False, indent=2)
+            rewritten = self._set_path(self._override, path, value)
             self._merged = self._merge(deepcopy(self._base), deepcopy(self._override))
-            self._override_mtime = self._get_mtime(self.override_path)
+            self._flat = self._flatten_nodes(self._merged)
+            self._version += 1
+            self._schedule_override_write()
+        self._publish(SETTINGS_GLOBAL_OVERRIDE, prefixes=(rewritten,))
 
     async def replace_overrides(self, data: dict):
         async with self._lock:
-            os.makedirs(os.path.dirname(self.override_path), exist_ok=True)
-            with open(self.override_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
             self._override = data
             self._merged = self._merge(deepcopy(self._base), deepcopy(self._override))
-            self._override_mtime = self._get_mtime(self.override_path)
+            self._flat = self._flatten_nodes(self._merged)
+            self._version += 1
+            self._schedule_override_write()
+        self._publish(SETTINGS_GLOBAL_OVERRIDE)
+
+    async def flush_overrides(self):
+        async with self._lock:
+            if not self._override_dirty:
+                return
+            self._override_dirty = False
+            try:
+                self._override_mtime = await asyncio.to_thread(self._write_json_atomic, self.override_path, self._override)
+            except Exception:
+                self._override_dirty = True
+                raise
+
+    def _schedule_override_write(self):
+        self._override_dirty = True
+        self._override_changed_at = asyncio.get_running_loop().time()
+        if self._override_writer is None or self._override_writer.done():
+            self._override_writer = asyncio.create_task(self._override_write_loop())
+
+    async def _override_write_loop(self):
+        loop = asyncio.get_running_loop()
+        while self._override_dirty:
+            deadline = loop.time() + self._override_write_max_delay
+            while True:
+                wait = min(self._override_changed_at + self._override_write_delay, deadline) - loop.time()
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            try:
+                await self.flush_overrides()
+            except Exception:
+                await asyncio.sleep(5)
+
+    def _write_json_atomic(self, path: str, data: dict) -> float:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return self._get_mtime(path)
 
     def dump(self) -> dict:
         return deepcopy(self._merged)
 
     def dump_guild(self, guild_id: int) -> dict:
-        return deepcopy(self._get_guild_merged(guild_id))
+        return self._merge(deepcopy(self._base), deepcopy(self._guild_overrides.get(int(guild_id), {})))
 
     def dump_guild_overrides(self, guild_id: int) -> dict:
         return deepcopy(self._guild_overrides.get(int(guild_id), {}))
 
     def get(self, dotted: str, default=None):
-        node = self._merged
-        for part in dotted.split("."):
-            if not isinstance(node, dict):
-                return default
-            if part not in node:
-                return default
-            node = node[part]
-        return node
+        value = self._flat.get(dotted, _MISSING)
+        return default if value is _MISSING else value
 
     def get_int(self, dotted: str, default: int = 0) -> int:
         v = self.get(dotted, default)
@@ -78,34 +225,49 @@ class SettingsManager:
             return default
 
     def get_bool(self, dotted: str, default: bool = False) -> bool:
-        v = self.get(dotted, default)
-        if isinstance(v, bool):
-            return v
-        if isinstance(v, str):
-            return v.lower() in {"true", "1", "yes", "on"}
-        return bool(v)
+        return self._coerce_bool(self.get(dotted, default))
 
     def get_guild(self, guild_id: int, dotted: str, default=None):
         if not guild_id:
             return self.get(dotted, default)
-        node = self._get_guild_merged(int(guild_id))
-        for part in dotted.split("."):
-            if not isinstance(node, dict):
-                return default
-            if part not in node:
-                return default
-            node = node[part]
-        return node
+        gid = int(guild_id)
+        if gid not in self._guild_layers:
+            value = self._base_flat.get(dotted, _MISSING)
+            return default if value is _MISSING else value
+        resolved = self._guild_resolved.setdefault(gid, {})
+        value = resolved.get(dotted, _MISSING)
+        if value is _MISSING and dotted not in resolved:
+            value = self._resolve_guild(gid, dotted)
+            resolved[dotted] = value
+        return default if value is _MISSING else value
 
     def get_guild_int(self, guild_id: int, dotted: str, default: int = 0) -> int:
+        if not guild_id:
+            return self.get_int(dotted, default)
+        typed = self._guild_typed.setdefault(int(guild_id), {})
+        key = ("int", dotted, default)
+        if key in typed:
+            return typed[key]
         v = self.get_guild(guild_id, dotted, default)
         try:
-            return int(v)
+            v = int(v)
         except Exception:
-            return default
+            v = default
+        typed[key] = v
+        return v
 
     def get_guild_bool(self, guild_id: int, dotted: str, default: bool = False) -> bool:
-        v = self.get_guild(guild_id, dotted, default)
+        if not guild_id:
+            return self.get_bool(dotted, default)
+        typed = self._guild_typed.setdefault(int(guild_id), {})
+        key = ("bool", dotted, default)
+        if key in typed:
+            return typed[key]
+        v = self._coerce_bool(self.get_guild(guild_id, dotted, default))
+        typed[key] = v
+        return v
+
+    def _coerce_bool(self, v) -> bool:
         if isinstance(v, bool):
             return v
         if isinstance(v, str):
@@ -117,7 +279,7 @@ class SettingsManager:
             rows = await db.list_guild_configs(int(guild_id))
         else:
             rows = await db.list_all_guild_configs()
-        overrides = {} if not guild_id else self._guild_overrides
+        overrides = {}
         if not guild_id:
             self._guild_overrides = {}
         for row in rows:
@@ -133,26 +295,46 @@ class SettingsManager:
             overrides[gid] = node
         if guild_id:
             self._guild_overrides[int(guild_id)] = overrides.get(int(guild_id), {})
+            self._rebuild_guild_layer(int(guild_id))
+            self._bump_guild_version(int(guild_id))
+            self._publish(SETTINGS_GUILD_OVERRIDES_REPLACED, guild_id=int(guild_id))
         else:
             self._guild_overrides = overrides
-        self._guild_cache = {}
+            self._guild_layers = {}
+            self._drop_guild_cache()
+            for gid in overrides:
+                self._rebuild_guild_layer(gid)
+            self._version += 1
+            self._publish(SETTINGS_GLOBAL_RELOAD)
 
     async def set_guild_override(self, db, guild_id: int, path: str, value):
         async with self._lock:
             await db.set_guild_config(int(guild_id), str(path), json.dumps(value, ensure_ascii=False))
             node = self._guild_overrides.get(int(guild_id), {})
-            self._set_path(node, path, value)
+            rewritten = self._set_path(node, path, value)
             self._guild_overrides[int(guild_id)] = node
-            self._guild_cache.pop(int(guild_id), None)
+            self._rebuild_guild_layer(int(guild_id), [rewritten])
+            self._bump_guild_version(int(guild_id))
+        self._publish(SETTINGS_GUILD_OVERRIDE_SET, guild_id=int(guild_id), prefixes=(rewritten,))
 
     async def replace_guild_overrides(self, db, guild_id: int, data: dict):
-        async with self._lock:
-            await db.delete_guild_configs(int(guild_id))
-            flat = self._flatten(data)
-            for key, value in flat.items():
-                await db.set_guild_config(int(guild_id), str(key), json.dumps(value, ensure_ascii=False))
-            self._guild_overrides[int(guild_id)] = data
-            self._guild_cache.pop(int(guild_id), None)
+        try:
+            async with self._lock:
+                flat = self._flatten(data)
+                await db.replace_guild_configs(
+                    int(guild_id),
+                    [(str(key), json.dumps(value, ensure_ascii=False)) for key, value in flat.items()],
+                )
+                self._guild_overrides[int(guild_id)] = data
+                self._rebuild_guild_layer(int(guild_id))
+                self._bump_guild_version(int(guild_id))
+        except Exception:
+            try:
+                await self.load_guild_overrides(db, int(guild_id))
+            except Exception:
+                pass
+            raise
+        self._publish(SETTINGS_GUILD_OVERRIDES_REPLACED, guild_id=int(guild_id))
 
     def _load_yaml(self, path: str) -> dict:
         if not os.path.exists(path):
@@ -178,23 +360,79 @@ class SettingsManager:
                 base[k] = v
         return base
 
-    def _set_path(self, root: dict, dotted: str, value):
+    def _set_path(self, root: dict, dotted: str, value) -> str:
         parts = dotted.split(".")
         node = root
-        for p in parts[:-1]:
+        rewritten = dotted
+        for i, p in enumerate(parts[:-1]):
             if p not in node or not isinstance(node[p], dict):
+                if rewritten == dotted and p in node:
+                    rewritten = ".".join(parts[:i + 1])
                 node[p] = {}
             node = node[p]
         node[parts[-1]] = value
+        return rewritten
 
-    def _get_guild_merged(self, guild_id: int) -> dict:
-        gid = int(guild_id)
-        cached = self._guild_cache.get(gid)
-        if cached is not None:
-            return cached
-        merged = self._merge(deepcopy(self._base), deepcopy(self._guild_overrides.get(gid, {})))
-        self._guild_cache[gid] = merged
-        return merged
+    def _drop_guild_cache(self, guild_id: int | None = None, paths: list[str] | None = None):
+        if guild_id is None:
+            self._guild_resolved = {}
+            self._guild_typed = {}
+            return
+        if paths is None:
+            self._guild_resolved.pop(guild_id, None)
+            self._guild_typed.pop(guild_id, None)
+            return
+
+        def _affected(key: str) -> bool:
+            for path in paths:
+                if key == path or key.startswith(path + ".") or path.startswith(key + "."):
+                    return True
+            return False
+
+        resolved = self._guild_resolved.get(guild_id)
+        if resolved:
+            for key in [k for k in resolved if _affected(k)]:
+                resolved.pop(key, None)
+        typed = self._guild_typed.get(guild_id)
+        if typed:
+            for key in [k for k in typed if _affected(k[1])]:
+                typed.pop(key, None)
+
+    def _rebuild_guild_layer(self, guild_id: int, paths: list[str] | None = None):
+        layer = self._flatten_nodes(self._guild_overrides.get(guild_id, {}))
+        if layer:
+            self._guild_layers[guild_id] = layer
+        else:
+            self._guild_layers.pop(guild_id, None)
+        self._drop_guild_cache(guild_id, paths)
+
+    def _resolve_guild(self, guild_id: int, dotted: str):
+        layer = self._guild_layers.get(guild_id) or {}
+        prefix = ""
+        for part in dotted.split(".")[:-1]:
+            prefix = f"{prefix}.{part}" if prefix else part
+            node = layer.get(prefix, _MISSING)
+            if node is _MISSING:
+                continue
+            if not isinstance(node, dict) or not isinstance(self._base_flat.get(prefix), dict):
+                return layer.get(dotted, _MISSING)
+        node = layer.get(dotted, _MISSING)
+        if node is _MISSING:
+            return self._base_flat.get(dotted, _MISSING)
+        base = self._base_flat.get(dotted)
+        if isinstance(node, dict) and isinstance(base, dict):
+            return self._overlay(base, node)
+        return node
+
+    def _overlay(self, base: dict, override: dict) -> dict:
+        out = dict(base)
+        for k, v in override.items():
+            current = out.get(k)
+            if isinstance(current, dict) and isinstance(v, dict):
+                out[k] = self._overlay(current, v)
+            else:
+                out[k] = v
+        return out
 
     def _flatten(self, root: dict, prefix: str = "") -> dict:
         out = {}
@@ -206,6 +444,16 @@ class SettingsManager:
                 out[dotted] = value
         return out
 
+    def _flatten_nodes(self, root: dict, prefix: str = "", out: dict | None = None) -> dict:
+        if out is None:
+            out = {}
+        for key, value in (root or {}).items():
+            dotted = f"{prefix}.{key}" if prefix else str(key)
+            out[dotted] = value
+            if isinstance(value, dict):
+                self._flatten_nodes(value, dotted, out)
+        return out
+
     def _get_mtime(self, path: str) -> float:
         try:
             return os.path.getmtime(path)
@@ -0,0 +1,105 @@
+import os
+import asyncio
+
+try:
+    from watchfiles import awatch
+except Exception:
+    awatch = None
+
+
+class SettingsWatcher:
+    def __init__(self, settings, on_change, on_error=None, poll_interval: float = 2.0):
+        self.settings = settings
+        self.on_change = on_change
+        self.on_error = on_error
+        self.poll_interval = max(0.5, float(poll_interval))
+        self._task = None
+        self._stop = None
+        self._failed_state = None
+
+    def start(self):
+        if self._task is not None and not self._task.done():
+            return
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+        task, self._task = self._task, None
+        if task is None:
+            return
+        try:
+            await asyncio.wait_for(task, timeout=5)
+        except Exception:
+            task.cancel()
+
+    def _targets(self) -> set[str]:
+        return {
+            os.path.abspath(self.settings.config_path),
+            os.path.abspath(self.settings.override_path),
+        }
+
+    def _file_state(self) -> tuple:
+        state = []
+        for path in sorted(self._targets()):
+            try:
+                st = os.stat(path)
+                state.append((path, st.st_mtime_ns, st.st_size))
+            except OSError:
+                state.append((path, None, None))
+        return tuple(state)
+
+    async def _run(self):
+        if awatch is not None:
+            try:
+                await self._watch()
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+        await self._poll()
+
+    async def _watch(self):
+        targets = self._targets()
+        dirs = sorted({os.path.dirname(p) for p in targets})
+        for d in dirs:
+            os.makedirs(d, exist_ok=True)
+        async for _ in awatch(
+            *dirs,
+            watch_filter=lambda change, path: os.path.abspath(path) in targets,
+            stop_event=self._stop,
+            recursive=False,
+            debounce=500,
+        ):
+            await self._reload()
+
+    async def _poll(self):
+        while not self._stop.is_set():
+            await self._reload()
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _reload(self):
+        try:
+            diff = await self.settings.reload_if_changed()
+        except Exception as e:
+            state = self._file_state()
+            if state == self._failed_state:
+                return
+            self._failed_state = state
+            if self.on_error:
+                try:
+                    await self.on_error(e)
+                except Exception:
+                    pass
+            return
+        self._failed_state = None
+        if diff:
+            try:
+                await self.on_change(diff)
+            except Exception:
+                pass
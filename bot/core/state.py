@@ -0,0 +1,65 @@
+import json
+import asyncio
+
+
+class RuntimeState:
+    def __init__(self, db):
+        self.db = db
+        self._values: dict[int, dict[str, object]] = {}
+        self._dirty: set[tuple[int, str]] = set()
+        self._flush_lock = asyncio.Lock()
+
+    async def load(self):
+        values = {}
+        for guild_id, key, value_json in await self.db.list_runtime_state():
+            try:
+                value = json.loads(value_json)
+            except Exception:
+                value = value_json
+            values.setdefault(int(guild_id), {})[str(key)] = value
+        self._values = values
+        self._dirty = set()
+
+    def get(self, guild_id: int, key: str, default=None):
+        return self._values.get(int(guild_id), {}).get(str(key), default)
+
+    def get_int(self, guild_id: int, key: str, default: int = 0) -> int:
+        try:
+            return int(self.get(guild_id, key, default))
+        except Exception:
+            return default
+
+    def items(self, guild_id: int, prefix: str) -> dict[str, object]:
+        head = f"{prefix}."
+        return {
+            key[len(head):]: value
+            for key, value in self._values.get(int(guild_id), {}).items()
+            if key.startswith(head)
+        }
+
+    def set(self, guild_id: int, key: str, value):
+        self._values.setdefault(int(guild_id), {})[str(key)] = value
+        self._dirty.add((int(guild_id), str(key)))
+
+    def delete(self, guild_id: int, key: str):
+        self._values.get(int(guild_id), {}).pop(str(key), None)
+        self._dirty.add((int(guild_id), str(key)))
+
+    async def flush(self):
+        async with self._flush_lock:
+            dirty, self._dirty = self._dirty, set()
+            if not dirty:
+                return
+            upserts = []
+            deletes = []
+            for guild_id, key in dirty:
+                guild_values = self._values.get(guild_id, {})
+                if key in guild_values:
+                    upserts.append((guild_id, key, json.dumps(guild_values[key], ensure_ascii=False)))
+                else:
+                    deletes.append((guild_id, key))
+            try:
+                await self.db.apply_runtime_state(upserts, deletes)
+            except Exception:
+                self._dirty |= dirty
+                raise
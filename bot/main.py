@@ -44,12 +44,24 @@ async def main():
 
     token = _load_token(settings)
 
-    db = Database("data/starry.db")
+    db = Database(
+        "data/starry.db",
+        group_commit=settings.get_bool("database.group_commit.enabled", False),
+        commit_interval_ms=settings.get_int("database.group_commit.interval_ms", 50),
+        commit_max_pending=settings.get_int("database.group_commit.max_pending", 500),
+        read_pool_size=settings.get_int("database.read_pool_size", 2),
+    )
     await db.init()
     await settings.load_guild_overrides(db)
 
     logger = StarryLogger(settings=settings, db=db)
 
+    try:
+        for scan in await db.check_query_plans():
+            await logger.emit_system("db_query_plan_scan", scan)
+    except Exception:
+        pass
+
     bot = StarryBot(settings=settings, db=db, logger=logger)
 
     web = WebServer(settings=settings, db=db, bot=bot)
@@ -98,6 +110,41 @@ async def main():
     except Exception:
         pass
 
+    try:
+        await bot.settings_watcher.stop()
+    except Exception:
+        pass
+
+    try:
+        await bot.transcript_uploader.close()
+    except Exception:
+        pass
+
+    try:
+        await settings.flush_overrides()
+    except Exception:
+        pass
+
+    try:
+        await bot.state.flush()
+    except Exception:
+        pass
+
+    try:
+        await bot.user_stats_service.close()
+    except Exception:
+        pass
+
+    try:
+        await bot.user_stats_service.flush()
+    except Exception:
+        pass
+
+    try:
+        await db.close()
+    except Exception:
+        pass
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -97,6 +97,10 @@ class ApplicationCommands(commands.Cog):
         await self.service.handle_dm_answer(message)
 
     async def _fetch_count(self, query: str) -> int:
+        fetchone = getattr(self.bot.db, "fetchone", None)
+        if fetchone is not None:
+            row = await fetchone(query)
+            return int(row[0]) if row and row[0] is not None else 0
         conn = (
             getattr(self.bot.db, "conn", None)
             or getattr(self.bot.db, "_conn", None)
@@ -282,12 +282,12 @@ class BirthdayService:
                 continue
             tz = self._tz(guild.id)
             today = datetime.now(tz).date().isoformat()
-            last = self.settings.get_guild(guild.id, "birthday.last_announce_date", None)
+            last = self.bot.state.get(guild.id, "birthday.last_announce_date", None)
             if last == today:
                 continue
             ok = await self.announce_today(guild)
             if ok:
-                await self.settings.set_guild_override(self.db, guild.id, "birthday.last_announce_date", today)
+                self.bot.state.set(guild.id, "birthday.last_announce_date", today)
 
     async def auto_react(self, message: discord.Message):
         if not message.guild:
@@ -64,6 +64,20 @@ class CountingState:
     last_count_at: str | None = None
 
 
+@dataclass
+class CountingConfig:
+    enabled: bool = True
+    channel_id: int = 0
+    allow_consecutive: bool = False
+    milestone_every: int = 100
+    record_every: int = 10
+    channel_name_enabled: bool = True
+    channel_name_template: str = "counting-{count}"
+    channel_name_channel_id: int = 0
+    timeout_seconds: int = 0
+    debug: bool = True
+
+
 class CountingService:
     def __init__(self, bot: discord.Client, settings, db, logger):
         self.bot = bot
@@ -79,6 +93,35 @@ class CountingService:
         self._channel_topic_tasks: dict[int, asyncio.Task] = {}
         self._channel_topic_pending: dict[int, dict[str, int]] = {}
         self._channel_topic_versions: dict[int, int] = {}
+        self._configs: dict[int, CountingConfig] = {}
+        settings.subscribe(self._on_settings_changed)
+
+    def _on_settings_changed(self, change):
+        if not change.affects("counting"):
+            return
+        if change.guild_id is None:
+            self._configs.clear()
+        else:
+            self._configs.pop(int(change.guild_id), None)
+
+    def _config(self, guild_id: int) -> CountingConfig:
+        gid = int(guild_id)
+        cfg = self._configs.get(gid)
+        if cfg is None:
+            cfg = CountingConfig(
+                enabled=bool(self.settings.get_guild_bool(gid, "counting.enabled", True)),
+                channel_id=int(self.settings.get_guild_int(gid, "counting.channel_id", 0) or 0),
+                allow_consecutive=bool(self.settings.get_guild_bool(gid, "counting.allow_consecutive", False)),
+                milestone_every=int(self.settings.get_guild_int(gid, "counting.milestone_every", 100) or 0),
+                record_every=int(self.settings.get_guild_int(gid, "counting.record_every", 10) or 0),
+                channel_name_enabled=bool(self.settings.get_guild_bool(gid, "counting.channel_name_enabled", True)),
+                channel_name_template=str(self.settings.get_guild(gid, "counting.channel_name_template", "counting-{count}") or ""),
+                channel_name_channel_id=int(self.settings.get_guild_int(gid, "counting.channel_name_channel_id", 0) or 0),
+                timeout_seconds=int(self.settings.get_guild_int(gid, "counting.timeout_seconds", 0) or 0),
+                debug=bool(self.settings.get_guild_bool(gid, "counting.debug", True)),
+            )
+            self._configs[gid] = cfg
+        return cfg
 
     def _get_lock(self, channel_id: int) -> asyncio.Lock:
         lock = self._locks.get(channel_id)
@@ -88,35 +131,35 @@ class CountingService:
         return lock
 
     def _enabled(self, guild_id: int) -> bool:
-        return bool(self.settings.get_guild_bool(guild_id, "counting.enabled", True))
+        return self._config(guild_id).enabled
 
     def _channel_id(self, guild_id: int) -> int:
-        return int(self.settings.get_guild_int(guild_id, "counting.channel_id", 0) or 0)
+        return self._config(guild_id).channel_id
 
     def _allow_consecutive(self, guild_id: int) -> bool:
-        return bool(self.settings.get_guild_bool(guild_id, "counting.allow_consecutive", False))
+        return self._config(guild_id).allow_consecutive
 
     def _milestone_every(self, guild_id: int) -> int:
-        return int(self.settings.get_guild_int(guild_id, "counting.milestone_every", 100) or 0)
+        return self._config(guild_id).milestone_every
 
     def _record_every(self, guild_id: int) -> int:
-        return int(self.settings.get_guild_int(guild_id, "counting.record_every", 10) or 0)
+        return self._config(guild_id).record_every
 
     def _channel_name_enabled(self, guild_id: int) -> bool:
-        return bool(self.settings.get_guild_bool(guild_id, "counting.channel_name_enabled", True))
+        return self._config(guild_id).channel_name_enabled
 
     def _channel_name_template(self, guild_id: int) -> str:
-        return str(self.settings.get_guild(guild_id, "counting.channel_name_template", "counting-{count}") or "")
+        return self._config(guild_id).channel_name_template
 
     def _channel_name_channel_id(self, guild_id: int, fallback: int) -> int:
-        cid = int(self.settings.get_guild_int(guild_id, "counting.channel_name_channel_id", 0) or 0)
+        cid = self._config(guild_id).channel_name_channel_id
         return cid if cid else fallback
 
     def _count_timeout_seconds(self, guild_id: int) -> int:
-        return int(self.settings.get_guild_int(guild_id, "counting.timeout_seconds", 0) or 0)
+        return self._config(guild_id).timeout_seconds
 
     def _debug_enabled(self, guild_id: int) -> bool:
-        return bool(self.settings.get_guild_bool(guild_id, "counting.debug", True))
+        return self._config(guild_id).debug
 
     def _render_template(self, template: str, values: dict[str, int | str]) -> str:
         out = str(template or "")
@@ -47,7 +47,7 @@ class GiveawayListener(commands.Cog):
         except Exception:
             msg = None
         interaction = _FakeInteraction(self.bot, guild, member, msg)
-        await self.service.handle_join(interaction, int(row[0]))
+        await self.service.handle_join(interaction, int(row.id))
 
 
 class _FakeInteraction:
@@ -15,6 +15,12 @@ class GiveawayService:
         self.logger = logger
         self._pending = {}
 
+    async def _get_user_stats(self, member: discord.Member):
+        user_stats_service = getattr(self.bot, "user_stats_service", None)
+        if user_stats_service is not None:
+            return await user_stats_service.stats_buffer.get(member.guild.id, member.id)
+        return await self.db.get_user_stats(member.guild.id, member.id)
+
     def _color(self, guild: discord.Guild | None) -> int:
         gid = guild.id if guild else 0
         v = str(self.settings.get_guild(gid, "design.accent_color", "#B16B91") or "").replace("#", "").strip()
@@ -107,28 +113,19 @@ class GiveawayService:
             if days < min_account_days:
                 return False, f"Account muss {min_account_days} Tage alt sein."
         min_messages = int(conditions.get("min_messages") or 0)
+        min_level = int(conditions.get("min_level") or 0)
+        min_voice_hours = int(conditions.get("min_voice_hours") or 0)
+        stats = None
+        if min_messages or min_level or min_voice_hours:
+            stats = await self._get_user_stats(member)
         if min_messages:
-            row = await self.db.get_user_stats(member.guild.id, member.id)
-            if not row:
-                return False, f"Mindestens {min_messages} Nachrichten."
-            msg_count = int(row[2])
-            if msg_count < min_messages:
+            if not stats or int(stats.message_count) < min_messages:
                 return False, f"Mindestens {min_messages} Nachrichten."
-        min_level = int(conditions.get("min_level") or 0)
         if min_level:
-            row = await self.db.get_user_stats(member.guild.id, member.id)
-            if not row:
-                return False, f"Mindestens Level {min_level}."
-            level = int(row[6])
-            if level < min_level:
+            if not stats or int(stats.level) < min_level:
                 return False, f"Mindestens Level {min_level}."
-        min_voice_hours = int(conditions.get("min_voice_hours") or 0)
         if min_voice_hours:
-            row = await self.db.get_user_stats(member.guild.id, member.id)
-            if not row:
-                return False, f"Mindestens {min_voice_hours} Voice-Stunden."
-            voice_hours = int(row[3]) // 3600
-            if voice_hours < min_voice_hours:
+            if not stats or int(stats.voice_seconds) // 3600 < min_voice_hours:
                 return False, f"Mindestens {min_voice_hours} Voice-Stunden."
         min_tickets = int(conditions.get("min_tickets") or 0)
         if min_tickets:
@@ -245,10 +242,9 @@ class GiveawayService:
         row = await self.db.get_giveaway(giveaway_id)
         if not row:
             return await interaction.response.send_message("Giveaway nicht gefunden.", ephemeral=True)
-        status = str(row[11])
-        if status != "open":
+        if str(row.status) != "open":
             return await interaction.response.send_message("Giveaway ist beendet.", ephemeral=True)
-        conditions = json.loads(row[9]) if row[9] else {}
+        conditions = json.loads(row.conditions_json) if row.conditions_json else {}
         ok, err = await self._eligible(interaction.user, conditions)
         if not ok:
             return await interaction.response.send_message(err or "Nicht berechtigt.", ephemeral=True)
@@ -267,14 +263,13 @@ class GiveawayService:
                 continue
             rows = await self.db.list_open_giveaways(guild.id)
             for row in rows:
-                giveaway_id, channel_id, message_id, end_at = row
                 try:
-                    end_dt = datetime.fromisoformat(str(end_at))
+                    end_dt = datetime.fromisoformat(str(row.end_at))
                 except Exception:
                     continue
                 if end_dt > now:
                     continue
-                await self._finish_giveaway(guild, int(giveaway_id), int(channel_id), int(message_id or 0))
+                await self._finish_giveaway(guild, int(row.id), int(row.channel_id), int(row.message_id or 0))
 
     async def _finish_giveaway(self, guild: discord.Guild, giveaway_id: int, channel_id: int, message_id: int):
         await self.db.close_giveaway(giveaway_id)
@@ -18,6 +18,11 @@ class InviteService:
     def _log_channel_id(self, guild_id: int) -> int:
         return int(self.settings.get_guild_int(guild_id, "invites.log_channel_id", 0))
 
+    def _apply_cached_invite(self, guild_id: int, user_id: int, left: bool):
+        user_stats_service = getattr(self.bot, "user_stats_service", None)
+        if user_stats_service is not None:
+            user_stats_service.stats_buffer.apply_invite(guild_id, user_id, left=left)
+
     async def _get_channel(self, guild: discord.Guild, channel_id: int) -> discord.TextChannel | None:
         if not channel_id:
             return None
@@ -147,6 +152,7 @@ class InviteService:
         if used_code and inviter_id:
             try:
                 await self.db.increment_invite(guild.id, inviter_id)
+                self._apply_cached_invite(guild.id, inviter_id, left=False)
             except Exception:
                 pass
             try:
@@ -183,5 +189,6 @@ class InviteService:
         if inviter_id:
             try:
                 await self.db.increment_invite_left(member.guild.id, inviter_id)
+                self._apply_cached_invite(member.guild.id, inviter_id, left=True)
             except Exception:
                 pass
@@ -20,7 +20,17 @@ class ForumLogService:
         self.settings = settings
         self.db = db
         self._ready = False
-        self._cache: dict[str, int] = {}
+        self._cache: dict[tuple[int, str], int] = {}
+        settings.subscribe(self._on_settings_changed)
+
+    def _on_settings_changed(self, change):
+        if not (change.affects("bot.log_forum_channel_id") or change.affects("logs")):
+            return
+        if change.guild_id is None:
+            self._cache.clear()
+            return
+        for cache_key in [k for k in self._cache if k[0] == int(change.guild_id)]:
+            self._cache.pop(cache_key, None)
 
     def enabled(self, guild_id: int | None = None) -> bool:
         if guild_id:
@@ -44,13 +54,13 @@ class ForumLogService:
         self._ready = True
 
     async def ensure_thread(self, forum: discord.ForumChannel, guild: discord.Guild, key: str, title: str) -> int | None:
-        cached = self._cache.get(key)
+        cached = self._cache.get((guild.id, key))
         if cached:
             return cached
 
         stored = await self.db.get_log_thread(guild.id, key)
         if stored:
-            self._cache[key] = int(stored)
+            self._cache[(guild.id, key)] = int(stored)
             return int(stored)
 
         name = title[:100]
@@ -60,7 +70,7 @@ class ForumLogService:
         created = await forum.create_thread(name=name, content=content)
         thread = created.thread
         await self.db.set_log_thread(guild.id, forum.id, key, thread.id)
-        self._cache[key] = int(thread.id)
+        self._cache[(guild.id, key)] = int(thread.id)
         return int(thread.id)
 
     async def emit(self, guild: discord.Guild, key: str, embed: discord.Embed, content: str | None = None):
@@ -118,7 +118,7 @@ class NewsService:
         if not isinstance(channel, (discord.TextChannel, discord.Thread, discord.abc.Messageable)):
             return False, "News-Channel ungültig."
 
-        last_map = self.settings.get_guild(guild.id, "news.last_posted_ids", {}) or {}
+        last_map = dict(self.bot.state.get(guild.id, "news.last_posted_ids", {}) or {})
         last_id = str(last_map.get(source_key, "") or "")
         if not force and last_id and last_id == item.id:
             return False, None
@@ -129,15 +129,10 @@ class NewsService:
 
         try:
             last_map[str(source_key)] = item.id
-            await self.settings.set_guild_override(self.db, guild.id, "news.last_posted_ids", last_map)
-            await self.settings.set_guild_override(self.db, guild.id, "news.last_posted_id", item.id)
+            self.bot.state.set(guild.id, "news.last_posted_ids", last_map)
+            self.bot.state.set(guild.id, "news.last_posted_id", item.id)
             if item.published_at:
-                await self.settings.set_guild_override(
-                    self.db,
-                    guild.id,
-                    "news.last_posted_at",
-                    item.published_at.isoformat(),
-                )
+                self.bot.state.set(guild.id, "news.last_posted_at", item.published_at.isoformat())
             if item.video_id:
                 await self._store_youtube_alert(guild, item, channel.id, msg.id)
         except Exception:
@@ -522,12 +517,11 @@ class NewsService:
         }
 
     async def _store_youtube_alert(self, guild: discord.Guild, item: NewsItem, channel_id: int, message_id: int):
-        alerts = self.settings.get_guild(guild.id, "news.youtube_alerts", {}) or {}
         if not item.video_id:
             return
         stats = item.stats or {}
         channel = item.channel or {}
-        alerts[str(item.video_id)] = {
+        alert = {
             "video_id": str(item.video_id),
             "message_id": int(message_id),
             "channel_id": int(channel_id),
@@ -544,7 +538,7 @@ class NewsService:
             "channel_subscribers": channel.get("subscribers"),
             "last_stats_at": None,
         }
-        await self.settings.set_guild_override(self.db, guild.id, "news.youtube_alerts", alerts)
+        self.bot.state.set(guild.id, f"news.youtube_alerts.{item.video_id}", alert)
 
     async def _maybe_update_youtube_stats(self, guild: discord.Guild):
         access_key = self._socialkit_access_key(guild.id)
@@ -557,10 +551,9 @@ class NewsService:
             return
         self._last_stats_check[guild.id] = now
 
-        alerts = self.settings.get_guild(guild.id, "news.youtube_alerts", {}) or {}
-        if not isinstance(alerts, dict) or not alerts:
+        alerts = self.bot.state.items(guild.id, "news.youtube_alerts")
+        if not alerts:
             return
-        updated = False
         for video_id, payload in list(alerts.items()):
             if not isinstance(payload, dict):
                 continue
@@ -584,7 +577,7 @@ class NewsService:
                     payload["channel_avatar"] = channel.get("avatar_url")
                     payload["channel_subscribers"] = channel.get("subscribers")
             payload["last_stats_at"] = now.isoformat()
-            alerts[str(video_id)] = payload
+            self.bot.state.set(guild.id, f"news.youtube_alerts.{video_id}", payload)
 
             channel = guild.get_channel(chan_id)
             if channel is None:
@@ -623,12 +616,6 @@ class NewsService:
             view = build_news_view(self.settings, guild, item, ping_text=ping_text)
             try:
                 await msg.edit(view=view)
-                updated = True
-            except Exception:
-                pass
-        if updated:
-            try:
-                await self.settings.set_guild_override(self.db, guild.id, "news.youtube_alerts", alerts)
             except Exception:
                 pass
 
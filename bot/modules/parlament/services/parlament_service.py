@@ -162,7 +162,7 @@ class ParliamentService:
             updated_at=datetime.now(timezone.utc),
         )
 
-        message_id = self._gi(guild.id, "parlament.panel_message_id", 0)
+        message_id = self.bot.state.get_int(guild.id, "parlament.panel_message_id", 0)
         msg = None
         if message_id:
             try:
@@ -178,7 +178,7 @@ class ParliamentService:
 
         try:
             msg = await channel.send(embed=emb)
-            await self.settings.set_guild_override(self.db, guild.id, "parlament.panel_message_id", int(msg.id))
+            self.bot.state.set(guild.id, "parlament.panel_message_id", int(msg.id))
         except Exception:
             pass
 
@@ -7,12 +7,34 @@ class PlaceholderService:
         self.settings = settings
         self.db = db
         self.logger = logger
+        self._items_cache: dict[int, list[tuple[str, str, int]]] = {}
+        settings.subscribe(self._on_settings_changed)
+
+    def _on_settings_changed(self, change):
+        if not change.affects("placeholders"):
+            return
+        if change.guild_id is None:
+            self._items_cache.clear()
+        else:
+            self._items_cache.pop(int(change.guild_id), None)
 
     def _enabled(self, guild_id: int) -> bool:
         return bool(self.settings.get_guild_bool(guild_id, "placeholders.enabled", True))
 
-    def _items(self, guild_id: int) -> list[dict]:
-        return self.settings.get_guild(guild_id, "placeholders.items", []) or []
+    def _items(self, guild_id: int) -> list[tuple[str, str, int]]:
+        gid = int(guild_id)
+        items = self._items_cache.get(gid)
+        if items is None:
+            items = []
+            for item in self.settings.get_guild(gid, "placeholders.items", []) or []:
+                target = str(item.get("target", "") or "").strip().lower()
+                template = str(item.get("template", "") or "")
+                if not template or not target:
+                    continue
+                key = "category_id" if target == "category_name" else "channel_id"
+                items.append((target, template, int(item.get(key, 0) or 0)))
+            self._items_cache[gid] = items
+        return items
 
     def _render(self, template: str, values: dict) -> str:
         out = str(template or "")
@@ -38,11 +60,7 @@ class PlaceholderService:
             "members_total": members_total,
         }
 
-        for item in items:
-            target = str(item.get("target", "") or "").strip().lower()
-            template = str(item.get("template", "") or "")
-            if not template or not target:
-                continue
+        for target, template, cid in items:
             rendered = self._render(template, values)
             if target in {"channel_name", "category_name"}:
                 rendered = rendered.strip()
@@ -50,7 +68,6 @@ class PlaceholderService:
                     continue
 
             if target == "channel_name":
-                cid = int(item.get("channel_id", 0) or 0)
                 ch = guild.get_channel(cid)
                 if not isinstance(ch, discord.abc.GuildChannel):
                     continue
@@ -61,7 +78,6 @@ class PlaceholderService:
                         pass
 
             elif target == "channel_topic":
-                cid = int(item.get("channel_id", 0) or 0)
                 ch = guild.get_channel(cid)
                 if not ch or not hasattr(ch, "topic"):
                     continue
@@ -72,7 +88,6 @@ class PlaceholderService:
                         pass
 
             elif target == "category_name":
-                cid = int(item.get("category_id", 0) or 0)
                 ch = guild.get_channel(cid)
                 if not isinstance(ch, discord.CategoryChannel):
                     continue
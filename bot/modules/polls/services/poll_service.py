@@ -99,8 +99,7 @@ class PollService:
         row = await self.db.get_poll(poll_id)
         if not row:
             return await interaction.response.send_message("Umfrage nicht gefunden.", ephemeral=True)
-        status = str(row[7])
-        if status != "open":
+        if str(row.status) != "open":
             return await interaction.response.send_message("Umfrage ist geschlossen.", ephemeral=True)
         await self.db.add_poll_vote(poll_id, interaction.user.id, int(option_index))
         try:
@@ -113,27 +112,23 @@ class PollService:
 
     async def restore_views(self):
         rows = await self.db.list_open_polls()
-        for row in rows:
-            try:
-                poll_id, guild_id, channel_id, message_id, options_json = row
-            except Exception:
-                continue
-            if not message_id:
+        for poll in rows:
+            if not poll.message_id:
                 continue
             try:
-                options = json.loads(options_json)
+                options = json.loads(poll.options_json)
             except Exception:
                 continue
             custom_id = None
             try:
-                guild = self.bot.get_guild(int(guild_id))
+                guild = self.bot.get_guild(int(poll.guild_id))
                 channel = None
                 if guild:
-                    channel = guild.get_channel(int(channel_id))
+                    channel = guild.get_channel(int(poll.channel_id))
                 if not channel:
-                    channel = await self.bot.fetch_channel(int(channel_id))
+                    channel = await self.bot.fetch_channel(int(poll.channel_id))
                 if channel:
-                    msg = await channel.fetch_message(int(message_id))
+                    msg = await channel.fetch_message(int(poll.message_id))
                     for row in getattr(msg, "components", []) or []:
                         for child in getattr(row, "children", []) or []:
                             cid = getattr(child, "custom_id", None)
@@ -145,8 +140,8 @@ class PollService:
             except Exception:
                 custom_id = None
             try:
-                view = PollView(self, int(poll_id), options, custom_id=custom_id)
-                self.bot.add_view(view, message_id=int(message_id))
+                view = PollView(self, int(poll.id), options, custom_id=custom_id)
+                self.bot.add_view(view, message_id=int(poll.message_id))
             except Exception:
                 pass
 
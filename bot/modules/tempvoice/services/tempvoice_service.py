@@ -1,6 +1,7 @@
 import discord
 from datetime import datetime, timezone
 from bot.core.perms import is_staff
+from bot.core.rows import TempVoiceRoomRow
 from bot.modules.tempvoice.views.tempvoice_panel import TempVoicePanelView
 from bot.modules.tempvoice.formatting.tempvoice_embeds import (
     build_tempvoice_panel_embed,
@@ -9,22 +10,6 @@ from bot.modules.tempvoice.formatting.tempvoice_embeds import (
 from bot.utils.emojis import em
 
 
-def _normalize_room(row):
-    if not row:
-        return None
-    try:
-        return {
-            "guild_id": int(row[0]),
-            "channel_id": int(row[1]),
-            "owner_id": int(row[2]),
-            "panel_channel_id": int(row[3]) if row[3] else None,
-            "panel_message_id": int(row[4]) if row[4] else None,
-            "created_at": row[5],
-        }
-    except Exception:
-        return None
-
-
 class TempVoiceService:
     def __init__(self, bot: discord.Client, settings, db, logger):
         self.bot = bot
@@ -88,7 +73,7 @@ class TempVoiceService:
     async def _cleanup_if_empty(self, guild: discord.Guild, channel: discord.VoiceChannel):
         if not self._auto_delete(guild.id):
             return
-        room = _normalize_room(await self.db.get_tempvoice_room_by_channel(guild.id, channel.id))
+        room = await self.db.get_tempvoice_room_by_channel(guild.id, channel.id)
         if not room:
             return
         if len(channel.members) > 0:
@@ -106,11 +91,11 @@ class TempVoiceService:
         except Exception:
             pass
 
-    async def _delete_panel_message(self, guild: discord.Guild, room: dict):
+    async def _delete_panel_message(self, guild: discord.Guild, room: TempVoiceRoomRow):
         if not room:
             return
-        channel_id = room.get("panel_channel_id")
-        message_id = room.get("panel_message_id")
+        channel_id = room.panel_channel_id
+        message_id = room.panel_message_id
         if not channel_id or not message_id:
             return
         ch = guild.get_channel(int(channel_id))
@@ -129,9 +114,9 @@ class TempVoiceService:
 
     async def _join_to_create(self, member: discord.Member, join_channel: discord.VoiceChannel):
         guild = member.guild
-        existing = _normalize_room(await self.db.get_tempvoice_room_by_owner(guild.id, member.id))
+        existing = await self.db.get_tempvoice_room_by_owner(guild.id, member.id)
         if existing:
-            ch = guild.get_channel(int(existing["channel_id"]))
+            ch = guild.get_channel(int(existing.channel_id))
             if isinstance(ch, discord.VoiceChannel):
                 try:
                     await member.move_to(ch)
@@ -140,7 +125,7 @@ class TempVoiceService:
                 await self.refresh_panel(guild, ch.id)
                 return
             try:
-                await self.db.delete_tempvoice_room(int(guild.id), int(existing["channel_id"]))
+                await self.db.delete_tempvoice_room(int(guild.id), int(existing.channel_id))
             except Exception:
                 pass
 
@@ -218,20 +203,20 @@ class TempVoiceService:
             return None
 
     async def refresh_panel(self, guild: discord.Guild, channel_id: int):
-        room = _normalize_room(await self.db.get_tempvoice_room_by_channel(guild.id, channel_id))
+        room = await self.db.get_tempvoice_room_by_channel(guild.id, channel_id)
         if not room:
             return
         ch = guild.get_channel(int(channel_id))
         if not isinstance(ch, discord.VoiceChannel):
             return
-        owner = guild.get_member(int(room["owner_id"]))
+        owner = guild.get_member(int(room.owner_id))
         if not owner:
             try:
-                owner = await guild.fetch_member(int(room["owner_id"]))
+                owner = await guild.fetch_member(int(room.owner_id))
             except Exception:
                 return
-        panel_id = room.get("panel_channel_id")
-        panel_msg_id = room.get("panel_message_id")
+        panel_id = room.panel_channel_id
+        panel_msg_id = room.panel_message_id
         panel_ch = None
         if panel_id and int(panel_id) == int(ch.id):
             panel_ch = guild.get_channel(int(panel_id))
@@ -270,16 +255,16 @@ class TempVoiceService:
         ch = interaction.guild.get_channel(int(channel_id))
         if not isinstance(ch, discord.VoiceChannel):
             return None, None, "Voice-Channel nicht gefunden."
-        room = _normalize_room(await self.db.get_tempvoice_room_by_channel(interaction.guild.id, ch.id))
+        room = await self.db.get_tempvoice_room_by_channel(interaction.guild.id, ch.id)
         if not room:
             return None, None, "Kein Temp-Voice gefunden."
         return ch, room, None
 
-    async def _ensure_owner(self, interaction: discord.Interaction, room: dict) -> bool:
+    async def _ensure_owner(self, interaction: discord.Interaction, room: TempVoiceRoomRow) -> bool:
         if not interaction.guild or not isinstance(interaction.user, discord.Member):
             await interaction.response.send_message("Nur im Server nutzbar.", ephemeral=True)
             return False
-        if interaction.user.id != int(room["owner_id"]) and not is_staff(self.settings, interaction.user):
+        if interaction.user.id != int(room.owner_id) and not is_staff(self.settings, interaction.user):
             await interaction.response.send_message("Nur der Owner darf das nutzen.", ephemeral=True)
             return False
         return True
@@ -517,10 +502,10 @@ class TempVoiceService:
             return await interaction.response.send_message(err, ephemeral=True)
         if not await self._ensure_owner(interaction, room):
             return
-        owner = interaction.guild.get_member(int(room["owner_id"]))
+        owner = interaction.guild.get_member(int(room.owner_id))
         if not owner:
             try:
-                owner = await interaction.guild.fetch_member(int(room["owner_id"]))
+                owner = await interaction.guild.fetch_member(int(room.owner_id))
             except Exception:
                 return await interaction.response.send_message("Owner nicht gefunden.", ephemeral=True)
         msg = await self._send_panel_message(interaction.guild, owner, ch)
@@ -112,12 +112,14 @@ class TextSnippetsCommands(commands.Cog):
         body = str(found[1].get("body", "")).strip()
         emb = build_snippet_embed(self.bot.settings, interaction.guild, found[0], title, body)
 
+        sent = None
         try:
-            await thread.send(embed=emb)
+            sent = await thread.send(embed=emb)
         except Exception:
             pass
+        await self.service.archive_snippet(int(ticket.id), interaction.user, title, body, sent)
 
-        recipients = await self.service.get_participant_ids(int(ticket["ticket_id"]), int(ticket.get("user_id") or 0))
+        recipients = await self.service.get_participant_ids(int(ticket.id), int(ticket.user_id or 0))
         for uid in recipients:
             try:
                 user = await self.bot.fetch_user(int(uid))
@@ -74,6 +74,11 @@ class TicketCommands(commands.Cog):
     async def transcript(self, interaction: discord.Interaction, channel: discord.TextChannel | None = None):
         await self.service.send_transcript(interaction, channel)
 
+    @ticket.command(name="suche", description="🔎 𑁉 Ticket-Verlauf durchsuchen")
+    @app_commands.describe(begriff="Suchbegriff (Wörter, Namen, IDs)")
+    async def search(self, interaction: discord.Interaction, begriff: str):
+        await self.service.search_tickets(interaction, begriff)
+
     @ticket.command(name="weiterleitung", description="🎯 𑁉 Ticket weiterleiten")
     @app_commands.describe(role="Zielrolle", reason="Optionaler Grund")
     async def forward(self, interaction: discord.Interaction, role: discord.Role, reason: str | None = None):
@@ -94,6 +99,10 @@ class TicketCommands(commands.Cog):
         await interaction.response.send_message("Panel gesendet.", ephemeral=True)
 
     async def _fetch_count(self, query: str) -> int:
+        fetchone = getattr(self.bot.db, "fetchone", None)
+        if fetchone is not None:
+            row = await fetchone(query)
+            return int(row[0]) if row and row[0] is not None else 0
         conn = (
             getattr(self.bot.db, "conn", None)
             or getattr(self.bot.db, "_conn", None)
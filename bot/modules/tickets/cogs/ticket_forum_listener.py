@@ -21,3 +21,7 @@ class TicketForumListener(commands.Cog):
         if not parent or getattr(parent, "id", 0) != forum_id:
             return
         await self.service.handle_staff_message(message)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        self.service.reload_deadlines()
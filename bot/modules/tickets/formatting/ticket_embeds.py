@@ -313,6 +313,37 @@ def build_ticket_log_embed(
     return emb
 
 
+def build_ticket_search_embed(
+    settings,
+    guild: discord.Guild | None,
+    query: str,
+    hits: list,
+    page: int = 1,
+):
+    info = em(settings, "info", guild) or "🔎"
+    arrow2 = em(settings, "arrow2", guild) or "»"
+    lines = []
+    for hit in hits:
+        try:
+            when = format_dt(datetime.fromisoformat(str(hit.created_at)), style="R")
+        except Exception:
+            when = "—"
+        who = "Team" if hit.direction == "staff" else "User"
+        lines.append(
+            f"┏`🎫` - Ticket `{int(hit.ticket_id)}` in <#{int(hit.thread_id)}> ({hit.ticket_status})\n"
+            f"┣`👤` - {who}: {discord.utils.escape_markdown(hit.author_name or str(hit.author_id))} · {when}\n"
+            f"┗`💬` - {hit.snippet}"
+        )
+    body = "\n\n".join(lines) if lines else "Keine Treffer gefunden."
+    emb = discord.Embed(
+        title=f"{info} 𑁉 Ticket-Suche",
+        description=f"{arrow2} Suche nach `{discord.utils.escape_markdown(query)}` · Seite {int(page)}\n\n{body}"[:4096],
+        color=_color(settings, guild),
+    )
+    _footer(emb, settings, guild)
+    return emb
+
+
 def build_support_panel_embed(
     settings,
     guild: discord.Guild | None,
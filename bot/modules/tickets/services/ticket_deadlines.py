@@ -0,0 +1,64 @@
+import heapq
+import asyncio
+
+
+class TicketDeadlines:
+    def __init__(self):
+        self._heap: list[tuple[float, int]] = []
+        self._due: dict[int, float] = {}
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def clear(self):
+        self._heap = []
+        self._due = {}
+        self._wakeup.set()
+
+    def schedule(self, ticket_id: int, due_ts: float | None):
+        tid = int(ticket_id)
+        if due_ts is None:
+            self.discard(tid)
+            return
+        due_ts = float(due_ts)
+        if self._due.get(tid) == due_ts:
+            return
+        earliest = self.next_due()
+        self._due[tid] = due_ts
+        heapq.heappush(self._heap, (due_ts, tid))
+        if earliest is None or due_ts < earliest:
+            self._wakeup.set()
+
+    def discard(self, ticket_id: int):
+        self._due.pop(int(ticket_id), None)
+
+    def next_due(self) -> float | None:
+        heap = self._heap
+        while heap:
+            due_ts, tid = heap[0]
+            if self._due.get(tid) == due_ts:
+                return due_ts
+            heapq.heappop(heap)
+        return None
+
+    def pop_due(self, now_ts: float) -> list[int]:
+        out = []
+        while True:
+            due_ts = self.next_due()
+            if due_ts is None or due_ts > now_ts:
+                return out
+            _, tid = heapq.heappop(self._heap)
+            self._due.pop(tid, None)
+            out.append(tid)
+
+    async def wait(self, max_seconds: float, now_ts: float):
+        due_ts = self.next_due()
+        timeout = max_seconds if due_ts is None else min(max_seconds, max(0.0, due_ts - now_ts))
+        if timeout <= 0:
+            return
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
@@ -1,16 +1,21 @@
 import re
-import io
 import json
 import html as html_lib
-import urllib.request
 import asyncio
 import discord
-import uuid
+import secrets
+import tempfile
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
 
 from bot.core.perms import is_staff
+from bot.core.db import SNIPPET_OPEN, SNIPPET_CLOSE
+from bot.core.rows import TicketRow, TicketSearchHit
+from bot.modules.tickets.services.ticket_deadlines import TicketDeadlines
+from bot.modules.tickets.services.transcript_uploader import TranscriptUploader
 from bot.modules.tickets.views.summary_view import SummaryView
 from bot.modules.tickets.views.rating_view import RatingView
+from bot.modules.tickets.views.search_view import TicketSearchView
 from bot.modules.tickets.formatting.ticket_embeds import (
     build_summary_embed,
     build_user_message_embed,
@@ -25,10 +30,19 @@ from bot.modules.tickets.formatting.ticket_embeds import (
     build_dm_ticket_update_embed,
     build_ticket_log_embed,
     build_dm_ticket_forwarded_embed,
+    build_ticket_search_embed,
 )
 from bot.utils.emojis import em
 
 _USER_ID_RE = re.compile(r"User-ID:\s*(\d{15,20})")
+_DEADLINE_MAX_SLEEP_SECONDS = 3600.0
+_DEADLINE_RETRY_SECONDS = 60.0
+_DEADLINE_MISSING_GUILD_SECONDS = 6 * 3600.0
+_TRANSCRIPT_SPOOL_BYTES = 1024 * 1024
+_TRANSCRIPT_WRITE_BATCH_BYTES = 64 * 1024
+_SEARCH_PAGE_SIZE = 5
+_SEARCH_SNAPSHOT_LIMIT = 500
+_SEARCH_SNAPSHOTS_KEPT = 64
 
 
 def _truncate(s: str, limit: int) -> str:
@@ -77,6 +91,21 @@ def _split_attachments(attachments, limit: int = 8) -> tuple[list[str], list[str
             others.append(url)
     return images, others
 
+def _attachment_meta(attachments) -> list[dict]:
+    meta = []
+    for att in list(attachments or []):
+        try:
+            meta.append({
+                "filename": str(att.filename or "file"),
+                "url": str(att.url),
+                "size": getattr(att, "size", None),
+                "content_type": getattr(att, "content_type", None),
+                "is_image": _is_image_attachment(att),
+            })
+        except Exception:
+            continue
+    return meta
+
 def _clean_reply_snippet(text: str, limit: int = 140) -> str:
     if not text:
         return ""
@@ -93,6 +122,21 @@ def _parse_iso(ts: str | None) -> datetime | None:
         return None
 
 
+def _decode_search_cursor(raw: str | None) -> tuple[str, int] | None:
+    if not raw:
+        return None
+    try:
+        token, offset = str(raw).rsplit(":", 1)
+        return token, max(0, int(offset))
+    except Exception:
+        return None
+
+
+def _discord_snippet(snippet: str) -> str:
+    text = discord.utils.escape_markdown(str(snippet or "").replace("\n", " "))
+    return _truncate(text.replace(SNIPPET_OPEN, "**").replace(SNIPPET_CLOSE, "**"), 300)
+
+
 def parse_int_color(settings, guild_id: int | None = None) -> int:
     if guild_id:
         v = str(settings.get_guild(int(guild_id), "design.accent_color", "#B16B91") or "").replace("#", "").strip()
@@ -131,111 +175,6 @@ async def _ephemeral(interaction: discord.Interaction, text: str):
         await interaction.followup.send(text, ephemeral=True)
 
 
-def _normalize_ticket_row(guild_id: int, row):
-    if not row:
-        return None
-
-    try:
-        if len(row) >= 18:
-            return {
-                "ticket_id": int(row[0]),
-                "guild_id": int(guild_id),
-                "user_id": int(row[1]) if row[1] is not None else 0,
-                "forum_id": 0,
-                "thread_id": int(row[2]),
-                "summary_id": int(row[3]),
-                "status": str(row[4]),
-                "claimed_by": int(row[5]) if row[5] is not None else None,
-                "category_key": str(row[6]) if row[6] is not None else None,
-                "priority": int(row[7]) if row[7] is not None else None,
-                "status_label": str(row[8]) if row[8] is not None else None,
-                "escalated_level": int(row[9]) if row[9] is not None else None,
-                "escalated_by": int(row[10]) if row[10] is not None else None,
-                "created_at": row[11],
-                "closed_at": row[12],
-                "last_activity_at": row[13],
-                "last_user_message_at": row[14],
-                "last_staff_message_at": row[15],
-                "first_staff_reply_at": row[16],
-                "sla_breached_at": row[17],
-            }
-    except Exception:
-        pass
-
-    try:
-        if len(row) >= 9 and int(row[1]) == int(guild_id):
-            return {
-                "ticket_id": int(row[0]),
-                "guild_id": int(row[1]),
-                "user_id": int(row[2]),
-                "forum_id": int(row[3]),
-                "thread_id": int(row[4]),
-                "summary_id": int(row[5]),
-                "status": str(row[6]),
-                "claimed_by": int(row[7]) if row[7] is not None else None,      
-                "category_key": str(row[8]) if row[8] is not None else None,
-            }
-    except Exception:
-        pass
-
-    try:
-        if len(row) >= 7:
-            return {
-                "ticket_id": int(row[0]),
-                "guild_id": int(guild_id),
-                "user_id": int(row[1]),
-                "forum_id": 0,
-                "thread_id": int(row[2]),
-                "summary_id": int(row[3]),
-                "status": str(row[4]),
-                "claimed_by": int(row[5]) if row[5] is not None else None,
-                "category_key": str(row[6]) if row[6] is not None else None,
-            }
-    except Exception:
-        pass
-
-    try:
-        if len(row) >= 6:
-            return {
-                "ticket_id": int(row[0]),
-                "guild_id": int(guild_id),
-                "user_id": int(row[1]) if row[1] is not None else 0,
-                "forum_id": 0,
-                "thread_id": int(row[2]),
-                "summary_id": int(row[3]),
-                "status": str(row[4]),
-                "claimed_by": int(row[5]) if row[5] is not None else None,
-                "category_key": None,
-            }
-    except Exception:
-        pass
-
-    return None
-
-
-def _normalize_open_ticket_row(row):
-    if not row:
-        return None
-    try:
-        if len(row) >= 6:
-            return {
-                "ticket_id": int(row[0]),
-                "thread_id": int(row[1]),
-                "summary_id": int(row[2]),
-                "status": str(row[3]),
-                "claimed_by": int(row[4]) if row[4] is not None else None,
-                "category_key": str(row[5]) if row[5] is not None else None,
-            }
-    except Exception:
-        pass
-    try:
-        if len(row) >= 2:
-            return {"ticket_id": int(row[0]), "thread_id": int(row[1])}
-    except Exception:
-        pass
-    return None
-
-
 async def _resolve_user_id_from_thread(thread: discord.Thread, summary_message_id: int | None):
     if summary_message_id:
         try:
@@ -274,6 +213,19 @@ class TicketService:
         self.settings = settings
         self.db = db
         self.logger = logger
+        self._deadlines = TicketDeadlines()
+        self._deadlines_loaded = False
+        self._search_snapshots = OrderedDict()
+        self._uploader = getattr(bot, "transcript_uploader", None) or TranscriptUploader(settings)
+        settings.subscribe(self._on_settings_changed)
+
+    def _on_settings_changed(self, change):
+        if change.affects("ticket.auto_close_hours") or change.affects("ticket.sla_first_response_minutes"):
+            self.reload_deadlines()
+
+    def reload_deadlines(self):
+        self._deadlines_loaded = False
+        self._deadlines.clear()
 
     def _g(self, guild_id: int, key: str, default=None):
         return self.settings.get_guild(int(guild_id), key, default)
@@ -375,12 +327,12 @@ class TicketService:
         except Exception:
             pass
 
-    async def _notify_user_update(self, guild: discord.Guild | None, t: dict, title: str, text: str):
+    async def _notify_user_update(self, guild: discord.Guild | None, t: TicketRow, title: str, text: str):
         try:
             gid = guild.id if guild else 0
             if not self._gb(gid, "ticket.notify_user_on_updates", True):
                 return False, "disabled"
-            uid = int(t["user_id"]) if t and t.get("user_id") else 0
+            uid = int(t.user_id) if t and t.user_id else 0
             if not uid:
                 return False, "user_id_missing"
             try:
@@ -399,14 +351,14 @@ class TicketService:
     async def _notify_user_forwarded(
         self,
         guild: discord.Guild | None,
-        t: dict,
+        t: TicketRow,
         role_name: str,
         reason: str | None,
     ):
         gid = guild.id if guild else 0
         if not self._gb(gid, "ticket.notify_user_on_updates", True):
             return False, "disabled"
-        uid = int(t["user_id"]) if t and t.get("user_id") else 0
+        uid = int(t.user_id) if t and t.user_id else 0
         if not uid:
             return False, "user_id_missing"
         try:
@@ -443,12 +395,11 @@ class TicketService:
         if not parent or getattr(parent, "id", 0) != forum_id:
             return None, None, "Nur im Ticket-Thread."
 
-        row = await self.db.get_ticket_by_thread(interaction.guild.id, thread.id)
-        t = _normalize_ticket_row(interaction.guild.id, row)
+        t = await self.db.get_ticket_by_thread(interaction.guild.id, thread.id)
         if not t:
             return None, None, "Ticket nicht gefunden."
 
-        if not allow_closed and str(t["status"]) == "closed":
+        if not allow_closed and str(t.status) == "closed":
             return None, None, "Ticket ist bereits geschlossen."
 
         return thread, t, None
@@ -467,8 +418,7 @@ class TicketService:
         return await self._get_participant_ids(ticket_id, fallback_user_id)
 
     async def get_ticket_from_thread(self, guild_id: int, thread_id: int):
-        row = await self.db.get_ticket_by_thread(int(guild_id), int(thread_id))
-        return _normalize_ticket_row(int(guild_id), row)
+        return await self.db.get_ticket_by_thread(int(guild_id), int(thread_id))
 
     async def _update_summary_controls(self, thread: discord.Thread, summary_message_id: int, ticket_id: int,
                                        claimed: bool, status: str | None = None):
@@ -480,11 +430,11 @@ class TicketService:
         except Exception:
             pass
 
-    async def _notify_user_claim_state(self, guild: discord.Guild, thread: discord.Thread, t: dict,
+    async def _notify_user_claim_state(self, guild: discord.Guild, thread: discord.Thread, t: TicketRow,
                                        staff: discord.Member, claimed: bool):
-        uid = int(t["user_id"]) if t.get("user_id") else 0
+        uid = int(t.user_id) if t.user_id else 0
         if not uid:
-            uid = await _resolve_user_id_from_thread(thread, t.get("summary_id"))
+            uid = await _resolve_user_id_from_thread(thread, t.summary_message_id)
         if not uid:
             return False, "user_id_missing"
 
@@ -569,37 +519,36 @@ class TicketService:
         guild_id = guild.id
 
         allow_multi = self._gb(guild_id, "ticket.allow_multiple_open_tickets_per_user", False)
-        existing_row = await self.db.get_open_ticket_by_user(guild_id, message.author.id)
-        existing = _normalize_open_ticket_row(existing_row)
+        existing = await self.db.get_open_ticket_by_user(guild_id, message.author.id)
         if not existing:
-            participant_row = await self.db.get_open_ticket_by_participant(guild_id, message.author.id)
-            existing = _normalize_open_ticket_row(participant_row)
+            existing = await self.db.get_open_ticket_by_participant(guild_id, message.author.id)
 
         if existing and not allow_multi:
-            thread = guild.get_thread(int(existing["thread_id"]))
+            thread = guild.get_thread(int(existing.thread_id))
             if not thread:
                 try:
-                    fetched = await self.bot.fetch_channel(int(existing["thread_id"]))
+                    fetched = await self.bot.fetch_channel(int(existing.thread_id))
                     thread = fetched if isinstance(fetched, discord.Thread) else None
                 except Exception:
                     thread = None
 
             if thread:
-                await self._post_user_message(guild, thread, message.author, message.content, message.attachments, source_message=message)
+                await self._post_user_message(guild, thread, message.author, message.content, message.attachments, source_message=message, ticket_id=int(existing.id))
                 try:
                     now_iso = datetime.now(timezone.utc).isoformat()
-                    await self.db.set_last_user_message(int(existing["ticket_id"]), now_iso)
+                    await self.db.set_last_user_message(int(existing.id), now_iso)
+                    self._note_ticket_activity(existing, last_activity_at=now_iso, last_user_message_at=now_iso)
                 except Exception:
                     pass
                 try:
-                    await message.author.send(embed=build_dm_message_appended_embed(self.settings, guild, int(existing["ticket_id"])))
+                    await message.author.send(embed=build_dm_message_appended_embed(self.settings, guild, int(existing.id)))
                 except Exception:
                     pass
 
                 await self.logger.emit(
                     self.bot,
                     "ticket_user_message_appended",
-                    {"ticket_id": int(existing["ticket_id"]), "user_id": message.author.id},
+                    {"ticket_id": int(existing.id), "user_id": message.author.id},
                 )
                 return
 
@@ -700,12 +649,13 @@ class TicketService:
         except Exception:
             pass
 
-        await self._post_user_message(guild, thread, user, dm_message.content, dm_message.attachments, source_message=dm_message)
+        await self._post_user_message(guild, thread, user, dm_message.content, dm_message.attachments, source_message=dm_message, ticket_id=int(ticket_id))
         try:
             now_iso = datetime.now(timezone.utc).isoformat()
             await self.db.set_last_user_message(int(ticket_id), now_iso)
         except Exception:
             pass
+        await self._reschedule_ticket(int(ticket_id))
 
         try:
             await user.send(embed=build_dm_ticket_created_embed(self.settings, guild, int(ticket_id), created_at))
@@ -718,7 +668,9 @@ class TicketService:
             {"ticket_id": int(ticket_id), "user_id": user.id, "thread_id": thread.id, "category": category_key},
         )
 
-    async def _post_user_message(self, guild: discord.Guild, thread: discord.Thread, user: discord.User, content: str, attachments, source_message: discord.Message | None = None):
+    async def _post_user_message(self, guild: discord.Guild, thread: discord.Thread, user: discord.User, content: str, attachments, source_message: discord.Message | None = None, ticket_id: int | None = None):
+        if ticket_id:
+            await self._archive_message(int(ticket_id), user, content, attachments, "user", source_message)
         text = (content or "").strip()
         reply_line = await self._build_reply_line(source_message)
 
@@ -740,6 +692,50 @@ class TicketService:
             except Exception:
                 pass
 
+    async def _archive_message(self, ticket_id: int, author, content: str | None, attachments, direction: str,
+                               message: discord.Message | None = None):
+        try:
+            avatar = None
+            try:
+                avatar = str(author.display_avatar.url)
+            except Exception:
+                avatar = None
+            color = None
+            if isinstance(author, discord.Member) and author.color and author.color.value:
+                color = int(author.color.value)
+            created_at = message.created_at if message else datetime.now(timezone.utc)
+            meta = _attachment_meta(attachments)
+            await self.db.add_ticket_message(
+                ticket_id=int(ticket_id),
+                message_id=int(message.id) if message else None,
+                author_id=int(author.id),
+                author_name=getattr(author, "display_name", None) or str(author),
+                author_tag=str(author),
+                author_avatar=avatar,
+                author_color=color,
+                direction=direction,
+                content=content or "",
+                attachments_json=json.dumps(meta, ensure_ascii=False) if meta else None,
+                created_at=created_at.isoformat(),
+            )
+        except Exception as e:
+            try:
+                await self.logger.emit_system(
+                    "ticket_archive_failed",
+                    {
+                        "ticket_id": int(ticket_id),
+                        "message_id": int(message.id) if message else None,
+                        "error": f"{type(e).__name__}: {e}",
+                    },
+                )
+            except Exception:
+                pass
+
+    async def archive_snippet(self, ticket_id: int, author: discord.Member, title: str, body: str,
+                              message: discord.Message | None = None):
+        content = f"{title}\n\n{body}" if body else title
+        await self._archive_message(int(ticket_id), author, content, [], "staff", message)
+
     async def handle_staff_message(self, message: discord.Message):
         if message.author.bot:
             return
@@ -758,14 +754,15 @@ class TicketService:
         if not parent or getattr(parent, "id", 0) != forum_id:
             return
 
-        row = await self.db.get_ticket_by_thread(message.guild.id, message.channel.id)
-        t = _normalize_ticket_row(message.guild.id, row)
+        t = await self.db.get_ticket_by_thread(message.guild.id, message.channel.id)
         if not t:
             return
 
-        if str(t["status"]) == "closed":
+        if str(t.status) == "closed":
             return
 
+        await self._archive_message(int(t.id), message.author, message.content, message.attachments, "staff", message)
+
         text = (message.content or "").strip()
         reply_line = await self._build_reply_line(message)
 
@@ -778,21 +775,21 @@ class TicketService:
                     text = (text + "\n\n" + links).strip()
 
         text = _truncate(text, 3500) if text else " "
-        uid = int(t["user_id"]) if t.get("user_id") else 0
+        uid = int(t.user_id) if t.user_id else 0
         if not uid:
-            uid = await _resolve_user_id_from_thread(message.channel, t.get("summary_id"))
+            uid = await _resolve_user_id_from_thread(message.channel, t.summary_message_id)
 
         if not uid:
-            await self.logger.emit(self.bot, "ticket_staff_reply_failed_no_user", {"ticket_id": int(t["ticket_id"]), "thread_id": int(t["thread_id"])})
+            await self.logger.emit(self.bot, "ticket_staff_reply_failed_no_user", {"ticket_id": int(t.id), "thread_id": int(t.thread_id)})
             return
 
-        participant_ids = await self._get_participant_ids(int(t["ticket_id"]), uid)
+        participant_ids = await self._get_participant_ids(int(t.id), uid)
         if int(uid) not in participant_ids:
             participant_ids.append(int(uid))
 
         dm_ok = False
         dm_error = None
-        emb = build_dm_staff_reply_embed(self.settings, message.guild, message.author, int(t["ticket_id"]), text, reply_line=reply_line)
+        emb = build_dm_staff_reply_embed(self.settings, message.guild, message.author, int(t.id), text, reply_line=reply_line)
         for pid in participant_ids:
             try:
                 user = await self.bot.fetch_user(int(pid))
@@ -808,14 +805,20 @@ class TicketService:
 
         try:
             now_iso = datetime.now(timezone.utc).isoformat()
-            await self.db.set_last_staff_message(int(t["ticket_id"]), now_iso)
+            await self.db.set_last_staff_message(int(t.id), now_iso)
+            self._note_ticket_activity(
+                t,
+                last_activity_at=now_iso,
+                last_staff_message_at=now_iso,
+                first_staff_reply_at=t.first_staff_reply_at or now_iso,
+            )
         except Exception:
             pass
 
         await self.logger.emit(
             self.bot,
             "ticket_staff_reply",
-            {"ticket_id": int(t["ticket_id"]), "staff_id": message.author.id, "user_id": int(uid), "dm_ok": dm_ok, "dm_error": dm_error, "recipients": participant_ids[:25]},
+            {"ticket_id": int(t.id), "staff_id": message.author.id, "user_id": int(uid), "dm_ok": dm_ok, "dm_error": dm_error, "recipients": participant_ids[:25]},
         )
 
         try:
@@ -842,16 +845,15 @@ class TicketService:
         if not parent or getattr(parent, "id", 0) != forum_id:
             return await _ephemeral(interaction, "Nur im Ticket-Thread.")
 
-        row = await self.db.get_ticket_by_thread(interaction.guild.id, thread.id)
-        t = _normalize_ticket_row(interaction.guild.id, row)
+        t = await self.db.get_ticket_by_thread(interaction.guild.id, thread.id)
         if not t:
             return await _ephemeral(interaction, "Ticket nicht gefunden.")
 
-        if str(t["status"]) == "closed":
+        if str(t.status) == "closed":
             return await _ephemeral(interaction, "Ticket ist bereits geschlossen.")
 
-        ticket_id = int(t["ticket_id"])
-        claimed_by = t.get("claimed_by")
+        ticket_id = int(t.id)
+        claimed_by = t.claimed_by
 
         if claimed_by and int(claimed_by) != interaction.user.id:
             return await _ephemeral(interaction, f"Schon geclaimed von <@{claimed_by}>.")
@@ -874,7 +876,7 @@ class TicketService:
 
             dm_ok, dm_error = await self._notify_user_claim_state(interaction.guild, thread, t, interaction.user,
                                                                   claimed=False)
-            await self._update_summary_controls(thread, int(t.get("summary_id") or 0), ticket_id, claimed=False, status="open")
+            await self._update_summary_controls(thread, int(t.summary_message_id or 0), ticket_id, claimed=False, status="open")
 
             await _ephemeral(interaction, "Ticket freigegeben.")
             await self.logger.emit(self.bot, "ticket_released", {
@@ -909,7 +911,7 @@ class TicketService:
 
         dm_ok, dm_error = await self._notify_user_claim_state(interaction.guild, thread, t, interaction.user,
                                                               claimed=True)
-        await self._update_summary_controls(thread, int(t.get("summary_id") or 0), ticket_id, claimed=True, status="claimed")
+        await self._update_summary_controls(thread, int(t.summary_message_id or 0), ticket_id, claimed=True, status="claimed")
 
         await _ephemeral(interaction, "Ticket geclaimed.")
         await self.logger.emit(self.bot, "ticket_claimed", {
@@ -935,8 +937,7 @@ class TicketService:
         if not parent or getattr(parent, "id", 0) != forum_id:
             return await _ephemeral(interaction, "Nur im Ticket-Thread.")
 
-        row = await self.db.get_ticket_by_thread(interaction.guild.id, thread.id)
-        t = _normalize_ticket_row(interaction.guild.id, row)
+        t = await self.db.get_ticket_by_thread(interaction.guild.id, thread.id)
         if not t:
             return await _ephemeral(interaction, "Ticket nicht gefunden.")
 
@@ -948,10 +949,10 @@ class TicketService:
         except Exception:
             pass
 
-        await self._touch_ticket(int(t["ticket_id"]))
+        await self._touch_ticket(int(t.id))
 
         await _ephemeral(interaction, "Notiz gespeichert.")
-        await self.logger.emit(self.bot, "ticket_note", {"ticket_id": int(t["ticket_id"]), "staff_id": interaction.user.id})
+        await self.logger.emit(self.bot, "ticket_note", {"ticket_id": int(t.id), "staff_id": interaction.user.id})
 
     async def add_participant(self, interaction: discord.Interaction, user: discord.User):
         if not interaction.guild or not isinstance(interaction.user, discord.Member):
@@ -973,10 +974,10 @@ class TicketService:
         if not t:
             return await _ephemeral(interaction, "Ticket nicht gefunden.")
 
-        if str(t["status"]) == "closed":
+        if str(t.status) == "closed":
             return await _ephemeral(interaction, "Ticket ist bereits geschlossen.")
 
-        await self.db.add_ticket_participant(int(t["ticket_id"]), int(user.id), added_by=int(interaction.user.id))
+        await self.db.add_ticket_participant(int(t.id), int(user.id), added_by=int(interaction.user.id))
 
         try:
             await thread.add_user(user)
@@ -1003,29 +1004,29 @@ class TicketService:
             pass
 
         try:
-            dm_emb = build_dm_ticket_added_embed(self.settings, interaction.guild, int(t["ticket_id"]), interaction.user)
+            dm_emb = build_dm_ticket_added_embed(self.settings, interaction.guild, int(t.id), interaction.user)
             await user.send(embed=dm_emb)
         except Exception:
             pass
 
-        await self._touch_ticket(int(t["ticket_id"]))
+        await self._touch_ticket(int(t.id))
 
         await _ephemeral(interaction, f"{user.mention} hinzugefügt.")
         await self.logger.emit(
             self.bot,
             "ticket_participant_added",
-            {"ticket_id": int(t["ticket_id"]), "staff_id": interaction.user.id, "user_id": int(user.id)},
+            {"ticket_id": int(t.id), "staff_id": interaction.user.id, "user_id": int(user.id)},
         )
 
     async def dashboard_add_participant(self, guild: discord.Guild, thread: discord.Thread, actor: discord.Member, user: discord.User):
         t = await self.get_ticket_from_thread(guild.id, thread.id)
         if not t:
             return False, "ticket_not_found"
-        if str(t["status"]) == "closed":
+        if str(t.status) == "closed":
             return False, "ticket_closed"
 
-        await self.db.add_ticket_participant(int(t["ticket_id"]), int(user.id), added_by=int(actor.id))
-        await self._touch_ticket(int(t["ticket_id"]))
+        await self.db.add_ticket_participant(int(t.id), int(user.id), added_by=int(actor.id))
+        await self._touch_ticket(int(t.id))
 
         try:
             await thread.add_user(user)
@@ -1045,7 +1046,7 @@ class TicketService:
             pass
 
         try:
-            dm_emb = build_dm_ticket_added_embed(self.settings, guild, int(t["ticket_id"]), actor)
+            dm_emb = build_dm_ticket_added_embed(self.settings, guild, int(t.id), actor)
             await user.send(embed=dm_emb)
         except Exception:
             pass
@@ -1053,7 +1054,7 @@ class TicketService:
         await self.logger.emit(
             self.bot,
             "ticket_participant_added",
-            {"ticket_id": int(t["ticket_id"]), "staff_id": actor.id, "user_id": int(user.id), "source": "dashboard"},
+            {"ticket_id": int(t.id), "staff_id": actor.id, "user_id": int(user.id), "source": "dashboard"},
         )
         return True, None
 
@@ -1061,11 +1062,11 @@ class TicketService:
         t = await self.get_ticket_from_thread(guild.id, thread.id)
         if not t:
             return False, "ticket_not_found"
-        if str(t["status"]) == "closed":
+        if str(t.status) == "closed":
             return False, "ticket_closed"
 
-        ticket_id = int(t["ticket_id"])
-        claimed_by = t.get("claimed_by")
+        ticket_id = int(t.id)
+        claimed_by = t.claimed_by
 
         if claimed and claimed_by and int(claimed_by) != actor.id:
             return False, "claimed_by_other"
@@ -1092,7 +1093,7 @@ class TicketService:
         except Exception:
             dm_ok, dm_error = False, "dm_failed"
 
-        await self._update_summary_controls(thread, int(t.get("summary_id") or 0), ticket_id, claimed=claimed, status="claimed" if claimed else "open")
+        await self._update_summary_controls(thread, int(t.summary_message_id or 0), ticket_id, claimed=claimed, status="claimed" if claimed else "open")
 
         await self.logger.emit(
             self.bot,
@@ -1105,17 +1106,18 @@ class TicketService:
         t = await self.get_ticket_from_thread(guild.id, thread.id)
         if not t:
             return False, "ticket_not_found"
-        if str(t["status"]) == "closed":
+        if str(t.status) == "closed":
             return False, "ticket_closed"
 
-        await self.db.close_ticket(int(t["ticket_id"]))
+        await self.db.close_ticket(int(t.id))
+        self._deadlines.discard(int(t.id))
         closed_at = datetime.now(timezone.utc)
 
         rating_enabled = self._gb(guild.id, "ticket.rating_enabled", True)
 
-        uid = int(t["user_id"]) if t.get("user_id") else 0
+        uid = int(t.user_id) if t.user_id else 0
         if not uid:
-            uid = await _resolve_user_id_from_thread(thread, t.get("summary_id"))
+            uid = await _resolve_user_id_from_thread(thread, t.summary_message_id)
 
         dm_ok = False
         dm_error = None
@@ -1129,14 +1131,13 @@ class TicketService:
         if uid:
             try:
                 user = await self.bot.fetch_user(int(uid))
-                dm_emb = build_dm_ticket_closed_embed(self.settings, guild, int(t["ticket_id"]), closed_at, rating_enabled)
+                dm_emb = build_dm_ticket_closed_embed(self.settings, guild, int(t.id), closed_at, rating_enabled)
                 if rating_enabled:
-                    await user.send(embed=dm_emb, view=RatingView(self, int(t["ticket_id"])))
+                    await user.send(embed=dm_emb, view=RatingView(self, int(t.id)))
                 else:
                     await user.send(embed=dm_emb)
                 dm_ok = True
                 transcript_ok, transcript_error, transcript_url = await self._send_transcript_dm(user, thread, t)
-                transcript_ok, transcript_error, transcript_url = await self._send_transcript_dm(user, thread, t)
             except Exception as e:
                 dm_ok = False
                 dm_error = f"{type(e).__name__}: {e}"
@@ -1168,8 +1169,8 @@ class TicketService:
 
         await self._update_summary_controls(
             thread,
-            int(t.get("summary_id") or 0),
-            int(t["ticket_id"]),
+            int(t.summary_message_id or 0),
+            int(t.id),
             claimed=False,
             status="closed",
         )
@@ -1178,7 +1179,7 @@ class TicketService:
             guild,
             "Ticket geschlossen",
             status_text,
-            int(t["ticket_id"]),
+            int(t.id),
             thread=thread,
             actor=actor,
         )
@@ -1187,9 +1188,9 @@ class TicketService:
             self.bot,
             "ticket_closed",
             {
-                "ticket_id": int(t["ticket_id"]),
+                "ticket_id": int(t.id),
                 "staff_id": actor.id,
-                "user_id": int(uid) if uid else int(t.get("user_id") or 0),     
+                "user_id": int(uid) if uid else int(t.user_id or 0),     
                 "dm_ok": dm_ok,
                 "dm_error": dm_error,
                 "transcript_ok": transcript_ok,
@@ -1217,22 +1218,22 @@ class TicketService:
         if not parent or getattr(parent, "id", 0) != forum_id:
             return await _ephemeral(interaction, "Nur im Ticket-Thread.")
 
-        row = await self.db.get_ticket_by_thread(interaction.guild.id, thread.id)
-        t = _normalize_ticket_row(interaction.guild.id, row)
+        t = await self.db.get_ticket_by_thread(interaction.guild.id, thread.id)
         if not t:
             return await _ephemeral(interaction, "Ticket nicht gefunden.")
 
-        if str(t["status"]) == "closed":
+        if str(t.status) == "closed":
             return await _ephemeral(interaction, "Ticket ist bereits geschlossen.")
 
-        await self.db.close_ticket(int(t["ticket_id"]))
+        await self.db.close_ticket(int(t.id))
+        self._deadlines.discard(int(t.id))
         closed_at = datetime.now(timezone.utc)
 
         rating_enabled = self._gb(interaction.guild.id, "ticket.rating_enabled", True)
 
-        uid = int(t["user_id"]) if t.get("user_id") else 0
+        uid = int(t.user_id) if t.user_id else 0
         if not uid:
-            uid = await _resolve_user_id_from_thread(thread, t.get("summary_id"))
+            uid = await _resolve_user_id_from_thread(thread, t.summary_message_id)
 
         dm_ok = False
         dm_error = None
@@ -1240,9 +1241,9 @@ class TicketService:
         if uid:
             try:
                 user = await self.bot.fetch_user(int(uid))
-                dm_emb = build_dm_ticket_closed_embed(self.settings, interaction.guild, int(t["ticket_id"]), closed_at, rating_enabled)
+                dm_emb = build_dm_ticket_closed_embed(self.settings, interaction.guild, int(t.id), closed_at, rating_enabled)
                 if rating_enabled:
-                    await user.send(embed=dm_emb, view=RatingView(self, int(t["ticket_id"])))
+                    await user.send(embed=dm_emb, view=RatingView(self, int(t.id)))
                 else:
                     await user.send(embed=dm_emb)
                 dm_ok = True
@@ -1269,8 +1270,8 @@ class TicketService:
 
         await self._update_summary_controls(
             thread,
-            int(t.get("summary_id") or 0),
-            int(t["ticket_id"]),
+            int(t.summary_message_id or 0),
+            int(t.id),
             claimed=False,
             status="closed",
         )
@@ -1279,7 +1280,7 @@ class TicketService:
             interaction.guild,
             "Ticket geschlossen",
             status_text,
-            int(t["ticket_id"]),
+            int(t.id),
             thread=thread,
             actor=interaction.user,
         )
@@ -1290,9 +1291,9 @@ class TicketService:
             self.bot,
             "ticket_closed",
             {
-                "ticket_id": int(t["ticket_id"]),
+                "ticket_id": int(t.id),
                 "staff_id": interaction.user.id,
-                "user_id": int(uid) if uid else int(t.get("user_id") or 0),     
+                "user_id": int(uid) if uid else int(t.user_id or 0),     
                 "dm_ok": dm_ok,
                 "dm_error": dm_error,
                 "transcript_ok": transcript_ok,
@@ -1339,7 +1340,7 @@ class TicketService:
             interaction.guild,
             "Ticket weitergeleitet",
             f"Rolle: {role.mention}\nGrund: {reason_text or '—'}",
-            int(t["ticket_id"]),
+            int(t.id),
             thread=thread,
             actor=interaction.user,
         )
@@ -1349,7 +1350,7 @@ class TicketService:
             self.bot,
             "ticket_forwarded",
             {
-                "ticket_id": int(t["ticket_id"]),
+                "ticket_id": int(t.id),
                 "staff_id": interaction.user.id,
                 "role_id": int(role.id),
                 "reason": reason_text or None,
@@ -1363,11 +1364,12 @@ class TicketService:
         if err:
             return await _ephemeral(interaction, err)
 
-        if str(t["status"]) != "closed":
+        if str(t.status) != "closed":
             return await _ephemeral(interaction, "Ticket ist bereits offen.")
 
-        await self.db.reopen_ticket(int(t["ticket_id"]))
-        await self._touch_ticket(int(t["ticket_id"]))
+        await self.db.reopen_ticket(int(t.id))
+        await self._touch_ticket(int(t.id))
+        await self._reschedule_ticket(int(t.id))
 
         try:
             await thread.edit(archived=False, locked=False)
@@ -1386,7 +1388,7 @@ class TicketService:
         except Exception:
             pass
 
-        await self._update_summary_controls(thread, int(t.get("summary_id") or 0), int(t["ticket_id"]), claimed=False, status="open")
+        await self._update_summary_controls(thread, int(t.summary_message_id or 0), int(t.id), claimed=False, status="open")
 
         dm_ok, dm_error = await self._notify_user_update(
             interaction.guild,
@@ -1399,7 +1401,7 @@ class TicketService:
             interaction.guild,
             "Ticket wieder geöffnet",
             f"Von {interaction.user.mention}.",
-            int(t["ticket_id"]),
+            int(t.id),
             thread=thread,
             actor=interaction.user,
         )
@@ -1409,7 +1411,7 @@ class TicketService:
             self.bot,
             "ticket_reopened",
             {
-                "ticket_id": int(t["ticket_id"]),
+                "ticket_id": int(t.id),
                 "staff_id": interaction.user.id,
                 "dm_ok": dm_ok,
                 "dm_error": dm_error,
@@ -1425,8 +1427,8 @@ class TicketService:
         if not label:
             return await _ephemeral(interaction, "Bitte einen Status angeben.")
 
-        await self.db.set_status_label(int(t["ticket_id"]), label)
-        await self._touch_ticket(int(t["ticket_id"]))
+        await self.db.set_status_label(int(t.id), label)
+        await self._touch_ticket(int(t.id))
 
         try:
             emb = build_thread_status_embed(
@@ -1451,7 +1453,7 @@ class TicketService:
             interaction.guild,
             "Status geändert",
             f"Neuer Status: **{label}**",
-            int(t["ticket_id"]),
+            int(t.id),
             thread=thread,
             actor=interaction.user,
         )
@@ -1461,7 +1463,7 @@ class TicketService:
             self.bot,
             "ticket_status_changed",
             {
-                "ticket_id": int(t["ticket_id"]),
+                "ticket_id": int(t.id),
                 "staff_id": interaction.user.id,
                 "status_label": label,
                 "dm_ok": dm_ok,
@@ -1478,8 +1480,8 @@ class TicketService:
         if priority < 1 or priority > 4:
             return await _ephemeral(interaction, "Priority muss zwischen 1 und 4 liegen.")
 
-        await self.db.set_priority(int(t["ticket_id"]), priority)
-        await self._touch_ticket(int(t["ticket_id"]))
+        await self.db.set_priority(int(t.id), priority)
+        await self._touch_ticket(int(t.id))
 
         label = self._priority_label(priority)
         try:
@@ -1505,7 +1507,7 @@ class TicketService:
             interaction.guild,
             "Priorität geändert",
             f"Neue Priorität: **{label}**",
-            int(t["ticket_id"]),
+            int(t.id),
             thread=thread,
             actor=interaction.user,
         )
@@ -1515,7 +1517,7 @@ class TicketService:
             self.bot,
             "ticket_priority_changed",
             {
-                "ticket_id": int(t["ticket_id"]),
+                "ticket_id": int(t.id),
                 "staff_id": interaction.user.id,
                 "priority": int(priority),
                 "dm_ok": dm_ok,
@@ -1532,8 +1534,8 @@ class TicketService:
         if level < 1 or level > 5:
             return await _ephemeral(interaction, "Eskalation-Level muss zwischen 1 und 5 liegen.")
 
-        await self.db.set_escalation(int(t["ticket_id"]), level, int(interaction.user.id))
-        await self._touch_ticket(int(t["ticket_id"]))
+        await self.db.set_escalation(int(t.id), level, int(interaction.user.id))
+        await self._touch_ticket(int(t.id))
 
         note = _truncate((reason or "").strip(), 500) if reason else ""
         body = f"Eskalations-Level: **{level}**"
@@ -1570,7 +1572,7 @@ class TicketService:
             interaction.guild,
             "Ticket eskaliert",
             body,
-            int(t["ticket_id"]),
+            int(t.id),
             thread=thread,
             actor=interaction.user,
         )
@@ -1580,7 +1582,7 @@ class TicketService:
             self.bot,
             "ticket_escalated",
             {
-                "ticket_id": int(t["ticket_id"]),
+                "ticket_id": int(t.id),
                 "staff_id": interaction.user.id,
                 "level": int(level),
                 "reason": note if note else None,
@@ -1623,8 +1625,8 @@ class TicketService:
         except Exception:
             pass
 
-        await self.db.set_category_key(int(t["ticket_id"]), category_key)
-        await self._touch_ticket(int(t["ticket_id"]))
+        await self.db.set_category_key(int(t.id), category_key)
+        await self._touch_ticket(int(t.id))
 
         try:
             emb = build_thread_status_embed(
@@ -1649,7 +1651,7 @@ class TicketService:
             interaction.guild,
             "Kategorie geändert",
             f"Neue Kategorie: **{_truncate(cat_label, 48)}**",
-            int(t["ticket_id"]),
+            int(t.id),
             thread=thread,
             actor=interaction.user,
         )
@@ -1659,7 +1661,7 @@ class TicketService:
             self.bot,
             "ticket_category_changed",
             {
-                "ticket_id": int(t["ticket_id"]),
+                "ticket_id": int(t.id),
                 "staff_id": interaction.user.id,
                 "category": category_key,
                 "dm_ok": dm_ok,
@@ -1674,27 +1676,30 @@ class TicketService:
 
         await _ephemeral(interaction, "Erstelle Transcript...")
 
-        html_data = await self._render_html_transcript(thread, t)
-        filename = f"ticket-{int(t['ticket_id'])}-transcript.html"
-        target = channel or await self._get_ticket_log_channel(interaction.guild) or thread
+        html_file, html_size = await self._render_html_transcript(thread, t)
+        filename = f"ticket-{int(t.id)}-transcript.html"
         try:
-            await target.send(file=discord.File(io.BytesIO(html_data), filename=filename))
-        except Exception:
-            pass
-
-        guild_id = int(t.get("guild_id") or (interaction.guild.id if interaction.guild else 0) or 0)
-        upload_url = await self._upload_transcript(guild_id, filename, html_data)
-        if upload_url:
+            target = channel or await self._get_ticket_log_channel(interaction.guild) or thread
             try:
-                await thread.send(f"Transcript: {upload_url}")
+                await target.send(file=discord.File(html_file, filename=filename))
             except Exception:
                 pass
 
+            guild_id = int(t.guild_id or (interaction.guild.id if interaction.guild else 0) or 0)
+            upload_url = await self._upload_transcript(guild_id, filename, html_file, html_size)
+            if upload_url:
+                try:
+                    await thread.send(f"Transcript: {upload_url}")
+                except Exception:
+                    pass
+        finally:
+            html_file.close()
+
         await self._send_ticket_log(
             interaction.guild,
             "Transcript erstellt",
             f"Transcript wurde generiert ({filename}).",
-            int(t["ticket_id"]),
+            int(t.id),
             thread=thread,
             actor=interaction.user,
         )
@@ -1702,76 +1707,167 @@ class TicketService:
         await self.logger.emit(
             self.bot,
             "ticket_transcript_created",
-            {"ticket_id": int(t["ticket_id"]), "staff_id": interaction.user.id},
+            {"ticket_id": int(t.id), "staff_id": interaction.user.id},
         )
 
-    async def _render_html_transcript(self, thread: discord.Thread, t: dict) -> bytes:
-        title = f"Ticket #{int(t['ticket_id'])}"
-        header = (
-            f"{title} • Status: {t.get('status')} • Priority: {self._priority_label(t.get('priority'))}"
+    async def search_messages(
+        self,
+        guild_id: int,
+        query: str,
+        cursor: str | None = None,
+        limit: int = 10,
+        ticket_id: int | None = None,
+    ) -> tuple[list[TicketSearchHit], str | None]:
+        limit = max(1, min(int(limit), 100))
+        key = (int(guild_id), str(query), int(ticket_id or 0))
+        decoded = _decode_search_cursor(cursor)
+        token, offset = decoded if decoded else (secrets.token_urlsafe(8), 0)
+        snapshot = self._search_snapshots.get(token)
+        if snapshot is None or snapshot[0] != key:
+            ids = await self.db.search_ticket_message_ids(
+                int(guild_id), query, limit=_SEARCH_SNAPSHOT_LIMIT, ticket_id=ticket_id
+            )
+            snapshot = (key, ids)
+            self._search_snapshots[token] = snapshot
+            while len(self._search_snapshots) > _SEARCH_SNAPSHOTS_KEPT:
+                self._search_snapshots.popitem(last=False)
+        self._search_snapshots.move_to_end(token)
+        ids = snapshot[1]
+        hits = await self.db.get_ticket_search_hits(query, ids[offset:offset + limit])
+        if offset + limit >= len(ids):
+            return hits, None
+        return hits, f"{token}:{offset + limit}"
+
+    async def search_tickets(self, interaction: discord.Interaction, query: str, cursor: str | None = None, page: int = 1):
+        if not interaction.guild or not isinstance(interaction.user, discord.Member):
+            return await _ephemeral(interaction, "Nur im Server nutzbar.")
+        if not is_staff(self.settings, interaction.user):
+            return await _ephemeral(interaction, "Keine Rechte.")
+        query = (query or "").strip()
+        if not query:
+            return await _ephemeral(interaction, "Bitte einen Suchbegriff angeben.")
+
+        hits, next_cursor = await self.search_messages(
+            interaction.guild.id, query, cursor=cursor, limit=_SEARCH_PAGE_SIZE
         )
-        messages = []
-        try:
-            async for msg in thread.history(limit=None, oldest_first=True):
-                ts = msg.created_at.strftime("%Y-%m-%d %H:%M:%S UTC")
-                author_name = getattr(msg.author, "display_name", str(msg.author))
-                author_tag = str(msg.author)
+        emb = build_ticket_search_embed(
+            self.settings,
+            interaction.guild,
+            query,
+            [h._replace(snippet=_discord_snippet(h.snippet)) for h in hits],
+            page=page,
+        )
+        view = TicketSearchView(self, interaction.user.id, query, next_cursor, page) if next_cursor else None
+        if cursor:
+            await interaction.response.edit_message(embed=emb, view=view)
+        else:
+            await interaction.response.send_message(embed=emb, view=view or discord.utils.MISSING, ephemeral=True)
+
+    async def _transcript_entries(self, thread: discord.Thread, t: TicketRow):
+        legacy = _parse_iso(t.archive_started_at) is None
+        archived_ids = await self.db.list_ticket_message_ids(int(t.id)) if thread is not None else set()
+        history = self._history_entries(thread, skip_ids=archived_ids)
+        pending = await anext(history, None)
+        first_archived_at = None
+        async for row in self.db.iter_ticket_messages(int(t.id)):
+            created_at = _parse_iso(row.created_at)
+            if first_archived_at is None:
+                first_archived_at = created_at
+            while pending is not None and created_at is not None and pending["created_at"] <= created_at:
+                if not pending["from_bot"] or (legacy and (first_archived_at is None or pending["created_at"] < first_archived_at)):
+                    yield pending
+                pending = await anext(history, None)
+            try:
+                attachments = json.loads(row.attachments_json) if row.attachments_json else []
+            except Exception:
+                attachments = []
+            yield {
+                "created_at": created_at,
+                "author_name": row.author_name or str(row.author_id),
+                "author_tag": row.author_tag or "",
+                "avatar": row.author_avatar or "",
+                "color": row.author_color,
+                "content": row.content or "",
+                "attachments": attachments,
+            }
+        while pending is not None:
+            if not pending["from_bot"] or (legacy and first_archived_at is None):
+                yield pending
+            pending = await anext(history, None)
+
+    async def _history_entries(self, thread: discord.Thread, skip_ids: set[int] | None = None):
+        if thread is None:
+            return
+        async for msg in thread.history(limit=None, oldest_first=True):
+            if skip_ids and int(msg.id) in skip_ids:
+                continue
+            color = None
+            try:
+                if isinstance(msg.author, discord.Member) and msg.author.color:
+                    color = int(msg.author.color.value)
+            except Exception:
+                color = None
+            avatar = ""
+            try:
+                avatar = str(msg.author.display_avatar.url)
+            except Exception:
                 avatar = ""
-                try:
-                    avatar = str(msg.author.display_avatar.url)
-                except Exception:
-                    avatar = ""
-                role_color = "#ffffff"
-                try:
-                    if isinstance(msg.author, discord.Member) and msg.author.color:
-                        role_color = f"#{msg.author.color.value:06x}"
-                except Exception:
-                    role_color = "#ffffff"
-                content = html_lib.escape(msg.content or "").replace("\n", "<br>")
-                attachment_bits = []
-                for a in msg.attachments:
-                    filename = html_lib.escape(a.filename or "file")
-                    is_image = False
-                    try:
-                        if a.content_type and a.content_type.startswith("image/"):
-                            is_image = True
-                    except Exception:
-                        is_image = False
-                    if not is_image:
-                        lower = (a.filename or "").lower()
-                        if lower.endswith((".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp")):
-                            is_image = True
-                    if is_image:
-                        attachment_bits.append(
-                            f"<div class='attachment image'><a href='{a.url}'><img src='{a.url}' alt='{filename}'></a></div>"
-                        )
-                    else:
-                        size = _human_bytes(getattr(a, "size", None))
-                        attachment_bits.append(
-                            f"<div class='attachment file'><a href='{a.url}'>{filename}</a><span class='size'>{size}</span></div>"
-                        )
-                attachments = "".join(attachment_bits)
-                if not content and not attachments:
-                    content = "<span class='empty'>[kein Inhalt]</span>"
-                messages.append(
-                    "<div class='msg'>"
-                    f"<div class='avatar'>{f'<img src=\"{avatar}\" />' if avatar else ''}</div>"
-                    "<div class='content'>"
-                    "<div class='meta'>"
-                    f"<span class='author' style='color:{role_color}'>"
-                    f"{html_lib.escape(author_name)}</span>"
-                    f"<span class='tag'>{html_lib.escape(author_tag)}</span>"
-                    f"<span class='ts'>{ts}</span>"
-                    "</div>"
-                    f"<div class='body'>{content}</div>"
-                    f"{attachments}"
-                    "</div>"
-                    "</div>"
+            yield {
+                "created_at": msg.created_at,
+                "author_name": getattr(msg.author, "display_name", str(msg.author)),
+                "author_tag": str(msg.author),
+                "avatar": avatar,
+                "color": color,
+                "content": msg.content or "",
+                "attachments": _attachment_meta(msg.attachments),
+                "from_bot": bool(msg.author.bot),
+            }
+
+    def _render_transcript_message(self, entry: dict) -> str:
+        created_at = entry.get("created_at")
+        ts = created_at.strftime("%Y-%m-%d %H:%M:%S UTC") if created_at else ""
+        role_color = f"#{int(entry['color']):06x}" if entry.get("color") else "#ffffff"
+        content = html_lib.escape(entry.get("content") or "").replace("\n", "<br>")
+        attachment_bits = []
+        for a in entry.get("attachments") or []:
+            filename = html_lib.escape(str(a.get("filename") or "file"))
+            url = html_lib.escape(str(a.get("url") or ""), quote=True)
+            if a.get("is_image"):
+                attachment_bits.append(
+                    f"<div class='attachment image'><a href='{url}'><img src='{url}' alt='{filename}'></a></div>"
                 )
-        except Exception:
-            messages.append("<div class='msg'><div class='body'>[error] Transcript konnte nicht vollständig erstellt werden.</div></div>")
+            else:
+                size = _human_bytes(a.get("size"))
+                attachment_bits.append(
+                    f"<div class='attachment file'><a href='{url}'>{filename}</a><span class='size'>{size}</span></div>"
+                )
+        attachments = "".join(attachment_bits)
+        if not content and not attachments:
+            content = "<span class='empty'>[kein Inhalt]</span>"
+        avatar = entry.get("avatar") or ""
+        avatar_html = f"<img src=\"{html_lib.escape(avatar, quote=True)}\" />" if avatar else ""
+        return (
+            "<div class='msg'>"
+            f"<div class='avatar'>{avatar_html}</div>"
+            "<div class='content'>"
+            "<div class='meta'>"
+            f"<span class='author' style='color:{role_color}'>"
+            f"{html_lib.escape(entry.get('author_name') or '')}</span>"
+            f"<span class='tag'>{html_lib.escape(entry.get('author_tag') or '')}</span>"
+            f"<span class='ts'>{ts}</span>"
+            "</div>"
+            f"<div class='body'>{content}</div>"
+            f"{attachments}"
+            "</div>"
+            "</div>"
+        )
 
-        html = f"""<!doctype html>
+    async def _render_html_transcript(self, thread: discord.Thread, t: TicketRow) -> tuple[tempfile.SpooledTemporaryFile, int]:
+        title = f"Ticket #{int(t.id)}"
+        header = (
+            f"{title} • Status: {t.status} • Priority: {self._priority_label(t.priority)}"
+        )
+        head = f"""<!doctype html>
 <html>
 <head>
 <meta charset="utf-8"/>
@@ -1804,65 +1900,38 @@ body {{ font-family: "gg sans","Noto Sans","Helvetica Neue",Arial,sans-serif; ba
   <h1>{html_lib.escape(thread.name or title)}</h1>
   <div class="sub">{html_lib.escape(header)}</div>
 </div>
-{''.join(messages)}
-</body>
-</html>
 """
-        return html.encode("utf-8")
+        out = tempfile.SpooledTemporaryFile(max_size=_TRANSCRIPT_SPOOL_BYTES, mode="w+b")
+        try:
+            batch = [head.encode("utf-8")]
+            batch_size = len(batch[0])
+            try:
+                async for entry in self._transcript_entries(thread, t):
+                    chunk = self._render_transcript_message(entry).encode("utf-8")
+                    batch.append(chunk)
+                    batch_size += len(chunk)
+                    if batch_size >= _TRANSCRIPT_WRITE_BATCH_BYTES:
+                        await asyncio.to_thread(out.write, b"".join(batch))
+                        batch, batch_size = [], 0
+            except Exception:
+                batch.append("<div class='msg'><div class='body'>[error] Transcript konnte nicht vollständig erstellt werden.</div></div>".encode("utf-8"))
+            batch.append(b"\n</body>\n</html>\n")
+            await asyncio.to_thread(out.write, b"".join(batch))
+            size = out.tell()
+            out.seek(0)
+            return out, size
+        except Exception:
+            out.close()
+            raise
 
-    async def _upload_transcript(self, guild_id: int, filename: str, data: bytes) -> str | None:
+    async def _upload_transcript(self, guild_id: int, filename: str, fh, size: int) -> str | None:
         url = str(self._g(guild_id, "ticket.transcript_upload_url", "") or "").strip()
         if not url:
             return None
         token = str(self._g(guild_id, "ticket.transcript_upload_token", "") or "").strip()
         mode = str(self._g(guild_id, "ticket.transcript_upload_mode", "multipart") or "multipart").strip()
-
-        def _post_raw():
-            req = urllib.request.Request(url, data=data, method="POST")
-            req.add_header("Content-Type", "text/html; charset=utf-8")
-            req.add_header("X-Filename", filename)
-            if token:
-                req.add_header("Authorization", f"Bearer {token}")
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                return resp.read(), resp.getheader("Location")
-
-        def _post_multipart():
-            boundary = f"----StarryBoundary{uuid.uuid4().hex}"
-            buf = io.BytesIO()
-            buf.write(f"--{boundary}\r\n".encode("utf-8"))
-            buf.write(
-                f'Content-Disposition: form-data; name="files"; filename="{filename}"\r\n'.encode("utf-8")
-            )
-            buf.write(b"Content-Type: text/html; charset=utf-8\r\n\r\n")
-            buf.write(data)
-            buf.write(f"\r\n--{boundary}--\r\n".encode("utf-8"))
-            body = buf.getvalue()
-
-            req = urllib.request.Request(url, data=body, method="POST")
-            req.add_header("Content-Type", f"multipart/form-data; boundary={boundary}")
-            if token:
-                req.add_header("Authorization", f"Bearer {token}")
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                return resp.read(), resp.getheader("Location")
-
         try:
-            if mode == "raw":
-                body, location = await asyncio.to_thread(_post_raw)
-            else:
-                body, location = await asyncio.to_thread(_post_multipart)
-            if location:
-                return str(location)
-            try:
-                parsed = json.loads(body.decode("utf-8"))
-                if isinstance(parsed, dict):
-                    if parsed.get("url") or parsed.get("link"):
-                        return str(parsed.get("url") or parsed.get("link") or "")
-                    uploads = parsed.get("uploads") or []
-                    if uploads and isinstance(uploads, list):
-                        return str(uploads[0].get("url") or "")
-                return None
-            except Exception:
-                return None
+            return await self._uploader.upload(url, filename, fh, size, token=token, mode=mode)
         except Exception:
             return None
 
@@ -1870,139 +1939,194 @@ body {{ font-family: "gg sans","Noto Sans","Helvetica Neue",Arial,sans-serif; ba
         self,
         user: discord.User,
         thread: discord.Thread,
-        t: dict,
+        t: TicketRow,
     ) -> tuple[bool, str | None, str | None]:
         try:
-            html_data = await self._render_html_transcript(thread, t)
-            filename = f"ticket-{int(t['ticket_id'])}-transcript.html"
-            guild_id = int(t.get("guild_id") or (thread.guild.id if thread and thread.guild else 0) or 0)
-            upload_url = await self._upload_transcript(guild_id, filename, html_data)
+            html_file, html_size = await self._render_html_transcript(thread, t)
+        except Exception as e:
+            return False, f"{type(e).__name__}: {e}", None
+        try:
+            filename = f"ticket-{int(t.id)}-transcript.html"
+            guild_id = int(t.guild_id or (thread.guild.id if thread and thread.guild else 0) or 0)
+            upload_url = await self._upload_transcript(guild_id, filename, html_file, html_size)
             if upload_url:
                 await user.send(f"Transcript: {upload_url}")
                 return True, None, upload_url
-            if len(html_data) <= 7_500_000:
-                await user.send(file=discord.File(io.BytesIO(html_data), filename=filename))
+            if html_size <= 7_500_000:
+                html_file.seek(0)
+                await user.send(file=discord.File(html_file, filename=filename))
                 return True, None, None
             return False, "transcript_upload_failed", None
         except Exception as e:
             return False, f"{type(e).__name__}: {e}", None
+        finally:
+            html_file.close()
+
+    def _ticket_deadline(self, t: TicketRow) -> float | None:
+        guild_id = int(t.guild_id)
+        deadlines = []
+        sla_minutes = float(self._g(guild_id, "ticket.sla_first_response_minutes", 0) or 0)
+        if sla_minutes > 0 and not t.first_staff_reply_at and not t.sla_breached_at:
+            created_at = _parse_iso(t.created_at)
+            if created_at:
+                deadlines.append(created_at + timedelta(minutes=sla_minutes))
+        auto_close_hours = float(self._g(guild_id, "ticket.auto_close_hours", 0) or 0)
+        if auto_close_hours > 0:
+            last_activity = _parse_iso(t.last_activity_at) or _parse_iso(t.created_at)
+            if last_activity:
+                deadlines.append(last_activity + timedelta(hours=auto_close_hours))
+        return min(deadlines).timestamp() if deadlines else None
+
+    def _note_ticket_activity(self, t: TicketRow, **changes):
+        if self._deadlines_loaded and str(t.status) in ("open", "claimed"):
+            self._deadlines.schedule(int(t.id), self._ticket_deadline(t._replace(**changes)))
+
+    async def _reschedule_ticket(self, ticket_id: int, not_before: float | None = None):
+        if not self._deadlines_loaded:
+            return
+        t = await self.db.get_ticket(int(ticket_id))
+        if not t or str(t.status) not in ("open", "claimed"):
+            self._deadlines.discard(int(ticket_id))
+            return
+        due = self._ticket_deadline(t)
+        if due is not None and not_before is not None:
+            due = max(due, not_before)
+        self._deadlines.schedule(int(t.id), due)
+
+    async def _load_deadlines(self):
+        self._deadlines.clear()
+        for t in await self.db.list_active_tickets():
+            self._deadlines.schedule(int(t.id), self._ticket_deadline(t))
+        self._deadlines_loaded = True
 
     async def run_automation(self):
         await self.bot.wait_until_ready()
+        if not self._deadlines_loaded:
+            await self._load_deadlines()
+        await self._deadlines.wait(_DEADLINE_MAX_SLEEP_SECONDS, datetime.now(timezone.utc).timestamp())
+        if not self._deadlines_loaded:
+            return
+        for ticket_id in self._deadlines.pop_due(datetime.now(timezone.utc).timestamp()):
+            retry_seconds = _DEADLINE_RETRY_SECONDS
+            try:
+                t = await self.db.get_ticket(ticket_id)
+                if t and str(t.status) in ("open", "claimed"):
+                    if self.bot.get_guild(int(t.guild_id)):
+                        await self._run_ticket_deadline(t)
+                    else:
+                        retry_seconds = _DEADLINE_MISSING_GUILD_SECONDS
+            except Exception as e:
+                try:
+                    await self.logger.emit_system(
+                        "ticket_automation_error",
+                        {"ticket_id": int(ticket_id), "error": f"{type(e).__name__}: {e}"},
+                    )
+                except Exception:
+                    pass
+            retry_at = datetime.now(timezone.utc).timestamp() + retry_seconds
+            try:
+                await self._reschedule_ticket(ticket_id, not_before=retry_at)
+            except Exception:
+                self._deadlines.schedule(ticket_id, retry_at)
+
+    async def _run_ticket_deadline(self, t: TicketRow):
         now = datetime.now(timezone.utc)
-        rows = await self.db.list_active_tickets(limit=500)
-        for row in rows:
-            t = {
-                "ticket_id": int(row[0]),
-                "guild_id": int(row[1]),
-                "user_id": int(row[2]) if row[2] is not None else 0,
-                "thread_id": int(row[3]),
-                "status": str(row[4]),
-                "claimed_by": int(row[5]) if row[5] is not None else None,
-                "category_key": str(row[6]) if row[6] is not None else None,
-                "created_at": row[7],
-                "last_activity_at": row[8],
-                "last_user_message_at": row[9],
-                "last_staff_message_at": row[10],
-                "first_staff_reply_at": row[11],
-                "sla_breached_at": row[12],
-                "priority": row[13],
-                "status_label": row[14],
-                "escalated_level": row[15],
-            }
-            guild_id = int(t["guild_id"])
-            guild = self.bot.get_guild(guild_id)
-            if not guild:
-                continue
+        guild_id = int(t.guild_id)
+        guild = self.bot.get_guild(guild_id)
+        if not guild:
+            return
+        due = self._ticket_deadline(t)
+        if due is None or due > now.timestamp():
+            return
 
-            auto_close_hours = float(self._g(guild_id, "ticket.auto_close_hours", 0) or 0)
-            sla_minutes = float(self._g(guild_id, "ticket.sla_first_response_minutes", 0) or 0)
+        auto_close_hours = float(self._g(guild_id, "ticket.auto_close_hours", 0) or 0)
+        sla_minutes = float(self._g(guild_id, "ticket.sla_first_response_minutes", 0) or 0)
 
-            thread = guild.get_thread(int(t["thread_id"]))
-            if not thread:
+        thread = guild.get_thread(int(t.thread_id))
+        if not thread:
+            try:
+                fetched = await self.bot.fetch_channel(int(t.thread_id))
+                thread = fetched if isinstance(fetched, discord.Thread) else None
+            except Exception:
+                thread = None
+
+        if sla_minutes > 0 and not t.first_staff_reply_at and not t.sla_breached_at:
+            created_at = _parse_iso(t.created_at)
+            if created_at and now - created_at >= timedelta(minutes=sla_minutes):
                 try:
-                    fetched = await self.bot.fetch_channel(int(t["thread_id"]))
-                    thread = fetched if isinstance(fetched, discord.Thread) else None
+                    emb = build_thread_status_embed(
+                        self.settings,
+                        guild,
+                        "⏱️ SLA überschritten",
+                        "Noch keine Antwort vom Team.",
+                        None,
+                    )
+                    if thread:
+                        await thread.send(embed=emb)
                 except Exception:
-                    thread = None
+                    pass
+                try:
+                    await self.db.set_sla_breached(int(t.id), now.isoformat())
+                except Exception:
+                    pass
+                await self._send_ticket_log(
+                    guild,
+                    "SLA überschritten",
+                    "Noch keine Antwort vom Team.",
+                    int(t.id),
+                    thread=thread,
+                    actor=None,
+                )
 
-            if sla_minutes > 0 and not t.get("first_staff_reply_at") and not t.get("sla_breached_at"):
-                created_at = _parse_iso(t.get("created_at"))
-                if created_at and now - created_at >= timedelta(minutes=sla_minutes):
-                    try:
+        if auto_close_hours > 0:
+            last_activity = _parse_iso(t.last_activity_at) or _parse_iso(t.created_at)
+            if last_activity and now - last_activity >= timedelta(hours=auto_close_hours):
+                try:
+                    await self.db.close_ticket(int(t.id))
+                except Exception:
+                    pass
+
+                try:
+                    if thread:
                         emb = build_thread_status_embed(
                             self.settings,
                             guild,
-                            "⏱️ SLA überschritten",
-                            "Noch keine Antwort vom Team.",
+                            "🔒 Auto-Close",
+                            "Ticket wurde wegen Inaktivität geschlossen.",
                             None,
                         )
-                        if thread:
-                            await thread.send(embed=emb)
-                    except Exception:
-                        pass
-                    try:
-                        await self.db.set_sla_breached(int(t["ticket_id"]), now.isoformat())
-                    except Exception:
-                        pass
-                    await self._send_ticket_log(
-                        guild,
-                        "SLA überschritten",
-                        "Noch keine Antwort vom Team.",
-                        int(t["ticket_id"]),
-                        thread=thread,
-                        actor=None,
-                    )
-
-            if auto_close_hours > 0:
-                last_activity = _parse_iso(t.get("last_activity_at")) or _parse_iso(t.get("created_at"))
-                if last_activity and now - last_activity >= timedelta(hours=auto_close_hours):
-                    try:
-                        await self.db.close_ticket(int(t["ticket_id"]))
-                    except Exception:
-                        pass
+                        await thread.send(embed=emb)
+                        await thread.edit(archived=True, locked=True)
+                except Exception:
+                    pass
 
+                await self._notify_user_update(
+                    guild,
+                    t,
+                    "Ticket geschlossen",
+                    "Dein Ticket wurde wegen Inaktivität automatisch geschlossen."
+                )
+                if thread and t.user_id:
                     try:
-                        if thread:
-                            emb = build_thread_status_embed(
-                                self.settings,
-                                guild,
-                                "🔒 Auto-Close",
-                                "Ticket wurde wegen Inaktivität geschlossen.",
-                                None,
-                            )
-                            await thread.send(embed=emb)
-                            await thread.edit(archived=True, locked=True)
+                        user = await self.bot.fetch_user(int(t.user_id))
+                        await self._send_transcript_dm(user, thread, t)
                     except Exception:
                         pass
 
-                    await self._notify_user_update(
-                        guild,
-                        t,
-                        "Ticket geschlossen",
-                        "Dein Ticket wurde wegen Inaktivität automatisch geschlossen."
-                    )
-                    if thread and t.get("user_id"):
-                        try:
-                            user = await self.bot.fetch_user(int(t["user_id"]))
-                            await self._send_transcript_dm(user, thread, t)
-                        except Exception:
-                            pass
-
-                    await self._send_ticket_log(
-                        guild,
-                        "Auto-Close",
-                        "Ticket wurde wegen Inaktivität geschlossen.",
-                        int(t["ticket_id"]),
-                        thread=thread,
-                        actor=None,
-                    )
+                await self._send_ticket_log(
+                    guild,
+                    "Auto-Close",
+                    "Ticket wurde wegen Inaktivität geschlossen.",
+                    int(t.id),
+                    thread=thread,
+                    actor=None,
+                )
 
-                    await self.logger.emit(
-                        self.bot,
-                        "ticket_auto_closed",
-                        {"ticket_id": int(t["ticket_id"])},
-                    )
+                await self.logger.emit(
+                    self.bot,
+                    "ticket_auto_closed",
+                    {"ticket_id": int(t.id)},
+                )
 
     async def submit_rating(self, interaction: discord.Interaction, ticket_id: int, rating: int, comment: str | None):
         row = await self.db.get_ticket(int(ticket_id))
@@ -2031,7 +2155,7 @@ body {{ font-family: "gg sans","Noto Sans","Helvetica Neue",Arial,sans-serif; ba
 
         await self.db.set_rating(int(ticket_id), int(rating), comment)
 
-        guild_id = int(row[1]) if row and len(row) > 1 else 0
+        guild_id = int(row.guild_id or 0)
         guild = self.bot.get_guild(guild_id) if guild_id else None
 
         try:
@@ -2053,9 +2177,8 @@ body {{ font-family: "gg sans","Noto Sans","Helvetica Neue",Arial,sans-serif; ba
         })
 
         try:
-            t = _normalize_ticket_row(guild_id, row)
-            if guild and t and t.get("thread_id"):
-                thread = guild.get_thread(int(t["thread_id"]))
+            if guild and row.thread_id:
+                thread = guild.get_thread(int(row.thread_id))
                 if thread:
                     emb = build_thread_rating_embed(self.settings, guild, int(interaction.user.id), int(rating),
                                                     comment)
@@ -0,0 +1,118 @@
+import json
+import uuid
+import random
+import asyncio
+import httpx
+
+_CHUNK_BYTES = 64 * 1024
+_RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+def _parse_upload_url(resp: httpx.Response) -> str | None:
+    location = resp.headers.get("Location")
+    if location:
+        return str(location)
+    try:
+        parsed = json.loads(resp.content.decode("utf-8"))
+    except Exception:
+        return None
+    if not isinstance(parsed, dict):
+        return None
+    if parsed.get("url") or parsed.get("link"):
+        return str(parsed.get("url") or parsed.get("link") or "")
+    uploads = parsed.get("uploads") or []
+    if uploads and isinstance(uploads, list) and isinstance(uploads[0], dict):
+        return str(uploads[0].get("url") or "") or None
+    return None
+
+
+class TranscriptUploader:
+    def __init__(self, settings, transport: httpx.AsyncBaseTransport | None = None):
+        self.settings = settings
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _concurrency(self) -> int:
+        return max(1, self.settings.get_int("ticket.transcript_upload_concurrency", 4))
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            timeout = float(self.settings.get("ticket.transcript_upload_timeout_seconds", 15) or 15)
+            limit = self._concurrency()
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(timeout),
+                limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit),
+                follow_redirects=True,
+                transport=self._transport,
+            )
+            self._semaphore = asyncio.Semaphore(limit)
+        return self._client
+
+    async def close(self):
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    async def upload(self, url: str, filename: str, fh, size: int, token: str = "", mode: str = "multipart") -> str | None:
+        client = self._get_client()
+        retries = max(0, self.settings.get_int("ticket.transcript_upload_retries", 3))
+        backoff = float(self.settings.get("ticket.transcript_upload_backoff_seconds", 1.0) or 1.0)
+        async with self._semaphore:
+            for attempt in range(retries + 1):
+                retry_after = None
+                try:
+                    resp = await self._post(client, url, filename, fh, int(size), token, mode)
+                    if resp.status_code < 400:
+                        return _parse_upload_url(resp)
+                    if resp.status_code not in _RETRY_STATUS:
+                        return None
+                    try:
+                        retry_after = float(resp.headers.get("Retry-After", ""))
+                    except ValueError:
+                        pass
+                except (httpx.TransportError, httpx.TimeoutException):
+                    pass
+                except httpx.StreamError:
+                    return None
+                if attempt >= retries:
+                    return None
+                delay = backoff * (2 ** attempt) * (0.5 + random.random())
+                await asyncio.sleep(min(60.0, retry_after if retry_after is not None else delay))
+        return None
+
+    async def _post(self, client: httpx.AsyncClient, url: str, filename: str, fh, size: int, token: str, mode: str):
+        headers = {}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if mode == "raw":
+            headers["Content-Type"] = "text/html; charset=utf-8"
+            headers["Content-Length"] = str(size)
+            headers["X-Filename"] = filename
+            return await client.post(url, content=self._chunks(fh), headers=headers)
+
+        boundary = f"----StarryBoundary{uuid.uuid4().hex}"
+        prefix = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="files"; filename="{filename}"\r\n'
+            "Content-Type: text/html; charset=utf-8\r\n\r\n"
+        ).encode("utf-8")
+        suffix = f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+        async def _body():
+            yield prefix
+            async for chunk in self._chunks(fh):
+                yield chunk
+            yield suffix
+
+        headers["Content-Type"] = f"multipart/form-data; boundary={boundary}"
+        headers["Content-Length"] = str(len(prefix) + size + len(suffix))
+        return await client.post(url, content=_body(), headers=headers)
+
+    async def _chunks(self, fh):
+        fh.seek(0)
+        while True:
+            chunk = await asyncio.to_thread(fh.read, _CHUNK_BYTES)
+            if not chunk:
+                return
+            yield chunk
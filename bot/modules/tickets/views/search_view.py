@@ -0,0 +1,18 @@
+import discord
+
+
+class TicketSearchView(discord.ui.View):
+    def __init__(self, service, user_id: int, query: str, cursor: str, page: int):
+        super().__init__(timeout=300)
+        self.service = service
+        self.user_id = int(user_id)
+        self.query = query
+        self.cursor = cursor
+        self.page = int(page)
+
+    @discord.ui.button(label="Weitere Treffer", style=discord.ButtonStyle.secondary, emoji="➡️")
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id != self.user_id:
+            return await interaction.response.send_message("Das ist nicht deine Suche.", ephemeral=True)
+        self.stop()
+        await self.service.search_tickets(interaction, self.query, cursor=self.cursor, page=self.page + 1)
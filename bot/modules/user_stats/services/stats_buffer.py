@@ -0,0 +1,161 @@
+import asyncio
+from collections import OrderedDict
+from bot.core.rows import UserStats
+
+
+class UserStatsBuffer:
+    def __init__(self, db, max_cached: int = 50000):
+        self.db = db
+        self._max_cached = max(1, int(max_cached))
+        self._stats = OrderedDict()
+        self._deltas = {}
+        self._channel_deltas = {}
+        self._flush_lock = asyncio.Lock()
+
+    async def get(self, guild_id: int, user_id: int) -> UserStats | None:
+        key = (int(guild_id), int(user_id))
+        stats = self._stats.get(key)
+        if stats is None:
+            row = await self.db.get_user_stats(key[0], key[1])
+            stats = self._stats.get(key)
+            if stats is None:
+                if not row:
+                    return None
+                stats = row
+                self._stats[key] = stats
+        self._stats.move_to_end(key)
+        return stats
+
+    async def get_many(self, guild_id: int, user_ids: list[int]) -> dict[int, UserStats]:
+        gid = int(guild_id)
+        missing = [int(uid) for uid in user_ids if (gid, int(uid)) not in self._stats]
+        rows = await self.db.get_user_stats_many(gid, missing) if missing else {}
+        out = {}
+        for uid in user_ids:
+            key = (gid, int(uid))
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = rows.get(key[1])
+                if stats is None:
+                    continue
+                self._stats[key] = stats
+            self._stats.move_to_end(key)
+            out[key[1]] = stats
+        return out
+
+    async def _entry(self, guild_id: int, user_id: int) -> UserStats:
+        stats = await self.get(guild_id, user_id)
+        if stats is None:
+            stats = UserStats(int(guild_id), int(user_id))
+            self._stats[(int(guild_id), int(user_id))] = stats
+        return stats
+
+    def _delta(self, key: tuple) -> dict:
+        delta = self._deltas.get(key)
+        if delta is None:
+            delta = {
+                "message_count": 0,
+                "voice_seconds": 0,
+                "welcome_count": 0,
+                "xp": 0,
+                "level": None,
+                "last_message_at": None,
+                "last_voice_at": None,
+            }
+            self._deltas[key] = delta
+        return delta
+
+    async def add_message(self, guild_id: int, user_id: int, channel_id: int, xp: int, welcome: bool, when_iso: str) -> UserStats:
+        stats = await self._entry(guild_id, user_id)
+        key = (int(guild_id), int(user_id))
+        delta = self._delta(key)
+        delta["message_count"] += 1
+        delta["xp"] += int(xp)
+        delta["last_message_at"] = when_iso
+        stats.message_count += 1
+        stats.xp += int(xp)
+        stats.last_message_at = when_iso
+        if welcome:
+            delta["welcome_count"] += 1
+            stats.welcome_count += 1
+        ch_key = (key[0], key[1], int(channel_id))
+        self._channel_deltas[ch_key] = self._channel_deltas.get(ch_key, 0) + 1
+        return stats
+
+    async def add_voice(self, guild_id: int, user_id: int, seconds: int, xp: int, when_iso: str) -> UserStats:
+        stats = await self._entry(guild_id, user_id)
+        delta = self._delta((int(guild_id), int(user_id)))
+        delta["voice_seconds"] += int(seconds)
+        delta["xp"] += int(xp)
+        delta["last_voice_at"] = when_iso
+        stats.voice_seconds += int(seconds)
+        stats.xp += int(xp)
+        stats.last_voice_at = when_iso
+        return stats
+
+    async def set_level(self, guild_id: int, user_id: int, level: int):
+        stats = await self._entry(guild_id, user_id)
+        delta = self._delta((int(guild_id), int(user_id)))
+        delta["level"] = int(level)
+        stats.level = int(level)
+
+    def apply_invite(self, guild_id: int, user_id: int, left: bool = False):
+        stats = self._stats.get((int(guild_id), int(user_id)))
+        if stats is None:
+            return
+        if left:
+            stats.invite_left_count += 1
+        else:
+            stats.invite_count += 1
+
+    async def flush(self):
+        async with self._flush_lock:
+            deltas, self._deltas = self._deltas, {}
+            channel_deltas, self._channel_deltas = self._channel_deltas, {}
+            if deltas or channel_deltas:
+                stats_rows = [
+                    (
+                        gid,
+                        uid,
+                        d["message_count"],
+                        d["voice_seconds"],
+                        d["welcome_count"],
+                        d["xp"],
+                        d["level"] or 0,
+                        d["last_message_at"],
+                        d["last_voice_at"],
+                        d["level"],
+                    )
+                    for (gid, uid), d in deltas.items()
+                ]
+                channel_rows = [(gid, uid, cid, count) for (gid, uid, cid), count in channel_deltas.items()]
+                try:
+                    await self.db.apply_user_stats_deltas(stats_rows, channel_rows)
+                except Exception:
+                    self._restore(deltas, channel_deltas)
+                    raise
+            self._trim()
+
+    def _restore(self, deltas: dict, channel_deltas: dict):
+        for key, old in deltas.items():
+            delta = self._delta(key)
+            for field in ("message_count", "voice_seconds", "welcome_count", "xp"):
+                delta[field] += old[field]
+            if delta["level"] is None:
+                delta["level"] = old["level"]
+            delta["last_message_at"] = delta["last_message_at"] or old["last_message_at"]
+            delta["last_voice_at"] = delta["last_voice_at"] or old["last_voice_at"]
+        for key, count in channel_deltas.items():
+            self._channel_deltas[key] = self._channel_deltas.get(key, 0) + count
+
+    def _trim(self):
+        excess = len(self._stats) - self._max_cached
+        if excess <= 0:
+            return
+        for key in list(self._stats.keys()):
+            if excess <= 0:
+                break
+            if key in self._deltas:
+                continue
+            self._stats.pop(key, None)
+            excess -= 1
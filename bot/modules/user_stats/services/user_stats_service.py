@@ -1,9 +1,47 @@
 import re
 import json
 import math
+import asyncio
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import discord
+from bot.core.rows import UserStats
 from bot.utils.emojis import em
+from bot.modules.user_stats.services.stats_buffer import UserStatsBuffer
+
+
+_LEVEL_TABLE_SIZE = 201
+_UNLOCKED_CACHE_SIZE = 20000
+_MEMBER_UPDATE_DEBOUNCE_SECONDS = 2.0
+_DEFAULT_WELCOME_PATTERNS = [
+    "welcome",
+    "willkommen",
+    "herzlich willkommen",
+    "wb",
+    "wilkommen",
+]
+
+
+@dataclass
+class UserStatsGuildConfig:
+    version: tuple
+    welcome_re: re.Pattern
+    vanity_needles: list[str] = field(default_factory=list)
+    role_rules: list[dict] = field(default_factory=list)
+    rules: list[tuple[int, str, int, str]] = field(default_factory=list)
+    uses_status: bool = False
+    level_roles: dict[int, int] = field(default_factory=dict)
+    achievements: list[dict] = field(default_factory=list)
+    achievements_by_type: dict[str, list[tuple[int, str, dict]]] = field(default_factory=dict)
+
+
+@dataclass
+class UnlockedAchievements:
+    codes: set[str]
+    version: tuple | None = None
+    next: dict[str, int] = field(default_factory=dict)
 
 
 class UserStatsService:
@@ -12,16 +50,84 @@ class UserStatsService:
         self.settings = settings
         self.db = db
         self.logger = logger
-        self._welcome_re = self._build_welcome_regex()
-
-    def _build_welcome_regex(self):
-        patterns = self.settings.get("user_stats.welcome_patterns", None) or [
-            "welcome",
-            "willkommen",
-            "herzlich willkommen",
-            "wb",
-            "wilkommen",
-        ]
+        self._guild_configs: dict[int, UserStatsGuildConfig] = {}
+        self._unlocked: OrderedDict[tuple[int, int], UnlockedAchievements] = OrderedDict()
+        self.stats_buffer = UserStatsBuffer(db)
+        self._level_table_curve = None
+        self._level_table = [0]
+        self._pending_members: dict[tuple[int, int], discord.Member] = {}
+        self._member_tasks: dict[tuple[int, int], asyncio.Task] = {}
+        settings.subscribe(self._on_settings_changed)
+
+    def _on_settings_changed(self, change):
+        if not (change.affects("user_stats") or change.affects("achievements")):
+            return
+        if change.guild_id is None:
+            self._guild_configs.clear()
+            if change.affects("user_stats.level_curve"):
+                self._level_table_curve = None
+        else:
+            self._guild_configs.pop(int(change.guild_id), None)
+
+    async def flush(self):
+        await self.stats_buffer.flush()
+
+    async def close(self):
+        tasks = list(self._member_tasks.values())
+        self._member_tasks.clear()
+        self._pending_members.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _guild_config(self, guild_id: int) -> UserStatsGuildConfig:
+        gid = int(guild_id)
+        cfg = self._guild_configs.get(gid)
+        if cfg is None:
+            cfg = self._compile_guild_config(gid, self.settings.guild_version(gid))
+            self._guild_configs[gid] = cfg
+        return cfg
+
+    def _compile_guild_config(self, guild_id: int, version: tuple) -> UserStatsGuildConfig:
+        needles = self.settings.get_guild(guild_id, "user_stats.vanity_status_contains", []) or []
+        role_rules = self.settings.get_guild(guild_id, "user_stats.roles", []) or []
+        rules = []
+        for rule in role_rules:
+            role_id = int(rule.get("role_id", 0) or 0)
+            if not role_id:
+                continue
+            rules.append((
+                role_id,
+                str(rule.get("type", "") or "").strip(),
+                int(rule.get("threshold", 0) or 0),
+                str(rule.get("contains", "") or "").lower().strip(),
+            ))
+        achievements = self.settings.get_guild(guild_id, "achievements.items", []) or []
+        by_type = {}
+        for item in achievements:
+            code = str(item.get("code", "") or "").strip()
+            if not code:
+                continue
+            a_type = str(item.get("type", "") or "").strip()
+            threshold = int(item.get("threshold", 0) or 0)
+            by_type.setdefault(a_type, []).append((threshold, code, item))
+        for entries in by_type.values():
+            entries.sort(key=lambda e: e[0])
+        return UserStatsGuildConfig(
+            version=version,
+            welcome_re=self._build_welcome_regex(guild_id),
+            vanity_needles=[str(n).lower() for n in needles if str(n).strip()],
+            role_rules=role_rules,
+            rules=rules,
+            uses_status=any(r[1] == "vanity_status" for r in rules),
+            level_roles=self._parse_level_roles(self.settings.get_guild(guild_id, "user_stats.level_roles", {})),
+            achievements=achievements,
+            achievements_by_type=by_type,
+        )
+
+    def _build_welcome_regex(self, guild_id: int):
+        patterns = self.settings.get_guild(guild_id, "user_stats.welcome_patterns", None) or _DEFAULT_WELCOME_PATTERNS
         escaped = [re.escape(str(p).strip()) for p in patterns if str(p).strip()]
         if not escaped:
             escaped = [re.escape("welcome")]
@@ -54,21 +160,37 @@ class UserStatsService:
         mult = self._quick_multiplier() if level <= self._quick_levels() else 1.0
         return max(1, int(base * (level ** exponent) * mult))
 
+    def _cumulative_xp_table(self) -> list[int]:
+        if self._level_table_curve is not None:
+            return self._level_table
+        curve = (self._level_base(), self._level_exponent(), self._quick_levels(), self._quick_multiplier())
+        base, exponent, quick_levels, quick_multiplier = curve
+        table = [0]
+        total = 0
+        for lvl in range(1, _LEVEL_TABLE_SIZE + 1):
+            mult = quick_multiplier if lvl <= quick_levels else 1.0
+            total += max(1, int(base * (lvl ** exponent) * mult))
+            table.append(total)
+        self._level_table_curve = curve
+        self._level_table = table
+        return table
+
     def _total_xp_for_level(self, level: int) -> int:
         if level <= 0:
             return 0
-        total = 0
-        for lvl in range(1, level + 1):
+        table = self._cumulative_xp_table()
+        if level < len(table):
+            return table[level]
+        total = table[-1]
+        for lvl in range(len(table), level + 1):
             total += self._xp_for_level(lvl)
         return total
 
     def _level_for_xp(self, xp: int, max_level: int = 200) -> int:
         xp = int(xp or 0)
-        level = 0
-        while level < max_level:
-            need = self._total_xp_for_level(level + 1)
-            if xp < need:
-                break
+        table = self._cumulative_xp_table()
+        level = min(max_level, max(0, bisect_right(table, xp) - 1))
+        while len(table) - 1 <= level < max_level and xp >= self._total_xp_for_level(level + 1):
             level += 1
         return level
 
@@ -79,15 +201,17 @@ class UserStatsService:
         return level, current_total, next_total
 
     def _vanity_match(self, member: discord.Member) -> bool:
-        needles = self.settings.get_guild(member.guild.id, "user_stats.vanity_status_contains", []) or []
-        needles = [str(n).lower() for n in needles if str(n).strip()]
-        return self._status_contains(member, needles)
+        return self._status_contains(member, self._guild_config(member.guild.id).vanity_needles)
 
     def _role_rules(self, guild_id: int):
-        return self.settings.get_guild(int(guild_id), "user_stats.roles", []) or []
+        return self._guild_config(guild_id).role_rules
 
     def _level_roles(self, guild_id: int | None = None):
-        raw = self.settings.get_guild(int(guild_id), "user_stats.level_roles", {}) if guild_id else self.settings.get("user_stats.level_roles", {})
+        if guild_id:
+            return self._guild_config(guild_id).level_roles
+        return self._parse_level_roles(self.settings.get("user_stats.level_roles", {}))
+
+    def _parse_level_roles(self, raw) -> dict[int, int]:
         raw = raw or {}
         out = {}
         for k, v in raw.items():
@@ -111,30 +235,34 @@ class UserStatsService:
         new_birthday = 0
         if not guild:
             return {"scanned": 0, "achievements_new": 0, "birthday_new": 0}
-        for member in guild.members:
-            if member.bot:
-                continue
+        await self.stats_buffer.flush()
+        members = [m for m in guild.members if not m.bot]
+        user_ids = [m.id for m in members]
+        await self.db.upsert_user_stats_many(guild.id, user_ids)
+        stats_by_user = await self.stats_buffer.get_many(guild.id, user_ids)
+        before = await self.db.list_achievement_codes_many(guild.id, user_ids)
+        birthday_users = set()
+        if birthday_service:
+            birthday_users = await self.db.list_birthday_global_user_ids(user_ids)
+        for member in members:
             scanned += 1
-            await self.db.upsert_user_stats(guild.id, member.id)
-            row = await self.db.get_user_stats(guild.id, member.id)
-            if not row:
+            stats = stats_by_user.get(member.id)
+            if not stats:
                 continue
-            stats = self._row_to_stats(row)
             await self._sync_level(member, stats, announce=False)
             await self._evaluate_rules(member, stats)
-            before_rows = await self.db.list_achievements(guild.id, member.id)
-            before = {r[0] for r in before_rows}
+            self._seed_unlocked(guild.id, member.id, before.get(member.id, set()))
             await self._check_achievements(member, stats)
-            if birthday_service:
+            if member.id in birthday_users:
                 try:
                     added = await birthday_service.ensure_birthday_achievement(member)
                     if added:
                         new_birthday += 1
                 except Exception:
                     pass
-            after_rows = await self.db.list_achievements(guild.id, member.id)
-            after = {r[0] for r in after_rows}
-            new_achievements += len(after - before)
+        after = await self.db.list_achievement_codes_many(guild.id, user_ids)
+        for uid, codes in after.items():
+            new_achievements += len(codes - before.get(uid, set()))
         return {"scanned": scanned, "achievements_new": new_achievements, "birthday_new": new_birthday}
 
     async def _ensure_level_roles(self, guild: discord.Guild):
@@ -275,30 +403,24 @@ class UserStatsService:
             except Exception:
                 pass
 
-    async def _evaluate_rules(self, member: discord.Member, stats: dict):
+    async def _evaluate_rules(self, member: discord.Member, stats: UserStats):
         days_on_server = 0
         if member.joined_at:
             days_on_server = int((datetime.now(timezone.utc) - member.joined_at).total_seconds() // 86400)
-        vanity_match = self._vanity_match(member)
-
-        for rule in self._role_rules(member.guild.id):
-            role_id = int(rule.get("role_id", 0) or 0)
-            if not role_id:
-                continue
-            rule_type = str(rule.get("type", "") or "").strip()
-            threshold = int(rule.get("threshold", 0) or 0)
+        cfg = self._guild_config(member.guild.id)
+        vanity_match = self._status_contains(member, cfg.vanity_needles)
 
+        for role_id, rule_type, threshold, contains in cfg.rules:
             ok = False
             if rule_type == "days_on_server":
                 ok = days_on_server >= threshold
             elif rule_type == "messages":
-                ok = int(stats.get("message_count", 0)) >= threshold
+                ok = int(stats.message_count) >= threshold
             elif rule_type == "welcomes":
-                ok = int(stats.get("welcome_count", 0)) >= threshold
+                ok = int(stats.welcome_count) >= threshold
             elif rule_type == "voice_hours":
-                ok = int(stats.get("voice_seconds", 0)) >= (threshold * 3600)
+                ok = int(stats.voice_seconds) >= (threshold * 3600)
             elif rule_type == "vanity_status":
-                contains = str(rule.get("contains", "") or "").lower().strip()
                 if contains:
                     ok = self._status_contains(member, [contains])
                 else:
@@ -306,8 +428,8 @@ class UserStatsService:
 
             await self._apply_role(member, role_id, ok)
 
-        level_roles = self._level_roles(member.guild.id)
-        user_level = int(stats.get("level", 0))
+        level_roles = cfg.level_roles
+        user_level = int(stats.level)
         eligible_levels = sorted([int(lvl) for lvl in level_roles.keys() if int(lvl) <= user_level])
         target_level = eligible_levels[-1] if eligible_levels else None
         target_role_id = int(level_roles.get(target_level)) if target_level is not None else 0
@@ -407,37 +529,74 @@ class UserStatsService:
         author = message.author
         if not isinstance(author, discord.Member):
             return
-        self._welcome_re = self._build_welcome_regex()
-        await self.db.increment_message(guild_id, author.id, message.channel.id, self._xp_per_message())
-        if self._welcome_re.search(message.content or ""):
-            await self.db.increment_welcome(guild_id, author.id)
-        stats_row = await self.db.get_user_stats(guild_id, author.id)
-        if not stats_row:
-            return
-        stats = self._row_to_stats(stats_row)
+        welcome = bool(self._guild_config(guild_id).welcome_re.search(message.content or ""))
+        stats = await self.stats_buffer.add_message(
+            guild_id,
+            author.id,
+            message.channel.id,
+            self._xp_per_message(),
+            welcome,
+            datetime.now(timezone.utc).isoformat(),
+        )
         await self._sync_level(author, stats)
         await self._evaluate_rules(author, stats)
         await self._check_achievements(author, stats)
 
     async def on_presence_update(self, before: discord.Member, after: discord.Member):
+        await self._on_member_changed(before, after)
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        await self._on_member_changed(before, after)
+
+    def _member_projection(self, member: discord.Member, cfg: UserStatsGuildConfig) -> tuple:
+        texts = tuple(t.lower() for t in self._current_status_texts(member)) if cfg.uses_status else ()
+        return (
+            texts,
+            bool(getattr(member, "premium_since", None)),
+            frozenset(r.id for r in getattr(member, "roles", []) or []),
+        )
+
+    async def _on_member_changed(self, before: discord.Member, after: discord.Member):
         if not after.guild:
             return
-        row = await self.db.get_user_stats(after.guild.id, after.id)
-        if not row:
+        cfg = self._guild_config(after.guild.id)
+        if before is not None and self._member_projection(before, cfg) == self._member_projection(after, cfg):
             return
-        stats = self._row_to_stats(row)
-        await self._evaluate_rules(after, stats)
-        await self._check_achievements(after, stats)
+        key = (after.guild.id, after.id)
+        self._pending_members[key] = after
+        if key in self._member_tasks:
+            return
+        delay = float(self.settings.get("user_stats.member_update_debounce_seconds", _MEMBER_UPDATE_DEBOUNCE_SECONDS) or 0)
+        if delay <= 0:
+            self._pending_members.pop(key, None)
+            await self._refresh_member(after)
+            return
+        self._member_tasks[key] = asyncio.create_task(self._refresh_member_later(key, delay))
 
-    async def on_member_update(self, before: discord.Member, after: discord.Member):
-        if not after.guild:
+    async def _refresh_member_later(self, key: tuple[int, int], delay: float):
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._member_tasks.pop(key, None)
+            member = self._pending_members.pop(key, None)
+        if member is None:
             return
-        row = await self.db.get_user_stats(after.guild.id, after.id)
-        if not row:
+        try:
+            await self._refresh_member(member)
+        except Exception as e:
+            emit = getattr(self.bot, "_emit_bot_error", None)
+            if emit:
+                try:
+                    await emit("user_stats_member_update", e, extra=None, guild=member.guild)
+                except Exception:
+                    pass
+
+    async def _refresh_member(self, member: discord.Member):
+        stats = await self.stats_buffer.get(member.guild.id, member.id)
+        if not stats:
             return
-        stats = self._row_to_stats(row)
-        await self._evaluate_rules(after, stats)
-        await self._check_achievements(after, stats)
+        await self._evaluate_rules(member, stats)
+        await self._check_achievements(member, stats)
 
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
         if not member.guild or member.bot:
@@ -465,80 +624,104 @@ class UserStatsService:
         except Exception:
             joined = None
         if joined:
-            seconds = int((datetime.now(timezone.utc) - joined).total_seconds())
+            now = datetime.now(timezone.utc)
+            seconds = int((now - joined).total_seconds())
             if seconds > 0:
                 minutes = max(1, seconds // 60)
                 xp = minutes * self._xp_per_voice_minute()
-                await self.db.add_voice_seconds(guild_id, member.id, seconds, xp)
+                await self.stats_buffer.add_voice(guild_id, member.id, seconds, xp, now.isoformat())
         await self.db.clear_voice_session(guild_id, member.id)
-        stats_row = await self.db.get_user_stats(guild_id, member.id)
-        if stats_row:
-            stats = self._row_to_stats(stats_row)
+        stats = await self.stats_buffer.get(guild_id, member.id)
+        if stats:
             await self._sync_level(member, stats)
             await self._evaluate_rules(member, stats)
             await self._check_achievements(member, stats)
 
-    async def _sync_level(self, member: discord.Member, stats: dict, announce: bool = True):
-        xp = int(stats.get("xp", 0))
-        current_level = int(stats.get("level", 0))
+    async def _sync_level(self, member: discord.Member, stats: UserStats, announce: bool = True):
+        xp = int(stats.xp)
+        current_level = int(stats.level)
         new_level = self._level_for_xp(xp)
         if new_level > current_level:
-            await self.db.set_user_level(member.guild.id, member.id, new_level)
-            stats["level"] = new_level
+            await self.stats_buffer.set_level(member.guild.id, member.id, new_level)
+            stats.level = new_level
             if announce:
                 await self._post_levelup(member, new_level, xp)
 
-    def _row_to_stats(self, row):
-        return {
-            "guild_id": int(row[0]),
-            "user_id": int(row[1]),
-            "message_count": int(row[2]),
-            "voice_seconds": int(row[3]),
-            "welcome_count": int(row[4]),
-            "xp": int(row[5]),
-            "level": int(row[6]),
-            "last_message_at": row[7],
-            "last_voice_at": row[8],
-            "invite_count": int(row[9]) if len(row) > 9 else 0,
-            "invite_left_count": int(row[10]) if len(row) > 10 else 0,
-        }
-
-    async def _check_achievements(self, member: discord.Member, stats: dict):
-        items = self.settings.get_guild(member.guild.id, "achievements.items", []) or []
-        if not items:
+    async def _unlocked_achievements(self, guild_id: int, user_id: int, cfg: UserStatsGuildConfig) -> UnlockedAchievements:
+        key = (int(guild_id), int(user_id))
+        cached = self._unlocked.get(key)
+        if cached is None:
+            rows = await self.db.list_achievements(key[0], key[1])
+            cached = self._unlocked.get(key)
+            if cached is None:
+                cached = UnlockedAchievements(codes={str(r[0]) for r in rows})
+                self._unlocked[key] = cached
+                while len(self._unlocked) > _UNLOCKED_CACHE_SIZE:
+                    self._unlocked.popitem(last=False)
+        self._unlocked.move_to_end(key)
+        if cached.version != cfg.version:
+            cached.version = cfg.version
+            cached.next = {
+                a_type: self._next_pending(entries, cached.codes, 0)
+                for a_type, entries in cfg.achievements_by_type.items()
+            }
+        return cached
+
+    def _seed_unlocked(self, guild_id: int, user_id: int, codes: set):
+        key = (int(guild_id), int(user_id))
+        if key in self._unlocked:
             return
-        rows = await self.db.list_achievements(member.guild.id, member.id)
-        existing = {r[0] for r in rows}
-        msg_count = int(stats.get("message_count", 0))
-        welcome_count = int(stats.get("welcome_count", 0))
-        voice_hours = int(stats.get("voice_seconds", 0)) // 3600
-        level = int(stats.get("level", 0))
-        days_on_server = 0
-        if member.joined_at:
-            days_on_server = int((datetime.now(timezone.utc) - member.joined_at).total_seconds() // 86400)
-        is_booster = bool(member.premium_since)
-
-        for item in items:
-            code = str(item.get("code", "") or "").strip()
-            if not code or code in existing:
+        self._unlocked[key] = UnlockedAchievements(codes=set(codes))
+        while len(self._unlocked) > _UNLOCKED_CACHE_SIZE:
+            self._unlocked.popitem(last=False)
+
+    def _next_pending(self, entries: list, codes: set, start: int) -> int:
+        idx = start
+        while idx < len(entries) and entries[idx][1] in codes:
+            idx += 1
+        return idx
+
+    async def _check_achievements(self, member: discord.Member, stats: UserStats):
+        cfg = self._guild_config(member.guild.id)
+        if not cfg.achievements_by_type:
+            return
+        unlocked = await self._unlocked_achievements(member.guild.id, member.id, cfg)
+        for a_type, entries in cfg.achievements_by_type.items():
+            idx = unlocked.next.get(a_type, 0)
+            if idx >= len(entries):
                 continue
-            a_type = str(item.get("type", "") or "").strip()
-            threshold = int(item.get("threshold", 0) or 0)
-            if a_type == "messages" and msg_count >= threshold:
-                await self._unlock_achievement(member, code, item)
-            elif a_type == "welcomes" and welcome_count >= threshold:
-                await self._unlock_achievement(member, code, item)
-            elif a_type == "voice_hours" and voice_hours >= threshold:
-                await self._unlock_achievement(member, code, item)
-            elif a_type == "level" and level >= threshold:
-                await self._unlock_achievement(member, code, item)
-            elif a_type == "days_on_server" and days_on_server >= threshold:
-                await self._unlock_achievement(member, code, item)
-            elif a_type == "booster" and is_booster:
-                await self._unlock_achievement(member, code, item)
+            current = self._achievement_progress(member, stats, a_type)
+            if current is None or current < entries[idx][0]:
+                continue
+            while idx < len(entries) and current >= entries[idx][0]:
+                _, code, item = entries[idx]
+                if code not in unlocked.codes:
+                    await self._unlock_achievement(member, code, item)
+                idx += 1
+            unlocked.next[a_type] = self._next_pending(entries, unlocked.codes, idx)
+
+    def _achievement_progress(self, member: discord.Member, stats: UserStats, a_type: str):
+        if a_type == "messages":
+            return int(stats.message_count)
+        if a_type == "welcomes":
+            return int(stats.welcome_count)
+        if a_type == "voice_hours":
+            return int(stats.voice_seconds) // 3600
+        if a_type == "level":
+            return int(stats.level)
+        if a_type == "days_on_server":
+            if not member.joined_at:
+                return 0
+            return int((datetime.now(timezone.utc) - member.joined_at).total_seconds() // 86400)
+        if a_type == "booster":
+            return math.inf if member.premium_since else None
+        return None
 
     async def _unlock_achievement(self, member: discord.Member, code: str, item: dict):
         await self.db.add_achievement(member.guild.id, member.id, code)
+        cached = self._unlocked.get((int(member.guild.id), int(member.id)))
+        if cached is not None:
+            cached.codes.add(str(code))
         role_id = int(item.get("role_id", 0) or 0)
         if role_id:
             role = member.guild.get_role(role_id)
@@ -571,13 +754,13 @@ class UserStatsService:
         return emb
 
     async def build_me_embed(self, member: discord.Member):
+        await self.stats_buffer.flush()
         await self.db.upsert_user_stats(member.guild.id, member.id)
-        row = await self.db.get_user_stats(member.guild.id, member.id)
-        stats = self._row_to_stats(row) if row else {}
+        stats = await self.db.get_user_stats(member.guild.id, member.id) or UserStats(member.guild.id, member.id)
         total_users = await self.db.count_users_in_stats(member.guild.id)
         total_users = max(1, total_users)
-        top_msg = await self.db.count_users_with_messages_at_least(member.guild.id, int(stats.get("message_count", 0)))
-        top_voice = await self.db.count_users_with_voice_at_least(member.guild.id, int(stats.get("voice_seconds", 0)))
+        top_msg = await self.db.count_users_with_messages_at_least(member.guild.id, int(stats.message_count))
+        top_voice = await self.db.count_users_with_voice_at_least(member.guild.id, int(stats.voice_seconds))
         msg_top_pct = int((top_msg / total_users) * 100)
         voice_top_pct = int((top_voice / total_users) * 100)
 
@@ -589,15 +772,15 @@ class UserStatsService:
             top_channel = ch.mention if ch else f"`{ch_id}`"
 
         tickets = await self.db.get_ticket_count(member.id)
-        voice_hours = int(stats.get("voice_seconds", 0)) // 3600
-        voice_days = round(int(stats.get("voice_seconds", 0)) / 86400, 2)
-        msg_count = int(stats.get("message_count", 0))
-        welcome_count = int(stats.get("welcome_count", 0))
-        invite_count = int(stats.get("invite_count", 0))
-        invite_left_count = int(stats.get("invite_left_count", 0))
+        voice_hours = int(stats.voice_seconds) // 3600
+        voice_days = round(int(stats.voice_seconds) / 86400, 2)
+        msg_count = int(stats.message_count)
+        welcome_count = int(stats.welcome_count)
+        invite_count = int(stats.invite_count)
+        invite_left_count = int(stats.invite_left_count)
         invite_net = max(0, invite_count - invite_left_count)
-        level = int(stats.get("level", 0))
-        xp = int(stats.get("xp", 0))
+        level = int(stats.level)
+        xp = int(stats.xp)
         _, current_total, next_total = self._level_progress(xp)
         pct = 0
         if next_total > current_total:
@@ -605,7 +788,7 @@ class UserStatsService:
 
         ach_rows = await self.db.list_achievements(member.guild.id, member.id)
         achieved = len(ach_rows)
-        total_achievements = len(self.settings.get_guild(member.guild.id, "achievements.items", []) or [])
+        total_achievements = len(self._guild_config(member.guild.id).achievements)
 
         role_lines = []
         total_members = max(1, member.guild.member_count or 1)
@@ -642,7 +825,7 @@ class UserStatsService:
         return embed
 
     async def build_achievements_embed(self, member: discord.Member, page: int = 1, per_page: int = 8):
-        items = self.settings.get_guild(member.guild.id, "achievements.items", []) or []
+        items = self._guild_config(member.guild.id).achievements
         total = len(items)
         total_pages = max(1, (total + per_page - 1) // per_page)
         page = max(1, min(page, total_pages))
@@ -650,9 +833,9 @@ class UserStatsService:
         end = start + per_page
         items_page = items[start:end]
 
+        await self.stats_buffer.flush()
         await self.db.upsert_user_stats(member.guild.id, member.id)
-        row = await self.db.get_user_stats(member.guild.id, member.id)
-        stats = self._row_to_stats(row) if row else {}
+        stats = await self.db.get_user_stats(member.guild.id, member.id) or UserStats(member.guild.id, member.id)
         rows = await self.db.list_achievements(member.guild.id, member.id)
         unlocked = {r[0] for r in rows}
 
@@ -660,10 +843,10 @@ class UserStatsService:
         if member.joined_at:
             days_on_server = int((datetime.now(timezone.utc) - member.joined_at).total_seconds() // 86400)
 
-        msg_count = int(stats.get("message_count", 0))
-        welcome_count = int(stats.get("welcome_count", 0))
-        voice_hours = int(stats.get("voice_seconds", 0)) // 3600
-        level = int(stats.get("level", 0))
+        msg_count = int(stats.message_count)
+        welcome_count = int(stats.welcome_count)
+        voice_hours = int(stats.voice_seconds) // 3600
+        level = int(stats.level)
         is_booster = bool(member.premium_since)
         has_birthday = False
         try:
@@ -760,16 +943,10 @@ class UserStatsService:
             return 0xB16B91
 
     async def seed_voice_sessions(self, guild: discord.Guild):
-        for member in guild.members:
-            if member.bot:
-                continue
-            if not member.voice or not member.voice.channel:
-                continue
-            existing = await self.db.get_voice_session(guild.id, member.id)
-            if not existing:
-                await self.db.set_voice_session(
-                    guild.id,
-                    member.id,
-                    member.voice.channel.id,
-                    datetime.now(timezone.utc).isoformat(),
-                )
+        now_iso = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (member.id, member.voice.channel.id, now_iso)
+            for member in guild.members
+            if not member.bot and member.voice and member.voice.channel
+        ]
+        await self.db.add_voice_sessions(guild.id, rows)
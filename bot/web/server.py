@@ -1,5 +1,6 @@
 import os
 import json
+import html
 import asyncio
 import time
 import secrets
@@ -12,6 +13,7 @@ from fastapi.responses import FileResponse, JSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 
+from bot.core.db import SNIPPET_OPEN, SNIPPET_CLOSE
 from bot.modules.tickets.services.ticket_service import TicketService
 from bot.modules.moderation.services.mod_service import ModerationService
 
@@ -21,7 +23,7 @@ class WebServer:
         self.settings = settings
         self.db = db
         self.bot = bot
-        self.ticket_service = TicketService(bot, settings, db, getattr(bot, "logger", None))
+        self.ticket_service = getattr(bot, "ticket_service", None) or TicketService(bot, settings, db, getattr(bot, "logger", None))
         self.moderation_service = ModerationService(bot, settings, db, getattr(bot, "forum_logs", None))
         self.app = FastAPI()
         self._server = None
@@ -105,12 +107,14 @@ class WebServer:
             polls = await self.db.count_polls()
             applications = await self.db.count_applications()
             birthdays = await self.db.count_birthdays_global()
+            storage = await self.db.storage_stats()
             return JSONResponse({
                 "tickets": tickets,
                 "giveaways": giveaways,
                 "polls": polls,
                 "applications": applications,
                 "birthdays": birthdays,
+                "storage": storage,
             })
 
         @self.app.get("/api/guilds/{guild_id}/summary")
@@ -164,6 +168,29 @@ class WebServer:
                 })
             return JSONResponse(out)
 
+        @self.app.get("/api/guilds/{guild_id}/tickets/search")
+        async def search_tickets(request: Request, guild_id: int, q: str = "", cursor: str | None = None,
+                                 limit: int = 25, ticket_id: int | None = None):
+            await self._require_guild_access(request, guild_id)
+            hits, next_cursor = await self.ticket_service.search_messages(
+                int(guild_id), q, cursor=cursor, limit=limit, ticket_id=ticket_id
+            )
+            out = []
+            for h in hits:
+                out.append({
+                    "message_id": h.message_id,
+                    "ticket_id": h.ticket_id,
+                    "thread_id": h.thread_id,
+                    "ticket_status": h.ticket_status,
+                    "author_id": h.author_id,
+                    "author_name": h.author_name,
+                    "direction": h.direction,
+                    "created_at": h.created_at,
+                    "snippet": html.escape(h.snippet or "").replace(SNIPPET_OPEN, "<mark>").replace(SNIPPET_CLOSE, "</mark>"),
+                    "rank": h.rank,
+                })
+            return JSONResponse({"results": out, "next_cursor": next_cursor})
+
         @self.app.get("/api/logs")
         async def list_logs(request: Request, limit: int = 200):
             await self._require_session(request)
@@ -0,0 +1,39 @@
+import asyncio
+import sqlite3
+
+from bot.core.db import Database
+
+
+def test_auto_vacuum_conversion_is_deferred_to_maintenance(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE filler (id INTEGER PRIMARY KEY, blob TEXT);")
+    con.executemany("INSERT INTO filler (blob) VALUES (?);", [("x" * 1000,) for _ in range(200)])
+    con.commit()
+    con.close()
+
+    async def run():
+        db = Database(path)
+        await db.init()
+        try:
+            after_init = await db._pragma_int("auto_vacuum")
+            converted = await db.enable_incremental_vacuum()
+            after_maintenance = await db._pragma_int("auto_vacuum")
+            again = await db.enable_incremental_vacuum()
+            return after_init, converted, after_maintenance, again
+        finally:
+            await db.close()
+
+    assert asyncio.run(run()) == (0, True, 2, False)
+
+
+def test_new_database_starts_with_incremental_vacuum(tmp_path):
+    async def run():
+        db = Database(str(tmp_path / "fresh.db"))
+        await db.init()
+        try:
+            return await db._pragma_int("auto_vacuum"), await db.enable_incremental_vacuum()
+        finally:
+            await db.close()
+
+    assert asyncio.run(run()) == (2, False)
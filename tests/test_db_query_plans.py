@@ -0,0 +1,61 @@
+import asyncio
+import inspect
+import sqlite3
+
+from bot.core import db as db_module
+from bot.core.db import Database, HOT_QUERIES
+
+
+def _seed(conn):
+    now = "2026-01-01T00:00:00+00:00"
+    for i in range(1, 201):
+        conn.execute(
+            "INSERT INTO tickets (guild_id, user_id, forum_channel_id, thread_id, summary_message_id, "
+            "category_key, status, created_at) VALUES (?, ?, 1, ?, 0, 'allgemeine_frage', ?, ?);",
+            (i % 3, i, 10_000 + i, "closed" if i % 10 else "open", now),
+        )
+        conn.execute("INSERT INTO ticket_participants (ticket_id, user_id, added_at) VALUES (?, ?, ?);", (i, i + 1, now))
+        conn.execute(
+            "INSERT INTO user_stats (guild_id, user_id, message_count, voice_seconds, welcome_count, xp, level) "
+            "VALUES (?, ?, ?, ?, 0, 0, 0);",
+            (i % 3, i, i * 10, i * 60),
+        )
+        conn.execute(
+            "INSERT INTO achievements (guild_id, user_id, code, unlocked_at) VALUES (?, ?, ?, ?);",
+            (i % 3, i, f"msg_{i % 4}", now),
+        )
+
+
+def test_hot_queries_are_the_methods_sql():
+    for name, query in HOT_QUERIES:
+        method = getattr(Database, name)
+        constant = next(k for k, v in vars(db_module).items() if k.startswith("_SQL_") and v is query)
+        assert constant in inspect.getsource(method), name
+
+
+def test_hot_queries_use_indexes(tmp_path):
+    path = str(tmp_path / "plans.db")
+
+    async def init():
+        db = Database(path)
+        await db.init()
+        await db.close()
+
+    async def check():
+        db = Database(path)
+        await db.init()
+        try:
+            return await db.check_query_plans()
+        finally:
+            await db.close()
+
+    asyncio.run(init())
+    conn = sqlite3.connect(path)
+    try:
+        _seed(conn)
+        conn.commit()
+        conn.execute("ANALYZE;")
+        conn.commit()
+    finally:
+        conn.close()
+    assert asyncio.run(check()) == []
@@ -0,0 +1,169 @@
+import asyncio
+import random
+from copy import deepcopy
+
+import yaml
+
+from bot.core.settings import SettingsManager
+
+_KEYS = ("a", "b", "c", "d")
+_BASE = {
+    "a": {"b": {"c": 1, "d": 2}, "c": "x"},
+    "b": {"a": [1, 2], "d": {"a": 3}},
+    "c": 4,
+}
+
+
+class _FakeDb:
+    async def set_guild_config(self, guild_id, key, value_json):
+        pass
+
+    async def replace_guild_configs(self, guild_id, rows):
+        pass
+
+
+def _set_path(root: dict, dotted: str, value):
+    parts = dotted.split(".")
+    node = root
+    for p in parts[:-1]:
+        if not isinstance(node.get(p), dict):
+            node[p] = {}
+        node = node[p]
+    node[parts[-1]] = value
+
+
+def _merge(base: dict, override: dict) -> dict:
+    for k, v in override.items():
+        if isinstance(base.get(k), dict) and isinstance(v, dict):
+            base[k] = _merge(base[k], v)
+        else:
+            base[k] = v
+    return base
+
+
+def _lookup(root: dict, dotted: str, default=None):
+    node = root
+    for part in dotted.split("."):
+        if not isinstance(node, dict) or part not in node:
+            return default
+        node = node[part]
+    return node
+
+
+def _random_path(rng: random.Random) -> str:
+    return ".".join(rng.choice(_KEYS) for _ in range(rng.randint(1, 3)))
+
+
+def _random_value(rng: random.Random):
+    roll = rng.random()
+    if roll < 0.5:
+        return rng.randint(0, 9)
+    if roll < 0.8:
+        return {rng.choice(_KEYS): rng.randint(0, 9)}
+    return str(rng.randint(0, 9))
+
+
+def _make_settings(tmp_path) -> SettingsManager:
+    config_path = tmp_path / "config.yml"
+    config_path.write_text(yaml.safe_dump(_BASE), encoding="utf-8")
+    settings = SettingsManager(config_path=str(config_path), override_path=str(tmp_path / "settings.json"))
+    asyncio.run(settings.load())
+    return settings
+
+
+def test_guild_reads_match_full_remerge(tmp_path):
+    settings = _make_settings(tmp_path)
+    db = _FakeDb()
+    rng = random.Random(1234)
+    guild_id = 42
+    overrides = {}
+    mismatches = []
+
+    async def run():
+        for step in range(2000):
+            roll = rng.random()
+            if roll < 0.3:
+                path, value = _random_path(rng), _random_value(rng)
+                await settings.set_guild_override(db, guild_id, path, deepcopy(value))
+                _set_path(overrides, path, deepcopy(value))
+            elif roll < 0.32:
+                data = {rng.choice(_KEYS): _random_value(rng)}
+                await settings.replace_guild_overrides(db, guild_id, deepcopy(data))
+                overrides.clear()
+                overrides.update(deepcopy(data))
+            else:
+                path = _random_path(rng)
+                expected_root = _merge(deepcopy(_BASE), deepcopy(overrides))
+                expected = _lookup(expected_root, path, "default")
+                actual = settings.get_guild(guild_id, path, "default")
+                if actual != expected:
+                    mismatches.append((step, path, actual, expected))
+                expected_int = expected if isinstance(expected, int) else -1
+                if isinstance(expected, str) and expected.isdigit():
+                    expected_int = int(expected)
+                actual_int = settings.get_guild_int(guild_id, path, -1)
+                if actual_int != expected_int:
+                    mismatches.append((step, path, actual_int, expected_int))
+
+    asyncio.run(run())
+    assert mismatches == []
+
+
+def test_scalar_parent_rewrite_invalidates_siblings(tmp_path):
+    settings = _make_settings(tmp_path)
+    db = _FakeDb()
+
+    async def run():
+        await settings.set_guild_override(db, 1, "a.b", 1)
+        assert settings.get_guild(1, "a.b.d", "default") == "default"
+        await settings.set_guild_override(db, 1, "a.b.c", 2)
+
+    asyncio.run(run())
+    assert settings.get_guild(1, "a.b.c") == 2
+    assert settings.get_guild(1, "a.b.d") == 2
+
+
+def test_failed_replace_reloads_guild_overrides_from_db(tmp_path):
+    settings = _make_settings(tmp_path)
+
+    class _FailingDb(_FakeDb):
+        async def replace_guild_configs(self, guild_id, rows):
+            raise RuntimeError("disk I/O error")
+
+        async def list_guild_configs(self, guild_id):
+            return [("a.c", '"stored"')]
+
+    async def run():
+        await settings.set_guild_override(_FakeDb(), 1, "c", 9)
+        try:
+            await settings.replace_guild_overrides(_FailingDb(), 1, {"a": {"c": "new"}})
+        except RuntimeError:
+            pass
+
+    asyncio.run(run())
+    assert settings.get_guild(1, "a.c") == "stored"
+    assert settings.get_guild(1, "c") == 4
+
+
+def test_override_burst_is_written_once_after_it_settles(tmp_path):
+    settings = _make_settings(tmp_path)
+    settings._override_write_delay = 0.05
+    writes = []
+    write = settings._write_json_atomic
+
+    def counting_write(path, data):
+        writes.append(deepcopy(data))
+        return write(path, data)
+
+    settings._write_json_atomic = counting_write
+
+    async def run():
+        for i in range(6):
+            await settings.set_override("a.c", i)
+            await asyncio.sleep(0.02)
+        assert writes == []
+        await settings._override_writer
+
+    asyncio.run(run())
+    assert len(writes) == 1
+    assert writes[0]["a"]["c"] == 5
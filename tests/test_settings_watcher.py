@@ -0,0 +1,41 @@
+import asyncio
+import os
+
+from bot.core.settings import SettingsManager
+from bot.core.settings_watcher import SettingsWatcher
+
+
+def test_broken_config_is_reported_once_per_change(tmp_path):
+    config_path = tmp_path / "config.yml"
+    config_path.write_text("a: 1\n", encoding="utf-8")
+    settings = SettingsManager(config_path=str(config_path), override_path=str(tmp_path / "settings.json"))
+    errors = []
+
+    async def on_change(diff):
+        pass
+
+    async def on_error(error):
+        errors.append(error)
+
+    def touch(text: str, offset: int):
+        config_path.write_text(text, encoding="utf-8")
+        st = os.stat(config_path)
+        os.utime(config_path, ns=(st.st_atime_ns, st.st_mtime_ns + offset * 1_000_000_000))
+
+    async def run():
+        await settings.load()
+        watcher = SettingsWatcher(settings, on_change, on_error)
+        touch("a: [1\n", 1)
+        for _ in range(3):
+            await watcher._reload()
+        touch("a: [2\n", 2)
+        for _ in range(3):
+            await watcher._reload()
+        touch("a: 3\n", 3)
+        await watcher._reload()
+        touch("a: [4\n", 4)
+        await watcher._reload()
+
+    asyncio.run(run())
+    assert len(errors) == 3
+    assert settings.get("a") == 3
@@ -0,0 +1,44 @@
+import asyncio
+from collections import OrderedDict
+
+from bot.core.db import Database
+from bot.modules.tickets.services.ticket_service import TicketService
+
+
+async def _add(db, ticket_id: int, content: str):
+    await db.add_ticket_message(
+        ticket_id, None, 9, "Staff", "staff#0", None, None, "staff", content, None, "2026-01-01T00:00:00+00:00"
+    )
+
+
+def test_search_pages_are_stable_while_messages_are_inserted(tmp_path):
+    async def run():
+        db = Database(str(tmp_path / "search.db"))
+        await db.init()
+        try:
+            ticket_id = await db.create_ticket(1, 2, 3, 4, 5, "allgemeine_frage")
+            for i in range(12):
+                await _add(db, ticket_id, "passwort " + "füllwort " * i)
+            await db.flush()
+            service = TicketService.__new__(TicketService)
+            service.db = db
+            service._search_snapshots = OrderedDict()
+
+            seen = []
+            hits, cursor = await service.search_messages(1, "passwort", limit=5)
+            seen.extend(h.message_id for h in hits)
+            while cursor:
+                for _ in range(3):
+                    await _add(db, ticket_id, "passwort passwort passwort")
+                await db.flush()
+                hits, cursor = await service.search_messages(1, "passwort", cursor=cursor, limit=5)
+                seen.extend(h.message_id for h in hits)
+            fresh, _ = await service.search_messages(1, "passwort", limit=5)
+            return seen, [h.message_id for h in fresh]
+        finally:
+            await db.close()
+
+    seen, fresh = asyncio.run(run())
+    assert len(seen) == 12
+    assert sorted(seen) == list(range(1, 13))
+    assert any(mid > 12 for mid in fresh)
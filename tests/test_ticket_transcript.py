@@ -0,0 +1,99 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from bot.core.db import Database
+from bot.modules.tickets.services.ticket_service import TicketService
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _msg(message_id: int, minute: int, content: str, bot: bool = False):
+    author = SimpleNamespace(bot=bot, display_name="Bot" if bot else "Staff", display_avatar=SimpleNamespace(url=""))
+    return SimpleNamespace(
+        id=message_id, created_at=BASE + timedelta(minutes=minute), author=author, content=content, attachments=[]
+    )
+
+
+class _Thread:
+    name = "ticket-1"
+
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def history(self, limit=None, oldest_first=True):
+        for msg in self.messages:
+            yield msg
+
+
+def _entries(tmp_path, legacy: bool, archived, messages):
+    async def run():
+        db = Database(str(tmp_path / "transcript.db"))
+        await db.init()
+        try:
+            ticket_id = await db.create_ticket(1, 2, 3, 4, 5, "allgemeine_frage")
+            if legacy:
+                await db._conn.execute("UPDATE tickets SET archive_started_at = NULL WHERE id = ?;", (ticket_id,))
+            for message_id, minute, content in archived:
+                await db.add_ticket_message(
+                    ticket_id, message_id, 9, "Staff", "staff#0", None, None, "staff", content,
+                    None, (BASE + timedelta(minutes=minute)).isoformat(),
+                )
+            await db.flush()
+            service = TicketService.__new__(TicketService)
+            service.db = db
+            t = await db.get_ticket(ticket_id)
+            return [e["content"] async for e in service._transcript_entries(_Thread(messages), t)]
+        finally:
+            await db.close()
+
+    return asyncio.run(run())
+
+
+def test_missing_archive_rows_are_filled_from_thread_history(tmp_path):
+    archived = [(101, 1, "eins"), (103, 3, "drei")]
+    messages = [
+        _msg(100, 0, "mirror", bot=True),
+        _msg(101, 1, "eins"),
+        _msg(102, 2, "zwei"),
+        _msg(103, 3, "drei"),
+        _msg(104, 4, "vier"),
+    ]
+    assert _entries(tmp_path, False, archived, messages) == ["eins", "zwei", "drei", "vier"]
+
+
+def test_legacy_ticket_keeps_full_history_before_archive(tmp_path):
+    archived = [(103, 3, "drei")]
+    messages = [
+        _msg(100, 0, "mirror", bot=True),
+        _msg(101, 1, "eins"),
+        _msg(103, 3, "drei"),
+        _msg(104, 4, "status", bot=True),
+    ]
+    assert _entries(tmp_path, True, archived, messages) == ["mirror", "eins", "drei"]
+
+
+def test_large_transcript_rolls_over_to_disk_intact(tmp_path):
+    messages = [_msg(1000 + i, i, f"nachricht-{i} " + "x" * 2000) for i in range(1200)]
+
+    async def run():
+        db = Database(str(tmp_path / "transcript.db"))
+        await db.init()
+        try:
+            ticket_id = await db.create_ticket(1, 2, 3, 4, 5, "allgemeine_frage")
+            service = TicketService.__new__(TicketService)
+            service.db = db
+            t = await db.get_ticket(ticket_id)
+            out, size = await service._render_html_transcript(_Thread(messages), t)
+            try:
+                return out._rolled, size, out.read()
+            finally:
+                out.close()
+        finally:
+            await db.close()
+
+    rolled, size, body = asyncio.run(run())
+    assert rolled
+    assert len(body) == size
+    assert body.count(b"nachricht-") == 1200
+    assert body.endswith(b"</html>\n")
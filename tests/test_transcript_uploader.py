@@ -0,0 +1,133 @@
+import asyncio
+import io
+import json
+
+import httpx
+
+from bot.modules.tickets.services import transcript_uploader
+from bot.modules.tickets.services.transcript_uploader import TranscriptUploader
+
+HTML = b"<html><body>" + b"x" * 200_000 + b"</body></html>"
+
+
+class _Settings:
+    def __init__(self, **values):
+        self.values = {
+            "ticket.transcript_upload_retries": 3,
+            "ticket.transcript_upload_backoff_seconds": 0.01,
+            **values,
+        }
+
+    def get(self, dotted: str, default=None):
+        return self.values.get(dotted, default)
+
+    def get_int(self, dotted: str, default: int = 0) -> int:
+        return int(self.values.get(dotted, default))
+
+
+def _upload(handler, mode="multipart", sleeps=None, monkeypatch=None, **settings):
+    if monkeypatch is not None:
+        async def _sleep(delay):
+            sleeps.append(delay)
+
+        monkeypatch.setattr(transcript_uploader.asyncio, "sleep", _sleep)
+
+    async def run():
+        uploader = TranscriptUploader(_Settings(**settings), transport=httpx.MockTransport(handler))
+        try:
+            return await uploader.upload(
+                "https://upload.test/api", "ticket-1.html", io.BytesIO(HTML), len(HTML), token="secret", mode=mode
+            )
+        finally:
+            await uploader.close()
+
+    return asyncio.run(run())
+
+
+def test_multipart_body_is_streamed_with_exact_length():
+    seen = []
+
+    def handler(request: httpx.Request):
+        body = request.read()
+        seen.append((request, body))
+        return httpx.Response(200, json={"uploads": [{"url": "https://cdn.test/t.html"}]})
+
+    assert _upload(handler) == "https://cdn.test/t.html"
+    request, body = seen[0]
+    boundary = request.headers["Content-Type"].split("boundary=", 1)[1]
+    assert request.headers["Authorization"] == "Bearer secret"
+    assert int(request.headers["Content-Length"]) == len(body)
+    assert body.startswith(f"--{boundary}\r\n".encode())
+    assert b'filename="ticket-1.html"' in body
+    assert HTML in body
+    assert body.endswith(f"\r\n--{boundary}--\r\n".encode())
+
+
+def test_raw_mode_posts_file_and_reads_location():
+    seen = []
+
+    def handler(request: httpx.Request):
+        seen.append((request, request.read()))
+        return httpx.Response(201, headers={"Location": "https://cdn.test/raw.html"})
+
+    assert _upload(handler, mode="raw") == "https://cdn.test/raw.html"
+    request, body = seen[0]
+    assert body == HTML
+    assert request.headers["X-Filename"] == "ticket-1.html"
+    assert int(request.headers["Content-Length"]) == len(HTML)
+
+
+def test_retries_server_errors_and_honours_retry_after(monkeypatch):
+    statuses = [503, 429, 200]
+    sleeps = []
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request.read())
+        status = statuses[len(calls) - 1]
+        if status == 429:
+            return httpx.Response(429, headers={"Retry-After": "7"})
+        if status == 200:
+            return httpx.Response(200, json={"url": "https://cdn.test/ok.html"})
+        return httpx.Response(status)
+
+    assert _upload(handler, sleeps=sleeps, monkeypatch=monkeypatch) == "https://cdn.test/ok.html"
+    assert len(calls) == 3
+    assert all(HTML in body for body in calls)
+    assert len(sleeps) == 2
+    assert sleeps[1] == 7.0
+
+
+def test_gives_up_after_last_retry(monkeypatch):
+    sleeps = []
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request)
+        return httpx.Response(502)
+
+    assert _upload(handler, sleeps=sleeps, monkeypatch=monkeypatch) is None
+    assert len(calls) == 4
+    assert len(sleeps) == 3
+
+
+def test_client_errors_are_not_retried(monkeypatch):
+    sleeps = []
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request)
+        return httpx.Response(413)
+
+    assert _upload(handler, sleeps=sleeps, monkeypatch=monkeypatch) is None
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_follows_redirects():
+    def handler(request: httpx.Request):
+        if request.url.path == "/api":
+            return httpx.Response(303, headers={"Location": "https://upload.test/done"})
+        return httpx.Response(200, content=json.dumps({"link": "https://cdn.test/r.html"}).encode())
+
+    assert _upload(handler) == "https://cdn.test/r.html"
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from bot.core.db import Database
+from bot.modules.user_stats.services.stats_buffer import UserStatsBuffer
+
+
+@pytest.mark.parametrize("group_commit", [False, True])
+def test_flush_is_not_applied_twice_under_concurrent_writes(tmp_path, group_commit):
+    async def run():
+        db = Database(str(tmp_path / "stats.db"), group_commit=group_commit, commit_interval_ms=1)
+        await db.init()
+        try:
+            buffer = UserStatsBuffer(db)
+            for i in range(2000):
+                await buffer.add_message(1, i % 50, 7, 3, False, "2026-01-01T00:00:00+00:00")
+
+            async def writer():
+                for i in range(300):
+                    await db.set_voice_session(1, 10_000 + i, 5, "2026-01-01T00:00:00+00:00")
+                    await asyncio.sleep(0)
+
+            await asyncio.gather(buffer.flush(), writer(), buffer.flush())
+            await buffer.flush()
+            await db.flush()
+            return await db.fetchone("SELECT SUM(message_count), SUM(xp) FROM user_stats WHERE guild_id = 1;")
+        finally:
+            await db.close()
+
+    message_count, xp = asyncio.run(run())
+    assert message_count == 2000
+    assert xp == 6000
+
+
+def test_buffered_level_is_written_as_absolute_value(tmp_path):
+    async def run():
+        db = Database(str(tmp_path / "stats.db"))
+        await db.init()
+        try:
+            buffer = UserStatsBuffer(db)
+            await buffer.add_message(1, 2, 7, 3, False, "2026-01-01T00:00:00+00:00")
+            await buffer.set_level(1, 2, 5)
+            await buffer.flush()
+            await buffer.set_level(1, 2, 2)
+            await buffer.flush()
+            lowered = await db.fetchone("SELECT level FROM user_stats WHERE guild_id = 1 AND user_id = 2;")
+            await buffer.add_message(1, 2, 7, 3, False, "2026-01-01T00:00:00+00:00")
+            await buffer.flush()
+            kept = await db.fetchone("SELECT level FROM user_stats WHERE guild_id = 1 AND user_id = 2;")
+            return lowered[0], kept[0]
+        finally:
+            await db.close()
+
+    assert asyncio.run(run()) == (2, 2)
+
+
+def test_invite_counts_reach_cached_entry(tmp_path):
+    async def run():
+        db = Database(str(tmp_path / "stats.db"))
+        await db.init()
+        try:
+            buffer = UserStatsBuffer(db)
+            await buffer.add_message(1, 2, 7, 3, False, "2026-01-01T00:00:00+00:00")
+            await db.increment_invite(1, 2)
+            buffer.apply_invite(1, 2)
+            await db.increment_invite_left(1, 2)
+            buffer.apply_invite(1, 2, left=True)
+            await buffer.flush()
+            cached = await buffer.get(1, 2)
+            stored = await db.get_user_stats(1, 2)
+            return (cached.invite_count, cached.invite_left_count, cached.message_count), (
+                stored.invite_count, stored.invite_left_count, stored.message_count
+            )
+        finally:
+            await db.close()
+
+    cached, stored = asyncio.run(run())
+    assert cached == stored == (1, 1, 1)